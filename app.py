@@ -1,24 +1,41 @@
 import streamlit as st
 import pickle
 import numpy as np
+import scipy.sparse
 from TurkishStemmer import TurkishStemmer
 import re
 import nltk
 import os
 import base64
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
 import sklearn.tree._tree as _tree
 import warnings
 import sklearn
 from sklearn.base import BaseEstimator
+from sklearn.feature_extraction.text import TfidfVectorizer
 import joblib
 import time
-from tensorflow import keras
-
-# NLTK stopwords'ü yükle
-nltk.download('stopwords')
-stop_words = nltk.corpus.stopwords.words('turkish')
+import threading
+import sys
+import argparse
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+import queue
+import pandas as pd
+import hashlib
+import functools
+import bisect
+import copy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# NLTK stopwords'ü yükle (sadece yoksa indir, her açılışta ağa çıkma)
+try:
+    stop_words = nltk.corpus.stopwords.words('turkish')
+except LookupError:
+    nltk.download('stopwords')
+    stop_words = nltk.corpus.stopwords.words('turkish')
 porter = TurkishStemmer()
 
 # Başa eklenecek importlar ve fonksiyonlar
@@ -48,288 +65,2341 @@ def format_time_ago(created_date_str):
         print(f"Tarih formatı hatası: {e}")
         return "Tarih bilgisi alınamadı"
 
-# Veritabanı fonksiyonları
-def init_db():
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    
-    # Kullanıcılar tablosu
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL UNIQUE,
-            phone TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Şikayetler tablosu (user_id eklendi)
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS complaints (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            complaint_number INTEGER NOT NULL,
-            complaint_text TEXT NOT NULL,
-            category TEXT NOT NULL,
-            model_used TEXT NOT NULL,
-            status TEXT DEFAULT 'İnceleniyor',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    # Admin tablosunu ekle
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS admins (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            password TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # İlk admin kullanıcısını ekle (eğer yoksa)
-    c.execute('SELECT COUNT(*) FROM admins')
-    if c.fetchone()[0] == 0:
-        # Şifre: admin123 (gerçek uygulamada hash'lenmiş olmalı)
-        c.execute('INSERT INTO admins (username, password) VALUES (?, ?)',
-                 ('admin', 'admin123'))
-    
-    conn.commit()
-    conn.close()
-
-def save_user(name, email, phone):
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
+# Şikayet durumları (admin panelindeki sırasıyla)
+COMPLAINT_STATUSES = ["İnceleniyor", "Çözümleniyor", "Çözüldü"]
+
+# Model anahtarı -> veritabanında ve arayüzde görünen model adı
+MODEL_DISPLAY_NAMES = {
+    'mb': 'MultinomialNB',
+    'sgd': 'SGD Classifier',
+    'lr': 'Logistic Regression',
+    'dl': 'Deep Learning',
+    'auto': 'Auto (Kademeli)',
+}
+
+# Arayüzde görünen model adı -> model anahtarı
+MODEL_KEYS = {display_name: key for key, display_name in MODEL_DISPLAY_NAMES.items()}
+
+# Kaydedilen ama henüz sınıflandırılmamış şikayetlerin kategorisi
+PENDING_CATEGORY = 'pending'
+PENDING_CATEGORY_LABEL = "⏳ Sınıflandırılıyor"
+# Arka plan sınıflandırması tekrar denemelere rağmen başarısız olursa yazılan kategori
+FAILED_CATEGORY = 'Sınıflandırılamadı'
+FAILED_CATEGORY_LABEL = "⚠️ Sınıflandırılamadı"
+
+def display_category(category):
+    """Kategoriyi arayüzde gösterilecek şekle çevir"""
+    if category == PENDING_CATEGORY:
+        return PENDING_CATEGORY_LABEL
+    if category == FAILED_CATEGORY:
+        return FAILED_CATEGORY_LABEL
+    return category
+
+# Gecikme histogramlarının üst sınırları (saniye): 10 µs ile 10 sn arası, log ölçekli (onlukta 4 kova)
+LATENCY_BUCKETS = tuple(10 ** (exponent / 4) for exponent in range(-20, 5))
+
+# Prometheus metin çıktısındaki açıklamalar
+METRIC_HELP = {
+    'classification_stage_seconds': "Sınıflandırma aşama süreleri: find_label, toplu işler ve arka plan işçisi (model ve aşamaya göre)",
+    'text_normalizer_seconds': "Metin temizleme adımlarının süresi",
+    'db_query_seconds': "Veritabanı yardımcı fonksiyonlarının süresi",
+    'db_lock_wait_seconds': "Yazma transaction'ında BEGIN IMMEDIATE için beklenen süre",
+    'cascade_stage_seconds': "Kademeli (auto) modda aşama başına model çağrısı süresi",
+}
+
+class LatencyHistogram:
+    """Sabit kovalı gecikme histogramı; yüzdelikler kova sınırları arasında doğrusal tahmin edilir"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # son kova +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.buckets[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.buckets), self.count, self.sum, self.max
+
+    def quantile(self, q, snapshot=None):
+        buckets, count, _, maximum = snapshot or self.snapshot()
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(buckets):
+            if bucket_count and seen + bucket_count >= rank:
+                if index == len(self.bounds):
+                    return maximum
+                lower = self.bounds[index - 1] if index else 0.0
+                # Kova içi tahmin gözlenen en büyük değeri aşmasın
+                return min(lower + (self.bounds[index] - lower) * (rank - seen) / bucket_count, maximum)
+            seen += bucket_count
+        return maximum
+
+class MetricsRegistry:
+    """İsim + etiket başına gecikme histogramları; Prometheus metin biçiminde dışa verilir"""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name, labels=()):
+        """labels: (('etiket', 'değer'), ...) demeti; aynı metrikte hep aynı sırayla verilmeli"""
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def observe(self, name, labels, seconds):
+        self.histogram(name, labels).observe(seconds)
+
+    def _sorted_items(self):
+        # Sözlük kilit altında kopyalanır; okuma sırasında başka thread yeni histogram ekleyebilir
+        with self._lock:
+            items = list(self._histograms.items())
+        return sorted(items, key=lambda item: item[0])
+
+    def rows(self):
+        """Admin tablosu için metrik başına sayı, toplam ve p50/p95/p99 (ms)"""
+        rows = []
+        for (name, labels), histogram in self._sorted_items():
+            snapshot = histogram.snapshot()
+            if not snapshot[1]:
+                continue
+            row = {'metrik': name, 'etiketler': ', '.join(f"{key}={value}" for key, value in labels),
+                   'sayi': snapshot[1], 'toplam_ms': round(snapshot[2] * 1000, 3)}
+            for q in (0.5, 0.95, 0.99):
+                row[f"p{int(q * 100)}_ms"] = round(histogram.quantile(q, snapshot) * 1000, 3)
+            row['max_ms'] = round(snapshot[3] * 1000, 3)
+            rows.append(row)
+        return rows
+
+    def prometheus_text(self):
+        lines = []
+        previous_name = None
+        for (name, labels), histogram in self._sorted_items():
+            if name != previous_name:
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                previous_name = name
+            buckets, count, total, _ = histogram.snapshot()
+            label_text = ''.join(f'{key}="{value}",' for key, value in labels)
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.bounds + (float('inf'),), buckets):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else f"{bound:.6g}"
+                lines.append(f'{name}_bucket{{{label_text}le="{le}"}} {cumulative}')
+            plain_labels = f"{{{label_text.rstrip(',')}}}" if labels else ''
+            lines.append(f"{name}_sum{plain_labels} {total:.9g}")
+            lines.append(f"{name}_count{plain_labels} {count}")
+        return '\n'.join(lines) + '\n'
+
+@st.cache_resource(show_spinner=False)
+def get_metrics():
+    # Süreç genelinde tek kayıt; HTTP uç noktası ve admin paneli aynı histogramları okur
+    return MetricsRegistry()
+
+metrics = get_metrics()
+
+def timed_db_helper(func):
+    """DB yardımcı fonksiyonunun süresini db_query_seconds{query=<fonksiyon adı>} histogramına yaz"""
+    histogram = metrics.histogram('db_query_seconds', (('query', func.__name__),))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+    return wrapper
+
+# Prometheus metriklerinin yayınlandığı yerel adres (port 0 ise uç nokta açılmaz)
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = int(os.environ.get('METRICS_PORT', '9464'))
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = get_metrics().prometheus_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Her istek için stderr'e satır yazılmasın
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_server(host, port):
+    """/metrics uç noktasını arka plan thread'inde başlat; port kullanımdaysa None"""
     try:
-        c.execute('INSERT INTO users (name, email, phone) VALUES (?, ?, ?)',
-                 (name, email, phone))
-        conn.commit()
-        user_id = c.lastrowid
-        return user_id
-    except sqlite3.IntegrityError:
-        # Email zaten varsa, mevcut user_id'yi döndür
-        c.execute('SELECT id FROM users WHERE email = ?', (email,))
-        user_id = c.fetchone()[0]
-        return user_id
-    finally:
-        conn.close()
+        server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    except OSError as e:
+        print(f"Metrik sunucusu başlatılamadı ({host}:{port}): {e}")  # Debug için
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    print(f"Metrikler yayında: http://{host}:{server.server_port}/metrics")  # Debug için
+    return server
+
+# Veritabanı dosyası ve bağlantı ayarları
+# Testler ve geçici kurulumlar COMPLAINTS_DB ile başka bir dosyaya yönlendirebilir
+DB_PATH = os.environ.get('COMPLAINTS_DB', 'complaints.db')
+DB_POOL_SIZE = 8  # havuzda boşta bekletilecek en fazla bağlantı
+DB_BUSY_TIMEOUT_MS = 5000
+DB_STATEMENT_CACHE_SIZE = 256  # bağlantı başına önbelleğe alınan derlenmiş sorgu sayısı
+
+class Database:
+    """Streamlit oturumları arasında paylaşılan SQLite bağlantı havuzu
+
+    Bağlantılar WAL modunda (okuyucular yazanları beklemez), synchronous=NORMAL
+    ve busy_timeout ile açılır. Havuza geri dönen bağlantılar derlenmiş sorgu
+    önbelleklerini korur. Bağlantılar autocommit modundadır; yazmalar
+    transaction() ile BEGIN IMMEDIATE altında yapılır.
+    """
+
+    def __init__(self, path=DB_PATH, pool_size=DB_POOL_SIZE):
+        self.path = path
+        self.pool_size = pool_size
+        self._idle = queue.LifoQueue()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=DB_BUSY_TIMEOUT_MS / 1000,
+            isolation_level=None,
+            check_same_thread=False,  # bağlantı havuz üzerinden thread'ler arasında dolaşır
+            cached_statements=DB_STATEMENT_CACHE_SIZE,
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}')
+        # Migration 7 mevcut şikayetleri bu fonksiyonla dizinler (tetikleyiciler kullanmaz)
+        conn.create_function('complaint_search_text', 1, complaint_search_text, deterministic=True)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Havuzdan bir bağlantı al, iş bitince geri bırak"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._idle.qsize() < self.pool_size:
+                self._idle.put(conn)
+            else:
+                conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Yazma transaction'ı: başarıda commit, hatada rollback"""
+        with self.connection() as conn:
+            start = time.perf_counter()
+            conn.execute('BEGIN IMMEDIATE')
+            metrics.observe('db_lock_wait_seconds', (), time.perf_counter() - start)
+            try:
+                yield conn.cursor()
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+@st.cache_resource(show_spinner=False)
+def get_shared_database(path):
+    return Database(path)
+
+def get_db():
+    """DB_PATH için süreç genelinde paylaşılan bağlantı havuzu"""
+    return get_shared_database(DB_PATH)
 
-def get_user_complaints(email):
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    try:
-        c.execute('SELECT id FROM users WHERE email = ?', (email,))
-        user = c.fetchone()
+# Veritabanı fonksiyonları
+def init_db():
+    with get_db().transaction() as c:
+        # Kullanıcılar tablosu
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL UNIQUE,
+                phone TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
         
-        if not user:
-            return []
-            
+        # Şikayetler tablosu (user_id eklendi)
         c.execute('''
-            SELECT c.complaint_number, c.complaint_text, c.category, 
-                   c.status, c.created_at, u.name, u.email, c.model_used
-            FROM complaints c
-            JOIN users u ON c.user_id = u.id
-            WHERE u.email = ?
-            ORDER BY c.created_at DESC
-        ''', (email,))
+            CREATE TABLE IF NOT EXISTS complaints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                complaint_number INTEGER NOT NULL,
+                complaint_text TEXT NOT NULL,
+                category TEXT NOT NULL,
+                model_used TEXT NOT NULL,
+                status TEXT DEFAULT 'İnceleniyor',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+        ''')
         
-        return c.fetchall()
+        # Admin tablosunu ekle
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS admins (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL UNIQUE,
+                password TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
         
-    except Exception as e:
-        print(f"Şikayet sorgulama hatası: {e}")
-        return []
-    finally:
-        conn.close()
-
-def save_complaint(user_id, complaint_number, complaint_text, category, model_used):
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
+        # İlk admin kullanıcısını ekle (eğer yoksa)
+        c.execute('SELECT COUNT(*) FROM admins')
+        if c.fetchone()[0] == 0:
+            # Şifre: admin123 (gerçek uygulamada hash'lenmiş olmalı)
+            c.execute('INSERT INTO admins (username, password) VALUES (?, ?)',
+                     ('admin', 'admin123'))
+
+@timed_db_helper
+def save_user(name, email, phone):
+    with get_db().transaction() as c:
+        try:
+            c.execute('INSERT INTO users (name, email, phone) VALUES (?, ?, ?)',
+                     (name, email, phone))
+            user_id = c.lastrowid
+            return user_id
+        except sqlite3.IntegrityError:
+            # Email zaten varsa, mevcut user_id'yi döndür
+            c.execute('SELECT id FROM users WHERE email = ?', (email,))
+            user_id = c.fetchone()[0]
+            return user_id
+
+@timed_db_helper
+def get_user_complaints(email):
+    """E-postaya ait şikayetler, en yeniden eskiye; tek sorgu, (user_id, created_at DESC) indeksiyle"""
+    with get_db().connection() as conn:
+        c = conn.cursor()
+        try:
+            c.execute('''
+                SELECT c.complaint_number, c.complaint_text, c.category, 
+                       c.status, c.created_at, u.name, u.email, c.model_used, c.user_id
+                FROM users u
+                JOIN complaints c ON c.user_id = u.id
+                WHERE u.email = ?
+                ORDER BY c.created_at DESC
+            ''', (email,))
+            
+            return c.fetchall()
+            
+        except Exception as e:
+            print(f"Şikayet sorgulama hatası: {e}")
+            return []
+
+def user_complaints_version(email):
+    """Kullanıcının şikayetleri her değiştiğinde artan sayaç (user_complaint_versions)
+
+    Sayaç veritabanı tetikleyicileriyle tutulur; CLI ya da başka bir süreç
+    yazsa da artar. Henüz şikayeti olmayan kullanıcı için 0.
+    """
+    with get_db().connection() as conn:
+        row = conn.execute('''
+            SELECT v.version FROM users u
+            JOIN user_complaint_versions v ON v.user_id = u.id
+            WHERE u.email = ?
+        ''', (email,)).fetchone()
+    return row[0] if row else 0
+
+def cached_user_complaints(cache, email):
+    """get_user_complaints sonucunu verilen sözlükte (oturum önbelleği) tut
+
+    Kayıt, kullanıcının user_complaint_versions sayacı değişene kadar (yeni şikayet,
+    sınıflandırma, durum güncellemesi) geçerlidir. Boş sonuçlar saklanmaz:
+    kullanıcı ilk şikayetini verince görünmeli.
+    """
+    version = user_complaints_version(email)
+    entry = cache.get(email)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    complaints = get_user_complaints(email)
+    cache.pop(email, None)
+    if complaints:
+        # Sayaç sorgudan önce okunduğu için sorgu sırasındaki bir değişiklik
+        # bir sonraki çağrıda sonucu yeniden okutur
+        cache[email] = (version, complaints)
+    return complaints
+
+# Şikayet numaraları 7 haneli: eski 6 haneli rastgele numaralarla çakışmaz.
+# Sıra numarası aralık içinde birebir bir permütasyondan geçirilir, böylece
+# ardışık şikayetlerin numaraları tahmin edilebilir şekilde art arda gelmez.
+COMPLAINT_NUMBER_MIN = 1000000
+COMPLAINT_NUMBER_SPACE = 9000000
+COMPLAINT_NUMBER_MULTIPLIER = 4851343  # COMPLAINT_NUMBER_SPACE ile aralarında asal
+COMPLAINT_NUMBER_OFFSET = 1234567
+
+def allocate_complaint_number(c):
+    """Çağıranın yazma transaction'ı içinde sıradaki benzersiz şikayet numarasını ayır"""
+    c.execute('''
+        UPDATE complaint_number_sequence SET next_value = next_value + 1
+        WHERE id = 1
+        RETURNING next_value - 1
+    ''')
+    sequence = c.fetchone()[0]
+    if sequence >= COMPLAINT_NUMBER_SPACE:
+        raise RuntimeError("Şikayet numarası aralığı tükendi")
+    return COMPLAINT_NUMBER_MIN + (sequence * COMPLAINT_NUMBER_MULTIPLIER + COMPLAINT_NUMBER_OFFSET) % COMPLAINT_NUMBER_SPACE
+
+@timed_db_helper
+def save_complaint(user_id, complaint_text, category, model_used):
+    """Şikayeti kaydet ve ayrılan şikayet numarasını döndür (hata olursa None)"""
     try:
         # Model adını düzgün formata çevir
-        model_mapping = {
-            'mb': 'MultinomialNB',
-            'sgd': 'SGD Classifier',
-            'lr': 'Logistic Regression'
-        }
-        formatted_model = model_mapping.get(model_used, model_used)
+        formatted_model = MODEL_DISPLAY_NAMES.get(model_used, model_used)
         
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        c.execute('''
-            INSERT INTO complaints 
-            (user_id, complaint_number, complaint_text, category, model_used, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (user_id, complaint_number, complaint_text, category, formatted_model, 'İnceleniyor', current_time))
-        conn.commit()
+        # Arama dizini metni yazma kilidi alınmadan hazırlanır
+        search_text = complaint_search_text(complaint_text)
+        with get_db().transaction() as c:
+            # Numara aynı transaction'da ayrılır: yazma kilidi tutulduğu için çakışma olmaz
+            complaint_number = allocate_complaint_number(c)
+            c.execute('''
+                INSERT INTO complaints 
+                (user_id, complaint_number, complaint_text, category, model_used, status, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (user_id, complaint_number, complaint_text, category, formatted_model, 'İnceleniyor', current_time))
+            complaint_id = c.lastrowid
+            index_complaint_search(c, [(complaint_id, search_text)])
+        invalidate_analytics()
+        # Bekleyen kategoriyle kaydedildiyse arka planda sınıflandırılır
+        if category == PENDING_CATEGORY:
+            get_classification_worker(DB_PATH).submit(complaint_id)
         print(f"Şikayet kaydedildi: {complaint_number}, Model: {formatted_model}")  # Debug için
+        return complaint_number
     except Exception as e:
         print(f"Şikayet kaydetme hatası: {e}")  # Debug için
-        conn.rollback()
-    finally:
-        conn.close()
+        return None
 
+@timed_db_helper
 def get_complaint_by_number(complaint_number):
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    try:
-        c.execute('''
-            SELECT c.complaint_number, c.complaint_text, c.category, 
-                   c.status, c.created_at, u.name, u.email
-            FROM complaints c
-            JOIN users u ON c.user_id = u.id
-            WHERE c.complaint_number = ?
-        ''', (int(complaint_number),))
-        
-        return c.fetchone()
-        
-    except Exception as e:
-        return None
-    finally:
-        conn.close()
+    with get_db().connection() as conn:
+        c = conn.cursor()
+        try:
+            c.execute('''
+                SELECT c.complaint_number, c.complaint_text, c.category, 
+                       c.status, c.created_at, u.name, u.email
+                FROM complaints c
+                JOIN users u ON c.user_id = u.id
+                WHERE c.complaint_number = ?
+            ''', (int(complaint_number),))
+            
+            return c.fetchone()
+            
+        except Exception as e:
+            return None
 
+@timed_db_helper
 def verify_admin(username, password):
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    c.execute('SELECT id FROM admins WHERE username = ? AND password = ?',
-             (username, password))
-    result = c.fetchone()
-    conn.close()
+    with get_db().connection() as conn:
+        c = conn.cursor()
+        c.execute('SELECT id FROM admins WHERE username = ? AND password = ?',
+                 (username, password))
+        result = c.fetchone()
     return result is not None
 
+@timed_db_helper
 def update_complaint_status(complaint_number, new_status):
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    c.execute('UPDATE complaints SET status = ? WHERE complaint_number = ?',
-             (new_status, complaint_number))
-    conn.commit()
-    conn.close()
+    with get_db().transaction() as c:
+        c.execute('UPDATE complaints SET status = ? WHERE complaint_number = ?',
+                 (new_status, complaint_number))
+    invalidate_analytics()
 
+@timed_db_helper
 def get_all_complaints():
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
+    with get_db().connection() as conn:
+        c = conn.cursor()
+        try:
+            c.execute('''
+                SELECT 
+                    c.complaint_number,
+                    c.complaint_text,
+                    c.category,
+                    c.status,
+                    c.created_at,
+                    u.name,
+                    u.email,
+                    u.phone,
+                    c.model_used  -- model_used'ı da seç
+                FROM complaints c
+                JOIN users u ON c.user_id = u.id
+                ORDER BY c.created_at DESC
+            ''')
+            complaints = c.fetchall()
+            print(f"Toplam {len(complaints)} şikayet bulundu")  # Debug için
+            return complaints
+        except Exception as e:
+            print(f"Şikayet getirme hatası: {e}")  # Debug için
+            return []
+
+# Admin listesinde sayfa başına gösterilen şikayet sayısı
+ADMIN_PAGE_SIZE = 20
+
+# Admin filtrelerinin sorgulardaki kolon karşılıkları.
+# Sayfa sorgularında filtre kolonlarının indeksleri bilerek kapatılır (+kolon):
+# sayfa created_at indeksi üzerinden sıralı okunur ve LIMIT dolunca durur,
+# eşleşen bütün satırlar sıralanmaz.
+PAGE_FILTER_COLUMNS = {'status': '+c.status', 'category': '+c.category', 'model_used': '+c.model_used', 'day': 'c.created_at'}
+STATS_FILTER_COLUMNS = {'status': 'status', 'category': 'category', 'model_used': 'model_used', 'day': 'day'}
+
+def complaint_filter_conditions(filters, columns=PAGE_FILTER_COLUMNS):
+    """Admin filtrelerini (durum, kategori, model, tarih aralığı) WHERE koşullarına çevir"""
+    conditions = []
+    params = []
+    # Tüm durumların seçili olması (admin panelinin varsayılanı) filtre değildir
+    if filters.get('statuses') is not None and not set(COMPLAINT_STATUSES) <= set(filters['statuses']):
+        statuses = list(filters['statuses'])
+        conditions.append(f"{columns['status']} IN ({', '.join('?' * len(statuses))})")
+        params.extend(statuses)
+    if filters.get('category'):
+        conditions.append(f"{columns['category']} = ?")
+        params.append(filters['category'])
+    if filters.get('model'):
+        conditions.append(f"{columns['model_used']} = ?")
+        params.append(filters['model'])
+    # Tarih aralığı gün bazında, bitiş günü dahil: 'YYYY-MM-DD' ile metin karşılaştırması
+    if filters.get('date_from'):
+        conditions.append(f"{columns['day']} >= ?")
+        params.append(filters['date_from'].strftime('%Y-%m-%d'))
+    if filters.get('date_to'):
+        conditions.append(f"{columns['day']} < ?")
+        params.append((filters['date_to'] + timedelta(days=1)).strftime('%Y-%m-%d'))
+    return conditions, params
+
+@timed_db_helper
+def get_complaints_page(filters, after=None, limit=ADMIN_PAGE_SIZE):
+    """(created_at, id) üzerinde keyset sayfalama ile filtrelenmiş bir sayfa şikayet
+
+    after bir önceki sayfanın son satırının (created_at, id) değeridir.
+    Satırlar get_all_complaints ile aynı sırada, sonunda şikayet id'si ile döner.
+    """
+    conditions, params = complaint_filter_conditions(filters)
+    if after is not None:
+        conditions.append('(c.created_at, c.id) < (?, ?)')
+        params.extend(after)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    with get_db().connection() as conn:
+        try:
+            return conn.execute(f'''
+                SELECT 
+                    c.complaint_number,
+                    c.complaint_text,
+                    c.category,
+                    c.status,
+                    c.created_at,
+                    u.name,
+                    u.email,
+                    u.phone,
+                    c.model_used,
+                    c.id
+                FROM complaints c
+                JOIN users u ON c.user_id = u.id
+                {where}
+                ORDER BY c.created_at DESC, c.id DESC
+                LIMIT ?
+            ''', params + [limit]).fetchall()
+        except Exception as e:
+            print(f"Şikayet sayfası getirme hatası: {e}")  # Debug için
+            return []
+
+def next_page_cursor(page, limit=ADMIN_PAGE_SIZE):
+    """Dolu bir sayfadan sonraki sayfanın after değeri (son satırın created_at, id'si); son sayfada None"""
+    if len(page) < limit:
+        return None
+    last_complaint = page[-1]
+    return (last_complaint[4], last_complaint[9])
+
+@timed_db_helper
+def count_complaints(filters):
+    """Filtrelere uyan toplam şikayet sayısı; complaints yerine complaint_stats sayaçlarından okunur"""
+    conditions, params = complaint_filter_conditions(filters, STATS_FILTER_COLUMNS)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    with get_db().connection() as conn:
+        return conn.execute(f'SELECT IFNULL(SUM(complaint_count), 0) FROM complaint_stats {where}', params).fetchone()[0]
+
+# İçerik araması: complaints_fts, şikayet metninin clean_text çıktısını tutar.
+# Dizin satırı uygulama tarafında, şikayetin eklendiği transaction'da yazılır;
+# tetikleyiciler sadece SQL'dir, böylece başka araçlar da şikayet ekleyebilir.
+# Onların eklediği ya da metnini değiştirdiği şikayetler tetikleyicilerle
+# complaints_fts_pending kuyruğuna girer ve her aramadan önce sync_complaint_search
+# ile dizinlenir.
+def complaint_search_text(text):
+    """Şikayet metnini FTS5 dizini için normalize et (clean_text ile aynı kökler)"""
+    return clean_text(text) if text else ''
+
+def index_complaint_search(c, rows):
+    """Çağıranın transaction'ında (id, complaint_search_text çıktısı) satırlarını dizine yaz"""
+    if complaint_search_available(c):
+        c.executemany('INSERT INTO complaints_fts (rowid, body) VALUES (?, ?)', rows)
+        # Ekleme tetikleyicisinin kuyruğa koyduğu satır artık dizinde
+        c.executemany('DELETE FROM complaints_fts_pending WHERE complaint_id = ?', [(row[0],) for row in rows])
+
+def sync_complaint_search():
+    """complaints_fts_pending kuyruğundaki şikayetleri (dış araçlarla eklenen, metni değişen) dizinle
+
+    Eklenen dizin satırı sayısını döner. Kuyruk boşsa tek bir okuma yapılır,
+    bu yüzden her aramadan önce çağrılabilir. Metinler yazma kilidi alınmadan
+    temizlenir; yazarken metni tekrar değişen şikayet kuyrukta kalır, arada
+    silinen şikayet kuyruktan çıkarılır.
+    """
+    db = get_db()
+    last_id = 0
+    indexed = 0
+    while True:
+        with db.connection() as conn:
+            if not complaint_search_available(conn):
+                return 0
+            rows = conn.execute('''
+                SELECT q.complaint_id, c.complaint_text FROM complaints_fts_pending q
+                LEFT JOIN complaints c ON c.id = q.complaint_id
+                WHERE q.complaint_id > ?
+                ORDER BY q.complaint_id
+                LIMIT ?
+            ''', (last_id, BATCH_CHUNK_SIZE)).fetchall()
+        if not rows:
+            return indexed
+        search_rows = [(complaint_id, complaint_search_text(text), text) for complaint_id, text in rows]
+        with db.transaction() as c:
+            c.executemany('''
+                INSERT INTO complaints_fts (rowid, body)
+                SELECT ?1, ?2
+                WHERE EXISTS (SELECT 1 FROM complaints WHERE id = ?1 AND complaint_text IS ?3)
+                  AND NOT EXISTS (SELECT 1 FROM complaints_fts WHERE rowid = ?1)
+            ''', search_rows)
+            indexed += c.rowcount
+            c.executemany('''
+                DELETE FROM complaints_fts_pending
+                WHERE complaint_id = ?1
+                  AND (EXISTS (SELECT 1 FROM complaints_fts WHERE rowid = ?1)
+                       OR NOT EXISTS (SELECT 1 FROM complaints WHERE id = ?1))
+            ''', [(row[0],) for row in rows])
+        last_id = rows[-1][0]
+
+def complaint_search_match(query):
+    """Arama metnini FTS5 MATCH ifadesine çevir; aranacak kelime kalmazsa None"""
+    tokens = complaint_search_text(query).split()
+    if not tokens:
+        return None
+    return ' '.join('"' + token.replace('"', '""') + '"' for token in tokens)
+
+def complaint_search_available(conn):
+    """complaints_fts var mı (SQLite FTS5 olmadan derlenmişse migration onu atlar)
+
+    Çağıranın bağlantısı ya da cursor'ı üzerinden bakılır; havuzdan ikinci bir bağlantı alınmaz.
+    """
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'complaints_fts'"
+    ).fetchone() is not None
+
+# Bundan fazla eşleşen aramalar "1000+" olarak sayılır ve en yeniden eskiye listelenir:
+# alaka sıralaması (bm25) tüm eşleşmeleri puanlar, rowid sırası ise sayfa dolunca durur
+SEARCH_COUNT_CAP = 1000
+
+def complaint_search_plan(conn, query, filters):
+    """Arama için (FROM, ORDER BY, WHERE koşulları, parametreler); aranacak kelime yoksa None
+
+    Eşleşme sayısı SEARCH_COUNT_CAP'i aşmıyorsa sonuçlar alaka sırasıyla gelir,
+    aşıyorsa en yeniden eskiye; admin filtreleri iki durumda da eşleşmelere
+    sonradan uygulanır. FTS5 yoksa şikayet metninde LIKE taraması yapılır.
+    """
+    conditions, params = complaint_filter_conditions(filters or {})
+    if complaint_search_available(conn):
+        match = complaint_search_match(query)
+        if match is None:
+            return None
+        matches = conn.execute('''
+            SELECT COUNT(*) FROM (SELECT rowid FROM complaints_fts WHERE complaints_fts MATCH ? LIMIT ?)
+        ''', (match, SEARCH_COUNT_CAP + 1)).fetchone()[0]
+        if matches > SEARCH_COUNT_CAP:
+            source = 'complaints_fts f JOIN complaints c ON c.id = f.rowid'
+            return source, 'f.rowid DESC', ['f.complaints_fts MATCH ?'] + conditions, [match] + params
+        source = '''(
+            SELECT rowid, rank FROM complaints_fts WHERE complaints_fts MATCH ? ORDER BY rank LIMIT ?
+        ) f JOIN complaints c ON c.id = f.rowid'''
+        return source, 'f.rank, c.id DESC', conditions, [match, SEARCH_COUNT_CAP] + params
+    words = query.split()
+    if not words:
+        return None
+    for word in words:
+        conditions.append("c.complaint_text LIKE ? ESCAPE '\\'")
+        params.append('%' + word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    return 'complaints c', 'c.created_at DESC, c.id DESC', conditions, params
+
+@timed_db_helper
+def search_complaints(query, filters=None, offset=0, limit=ADMIN_PAGE_SIZE):
+    """İçerik araması, get_complaints_page ile aynı satır yapısında (sıralama: complaint_search_plan)"""
+    sync_complaint_search()
+    with get_db().connection() as conn:
+        try:
+            plan = complaint_search_plan(conn, query, filters)
+            if plan is None:
+                return []
+            source, order, conditions, params = plan
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+            return conn.execute(f'''
+                SELECT 
+                    c.complaint_number,
+                    c.complaint_text,
+                    c.category,
+                    c.status,
+                    c.created_at,
+                    u.name,
+                    u.email,
+                    u.phone,
+                    c.model_used,
+                    c.id
+                FROM {source}
+                JOIN users u ON c.user_id = u.id
+                {where}
+                ORDER BY {order}
+                LIMIT ? OFFSET ?
+            ''', params + [limit, offset]).fetchall()
+        except Exception as e:
+            print(f"Şikayet arama hatası: {e}")  # Debug için
+            return []
+
+@timed_db_helper
+def count_search_results(query, filters=None):
+    """İçerik aramasına ve filtrelere uyan şikayet sayısı; en fazla SEARCH_COUNT_CAP + 1 sayılır"""
+    sync_complaint_search()
+    with get_db().connection() as conn:
+        try:
+            plan = complaint_search_plan(conn, query, filters)
+            if plan is None:
+                return 0
+            source, _, conditions, params = plan
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+            return conn.execute(f'''
+                SELECT COUNT(*) FROM (SELECT 1 FROM {source} {where} LIMIT ?)
+            ''', params + [SEARCH_COUNT_CAP + 1]).fetchone()[0]
+        except Exception as e:
+            print(f"Şikayet arama hatası: {e}")  # Debug için
+            return 0
+
+def format_search_count(count):
+    """Arama sonucu sayısı; sayım sınırını aşanlar '1000+' olarak"""
+    return f"{SEARCH_COUNT_CAP}+" if count > SEARCH_COUNT_CAP else str(count)
+
+# Model analizi önbelleğinin en uzun ömrü (saniye); şikayet yazılınca ayrıca temizlenir
+ANALYTICS_CACHE_TTL = 30
+
+@st.cache_data(ttl=ANALYTICS_CACHE_TTL, show_spinner=False)
+@timed_db_helper
+def get_model_analytics():
+    """Model/kategori/durum kırılımı ve günlük model dağılımı (complaint_stats sayaçlarından)"""
+    with get_db().connection() as conn:
+        breakdown = conn.execute('''
+            SELECT model_used, category, status, SUM(complaint_count)
+            FROM complaint_stats
+            GROUP BY model_used, category, status
+        ''').fetchall()
+        daily = conn.execute('''
+            SELECT day, model_used, SUM(complaint_count)
+            FROM complaint_stats
+            GROUP BY day, model_used
+            ORDER BY day
+        ''').fetchall()
+        # Kademeli modda hangi aşamanın cevap verdiği (indeks üzerinden sayılır)
+        cascade_stages = conn.execute('''
+            SELECT answered_by, COUNT(*) FROM complaints
+            WHERE model_used = ? AND answered_by IS NOT NULL
+            GROUP BY answered_by
+        ''', (MODEL_DISPLAY_NAMES[CASCADE_MODEL],)).fetchall()
+
+    model_counts = {}
+    for model_used, _, _, count in breakdown:
+        model_counts[model_used] = model_counts.get(model_used, 0) + count
+    return {'model_counts': model_counts, 'breakdown': breakdown, 'daily': daily, 'cascade_stages': cascade_stages}
+
+@st.cache_data(ttl=ANALYTICS_CACHE_TTL, show_spinner=False)
+@timed_db_helper
+def get_model_agreement(fingerprints):
+    """complaint_predictions'tan model uyum oranları: çoğunlukla uyum, ikili uyum ve tam uyum
+
+    Sadece verilen topluluk özetlerinden (current_ensemble_fingerprints) biriyle puanlanan
+    satırlar sayılır; model dosyaları değiştiyse eski tahminler 'stale' olarak ayrıca döner.
+    """
+    placeholders = ', '.join('?' * len(fingerprints))
+    pairs = [(first, second) for position, first in enumerate(ENSEMBLE_MODELS)
+             for second in ENSEMBLE_MODELS[position + 1:]]
+    # NULL tahminler (ör. DL yokken puanlananlar) karşılaştırmaya girmez: SUM/COUNT NULL'ları atlar
+    columns = [f"SUM({key} = majority), COUNT({key})" for key in ENSEMBLE_MODELS]
+    columns += [f"SUM({first} = {second}), COUNT({first} = {second})" for first, second in pairs]
+    all_agree = ' AND '.join(f"IFNULL({key} = majority, 1)" for key in ENSEMBLE_MODELS)
+    with get_db().connection() as conn:
+        row = conn.execute(f'''
+            SELECT COUNT(*), SUM({all_agree}), {', '.join(columns)}
+            FROM complaint_predictions
+            WHERE fingerprint IN ({placeholders})
+        ''', fingerprints).fetchone()
+        stale = conn.execute(f'''
+            SELECT COUNT(*) FROM complaint_predictions
+            WHERE fingerprint IS NULL OR fingerprint NOT IN ({placeholders})
+        ''', fingerprints).fetchone()[0]
+
+    def rate(matches, total):
+        return round(matches / total, 4) if total else None
+
+    values = iter(row[2:])
+    with_majority = {key: rate(next(values), next(values)) for key in ENSEMBLE_MODELS}
+    pairwise = {pair: rate(next(values), next(values)) for pair in pairs}
+    return {
+        'scored': row[0],
+        'stale': stale,
+        'all_agree': rate(row[1] or 0, row[0]),
+        'with_majority': with_majority,
+        'pairwise': pairwise,
+    }
+
+def invalidate_analytics():
+    """Şikayet eklenince/güncellenince model analizi önbelleğini temizle"""
+    get_model_analytics.clear()
+    get_model_agreement.clear()
+
+# Şema migration'ları: her biri veritabanı başına bir kez uygulanır ve schema_version'a yazılır
+def migrate_complaint_indexes(c):
+    c.execute('CREATE INDEX IF NOT EXISTS idx_complaints_number ON complaints (complaint_number)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_complaints_user_created ON complaints (user_id, created_at)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_complaints_model ON complaints (model_used)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_complaints_status ON complaints (status)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_complaints_created ON complaints (created_at)')
+
+def migrate_status_names(c):
+    # Eski durum adlarını güncelle
+    c.execute('''
+        UPDATE complaints 
+        SET status = 'İnceleniyor' 
+        WHERE status = 'İşleme Alındı' OR status = 'İnceleme Yapılıyor'
+    ''')
+
+def migrate_model_names(c):
+    # Model kısaltmalarını arayüzde görünen adlara çevir
+    c.execute('''
+        UPDATE complaints 
+        SET model_used = 'MultinomialNB' 
+        WHERE model_used = 'mb' OR model_used IS NULL OR model_used = ''
+    ''')
+    for model_key in ('sgd', 'lr', 'dl'):
+        c.execute('UPDATE complaints SET model_used = ? WHERE model_used = ?',
+                 (MODEL_DISPLAY_NAMES[model_key], model_key))
+
+# complaint_stats anahtarı: complaints satırından (gün, model, kategori, durum)
+STATS_KEY_COLUMNS = "IFNULL(date({row}.created_at), ''), IFNULL({row}.model_used, ''), IFNULL({row}.category, ''), IFNULL({row}.status, '')"
+
+def migrate_complaint_stats(c):
+    # Dashboard sayaçları: complaints'e yazan her ifadeyle aynı transaction'da
+    # tetikleyicilerle güncellenir, okumalar satır sayısından bağımsızdır
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS complaint_stats (
+            day TEXT NOT NULL,
+            model_used TEXT NOT NULL,
+            category TEXT NOT NULL,
+            status TEXT NOT NULL,
+            complaint_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, model_used, category, status)
+        ) WITHOUT ROWID
+    ''')
+    increment = f'''
+        INSERT INTO complaint_stats (day, model_used, category, status, complaint_count)
+        VALUES ({STATS_KEY_COLUMNS.format(row='NEW')}, 1)
+        ON CONFLICT (day, model_used, category, status)
+        DO UPDATE SET complaint_count = complaint_count + 1;
+    '''
+    decrement = f'''
+        UPDATE complaint_stats SET complaint_count = complaint_count - 1
+        WHERE (day, model_used, category, status) = ({STATS_KEY_COLUMNS.format(row='OLD')});
+        DELETE FROM complaint_stats
+        WHERE (day, model_used, category, status) = ({STATS_KEY_COLUMNS.format(row='OLD')})
+          AND complaint_count <= 0;
+    '''
+    c.execute(f'CREATE TRIGGER IF NOT EXISTS complaint_stats_insert AFTER INSERT ON complaints BEGIN {increment} END')
+    c.execute(f'CREATE TRIGGER IF NOT EXISTS complaint_stats_delete AFTER DELETE ON complaints BEGIN {decrement} END')
+    c.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS complaint_stats_update
+        AFTER UPDATE OF created_at, model_used, category, status ON complaints
+        BEGIN {decrement} {increment} END
+    ''')
+    rebuild_complaint_stats(c)
+
+def rebuild_complaint_stats(c):
+    """complaint_stats'ı complaints tablosundan baştan hesapla"""
+    c.execute('DELETE FROM complaint_stats')
+    c.execute(f'''
+        INSERT INTO complaint_stats (day, model_used, category, status, complaint_count)
+        SELECT {STATS_KEY_COLUMNS.format(row='complaints')}, COUNT(*)
+        FROM complaints
+        GROUP BY 1, 2, 3, 4
+    ''')
+
+def migrate_unique_complaint_numbers(c):
+    # Numara ayırıcı için tek satırlık sıra tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS complaint_number_sequence (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            next_value INTEGER NOT NULL
+        )
+    ''')
+    c.execute('INSERT OR IGNORE INTO complaint_number_sequence (id, next_value) VALUES (1, 0)')
+    # Eski rastgele numaralardaki çakışmalar: ilk kayıt numarasını korur, diğerlerine yeni numara verilir
+    c.execute('''
+        SELECT id, complaint_number FROM complaints
+        WHERE complaint_number IN (
+            SELECT complaint_number FROM complaints GROUP BY complaint_number HAVING COUNT(*) > 1
+        )
+          AND id NOT IN (
+            SELECT MIN(id) FROM complaints GROUP BY complaint_number HAVING COUNT(*) > 1
+        )
+    ''')
+    for complaint_id, old_number in c.fetchall():
+        new_number = allocate_complaint_number(c)
+        c.execute('UPDATE complaints SET complaint_number = ? WHERE id = ?', (new_number, complaint_id))
+        print(f"Çakışan şikayet numarası değiştirildi: {old_number} -> {new_number} (id {complaint_id})")  # Debug için
+    c.execute('DROP INDEX IF EXISTS idx_complaints_number')
+    c.execute('CREATE UNIQUE INDEX idx_complaints_number ON complaints (complaint_number)')
+
+def migrate_user_complaints_index(c):
+    # Kullanıcı şikayetleri en yeniden eskiye okunur; eski artan indeksin yerini alır
+    c.execute('CREATE INDEX IF NOT EXISTS idx_complaints_user_created_desc ON complaints (user_id, created_at DESC)')
+    c.execute('DROP INDEX IF EXISTS idx_complaints_user_created')
+
+def migrate_complaint_search(c):
+    # İçerik araması için FTS5 tablosu; SQLite FTS5 olmadan derlenmişse atlanır
     try:
         c.execute('''
-            SELECT 
-                c.complaint_number,
-                c.complaint_text,
-                c.category,
-                c.status,
-                c.created_at,
-                u.name,
-                u.email,
-                u.phone,
-                c.model_used  -- model_used'ı da seç
-            FROM complaints c
-            JOIN users u ON c.user_id = u.id
-            ORDER BY c.created_at DESC
+            CREATE VIRTUAL TABLE IF NOT EXISTS complaints_fts
+            USING fts5(body, tokenize = 'unicode61 remove_diacritics 0')
         ''')
-        complaints = c.fetchall()
-        print(f"Toplam {len(complaints)} şikayet bulundu")  # Debug için
-        return complaints
-    except Exception as e:
-        print(f"Şikayet getirme hatası: {e}")  # Debug için
-        return []
-    finally:
-        conn.close()
+    except sqlite3.OperationalError as e:
+        print(f"FTS5 kullanılamıyor, içerik araması LIKE ile yapılacak: {e}")  # Debug için
+        return
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS complaints_fts_insert AFTER INSERT ON complaints BEGIN
+            INSERT INTO complaints_fts (rowid, body) VALUES (NEW.id, complaint_search_text(NEW.complaint_text));
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS complaints_fts_delete AFTER DELETE ON complaints BEGIN
+            DELETE FROM complaints_fts WHERE rowid = OLD.id;
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS complaints_fts_update AFTER UPDATE OF complaint_text ON complaints BEGIN
+            UPDATE complaints_fts SET body = complaint_search_text(NEW.complaint_text) WHERE rowid = NEW.id;
+        END
+    ''')
+    c.execute('''
+        INSERT INTO complaints_fts (rowid, body)
+        SELECT id, complaint_search_text(complaint_text) FROM complaints
+    ''')
 
-# Veritabanını başlat
-init_db()
+def migrate_answered_by(c):
+    # Şikayeti sınıflandıran model; auto modunda cevap veren aşama. Eski kayıtlarda
+    # NULL kalır (model_used'daki model sınıflandırmıştır). (model_used, answered_by)
+    # indeksi model filtresini de karşıladığı için tek sütunlu indeks kaldırılır.
+    c.execute('ALTER TABLE complaints ADD COLUMN answered_by TEXT')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_complaints_model_answered ON complaints (model_used, answered_by)')
+    c.execute('DROP INDEX IF EXISTS idx_complaints_model')
+
+def migrate_complaint_predictions(c):
+    # Her şikayet için tüm modellerin tahmini ve çoğunluk oyu; admin paneli model
+    # uyumunu buradan okur. Mevcut şikayetler backfill-ensemble ile puanlanır.
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS complaint_predictions (
+            complaint_id INTEGER PRIMARY KEY,
+            mb TEXT,
+            sgd TEXT,
+            lr TEXT,
+            dl TEXT,
+            majority TEXT NOT NULL,
+            scored_at TIMESTAMP NOT NULL
+        )
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS complaint_predictions_delete AFTER DELETE ON complaints BEGIN
+            DELETE FROM complaint_predictions WHERE complaint_id = OLD.id;
+        END
+    ''')
 
-# Modelleri ve vectorizer'ı yükle
-print(f"Scikit-learn version: {sklearn.__version__}")
+def migrate_complaint_search_triggers(c):
+    # Migration 7'nin tetikleyicileri uygulamanın kaydettiği complaint_search_text
+    # fonksiyonunu çağırıyordu: başka araçlar şikayet ekleyemiyor, kök bulma da yazma
+    # kilidi altında yapılıyordu. Dizin satırını artık save_complaint yazar; metin
+    # değişirse satır silinir ve sync_complaint_search yeniden dizinler.
+    c.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'complaints_fts'")
+    if c.fetchone() is None:
+        return
+    c.execute('DROP TRIGGER IF EXISTS complaints_fts_insert')
+    c.execute('DROP TRIGGER IF EXISTS complaints_fts_update')
+    c.execute('''
+        CREATE TRIGGER complaints_fts_update AFTER UPDATE OF complaint_text ON complaints BEGIN
+            DELETE FROM complaints_fts WHERE rowid = OLD.id;
+        END
+    ''')
 
-try:
-    warnings.filterwarnings('ignore')
-    
-    # Model yolunu düzelt
-    model_path = "models"
-    
-    # Mevcut modelleri yükle
-    with open(os.path.join(model_path, 'multinomial_nb_model.pkl'), 'rb') as f:
-        mb_model = pickle.load(f)
-    
-    with open(os.path.join(model_path, 'count_vectorizer.pkl'), 'rb') as f:
-        count_vectorizer = pickle.load(f)
+def migrate_complaint_search_queue(c):
+    # Metni değişen şikayetin dizin satırı silindikten sonra sadece açılıştaki tam
+    # taramada yeniden yazılıyordu. Tetikleyiciler artık eklenen ve metni değişen
+    # şikayetleri kuyruğa koyar; sync_complaint_search her aramadan önce kuyruğu boşaltır.
+    if not complaint_search_available(c):
+        return
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS complaints_fts_pending (
+            complaint_id INTEGER PRIMARY KEY
+        )
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS complaints_fts_pending_insert AFTER INSERT ON complaints BEGIN
+            INSERT OR IGNORE INTO complaints_fts_pending (complaint_id) VALUES (NEW.id);
+        END
+    ''')
+    c.execute('DROP TRIGGER IF EXISTS complaints_fts_update')
+    c.execute('''
+        CREATE TRIGGER complaints_fts_update AFTER UPDATE OF complaint_text ON complaints BEGIN
+            DELETE FROM complaints_fts WHERE rowid = OLD.id;
+            INSERT OR IGNORE INTO complaints_fts_pending (complaint_id) VALUES (NEW.id);
+        END
+    ''')
+    c.execute('''
+        INSERT OR IGNORE INTO complaints_fts_pending (complaint_id)
+        SELECT id FROM complaints c WHERE NOT EXISTS (SELECT 1 FROM complaints_fts f WHERE f.rowid = c.id)
+    ''')
+
+def migrate_user_complaint_versions(c):
+    # Kullanıcı başına şikayet sayacı; oturum önbellekleri (cached_user_complaints) buna
+    # bakar. Tetikleyiciler sadece SQL kullanır, böylece CLI ve başka süreçlerin
+    # yazmaları da sayacı artırır. Süreç içi sayaçlar diğer süreçlerin yazmalarını görmüyordu.
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS user_complaint_versions (
+            user_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL
+        )
+    ''')
+    bump = '''
+        INSERT INTO user_complaint_versions (user_id, version) VALUES ({row}.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET version = version + 1;
+    '''
+    c.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS user_complaint_versions_insert AFTER INSERT ON complaints BEGIN
+            {bump.format(row='NEW')}
+        END
+    ''')
+    # Kullanıcının gördüğü sütunlar; answered_by ve classification_error sayacı artırmaz
+    c.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS user_complaint_versions_update
+        AFTER UPDATE OF user_id, complaint_number, complaint_text, category, status, created_at, model_used
+        ON complaints BEGIN
+            {bump.format(row='NEW')}
+        END
+    ''')
+    # Şikayet başka kullanıcıya taşınırsa eski sahibinin listesi de değişir
+    c.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS user_complaint_versions_move AFTER UPDATE OF user_id ON complaints
+        WHEN OLD.user_id IS NOT NEW.user_id BEGIN
+            {bump.format(row='OLD')}
+        END
+    ''')
+    c.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS user_complaint_versions_delete AFTER DELETE ON complaints BEGIN
+            {bump.format(row='OLD')}
+        END
+    ''')
+
+def migrate_prediction_fingerprint(c):
+    # Tahminleri üreten model dosyalarının özeti; model değişince eski satırlar uyum
+    # oranlarına karışmaz ve backfill-ensemble onları yeniden puanlar
+    c.execute('ALTER TABLE complaint_predictions ADD COLUMN fingerprint TEXT')
+
+def migrate_classification_error(c):
+    # Arka plan sınıflandırması denemeler tükenince FAILED_CATEGORY yazar; son hata burada tutulur
+    c.execute('ALTER TABLE complaints ADD COLUMN classification_error TEXT')
+
+# (sürüm, açıklama, uygulama fonksiyonu); yeni migration'lar sona eklenir, sürümler değişmez
+MIGRATIONS = [
+    (1, "Şikayet sorguları için indeksler", migrate_complaint_indexes),
+    (2, "Eski durum adlarını 'İnceleniyor' yap", migrate_status_names),
+    (3, "Model kısaltmalarını tam adlara çevir", migrate_model_names),
+    (4, "Dashboard sayaçları için complaint_stats tablosu ve tetikleyicileri", migrate_complaint_stats),
+    (5, "Benzersiz şikayet numaraları: sıra tablosu ve UNIQUE indeks", migrate_unique_complaint_numbers),
+    (6, "Kullanıcı şikayetleri için (user_id, created_at DESC) indeksi", migrate_user_complaints_index),
+    (7, "İçerik araması için complaints_fts (FTS5) tablosu ve tetikleyicileri", migrate_complaint_search),
+    (8, "Sınıflandıran model/kademe aşaması için answered_by sütunu", migrate_answered_by),
+    (9, "Tüm modellerin tahminleri ve çoğunluk oyu için complaint_predictions tablosu", migrate_complaint_predictions),
+    (10, "complaints_fts tetikleyicilerinden uygulama fonksiyonunu kaldır", migrate_complaint_search_triggers),
+    (11, "Sınıflandırılamayan şikayetlerin hatası için classification_error sütunu", migrate_classification_error),
+    (12, "complaint_predictions satırlarına model özeti (fingerprint) sütunu", migrate_prediction_fingerprint),
+    (13, "Oturum önbellekleri için kullanıcı başına şikayet sayacı ve tetikleyicileri", migrate_user_complaint_versions),
+    (14, "Dizinlenecek şikayetler için complaints_fts_pending kuyruğu ve tetikleyicileri", migrate_complaint_search_queue),
+]
+
+def run_migrations():
+    """Uygulanmamış migration'ları sırayla, her birini kendi transaction'ında uygula"""
+    db = get_db()
+    with db.transaction() as c:
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+    with db.connection() as conn:
+        applied = {row[0] for row in conn.execute('SELECT version FROM schema_version')}
+
+    for version, description, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        with db.transaction() as c:
+            # Başka bir süreç aynı anda uygulamış olabilir, yazma kilidi altında tekrar bak
+            c.execute('SELECT 1 FROM schema_version WHERE version = ?', (version,))
+            if c.fetchone():
+                continue
+            migrate(c)
+            c.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                     (version, description))
+        print(f"Migration uygulandı: {version} - {description}")
+
+@st.cache_resource(show_spinner=False)
+def bootstrap_database(path):
+    """Şemayı oluştur ve migration'ları uygula; süreç ve veritabanı başına bir kez çalışır
+
+    Streamlit her etkileşimde modülü yeniden çalıştırdığı için bu iş istek
+    akışından ayrıldı; migration'ların kalıcı takibi schema_version'dadır.
+    """
+    init_db()
+    run_migrations()
+    indexed = sync_complaint_search()
+    if indexed:
+        print(f"Arama dizinine {indexed} şikayet eklendi")  # Debug için
+    return path
+
+# Veritabanını sıfırlamak için önce bu fonksiyonu ekleyelim
+def reset_db():
+    # Eğer veritabanı dosyası varsa sil
+    if os.path.exists(DB_PATH):
+        return  # Veritabanı varsa hiçbir şey yapma
     
-    with open(os.path.join(model_path, 'logistic_model.pkl'), 'rb') as f:
-        best_lr_model = pickle.load(f)
+    # Yeni veritabanını oluştur
+    with get_db().transaction() as c:
+        # Kullanıcılar tablosu
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL UNIQUE,
+                phone TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
         
-    with open(os.path.join(model_path, 'sgd_model.pkl'), 'rb') as f:
-        sgd_model = pickle.load(f)
+        # Şikayetler tablosu
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS complaints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                complaint_number INTEGER NOT NULL,
+                complaint_text TEXT NOT NULL,
+                category TEXT NOT NULL,
+                model_used TEXT NOT NULL,
+                status TEXT DEFAULT 'İnceleniyor',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+        ''')
 
-    # Deep Learning modelini yükle (custom_objects ile)
+# Mevcut kayıtları güncellemek için yeni fonksiyon
+def update_model_names():
     try:
-        dl_model = keras.models.load_model(
-            os.path.join(model_path, 'deep_learning_model.keras'),
-            custom_objects=None,  # Eğer özel katmanlar/metrikler varsa burada belirtin
-            compile=False  # Modeli compile etmeden yükle
-        )
-        dl_model.compile(
-            optimizer='adam',
-            loss='binary_crossentropy',
-            metrics=['accuracy']
+        with get_db().transaction() as c:
+            # Önce mevcut model isimlerini kontrol et
+            c.execute('SELECT DISTINCT model_used FROM complaints')
+            current_models = c.fetchall()
+            print("Mevcut model isimleri:", current_models)  # Debug için
+            
+            # Model isimlerini güncelle
+            c.execute('''
+                UPDATE complaints 
+                SET model_used = 'MultinomialNB' 
+                WHERE model_used = 'mb' OR model_used = '';
+            ''')
+            c.execute('''
+                UPDATE complaints 
+                SET model_used = 'SGD Classifier' 
+                WHERE model_used = 'sgd';
+            ''')
+            c.execute('''
+                UPDATE complaints 
+                SET model_used = 'Logistic Regression' 
+                WHERE model_used = 'lr';
+            ''')
+            c.execute('''
+                UPDATE complaints 
+                SET model_used = 'Deep Learning' 
+                WHERE model_used = 'dl';
+            ''')
+        
+        # Güncelleme sonrası kontrol
+        with get_db().connection() as conn:
+            updated_models = conn.execute('SELECT DISTINCT model_used FROM complaints').fetchall()
+        print("Güncellenmiş model isimleri:", updated_models)  # Debug için
+        
+    except Exception as e:
+        print(f"Model güncelleme hatası: {e}")
+
+# Debug fonksiyonu
+def debug_complaints():
+    with get_db().connection() as conn:
+        c = conn.cursor()
+        try:
+            c.execute('''
+                SELECT complaint_number, model_used, category, status
+                FROM complaints
+                ORDER BY created_at DESC
+                LIMIT 10
+            ''')
+            complaints = c.fetchall()
+            print("\nSon 10 şikayet:")
+            for complaint in complaints:
+                print(f"Şikayet #{complaint[0]}: Model={complaint[1]}, Kategori={complaint[2]}, Durum={complaint[3]}")
+                
+            c.execute('SELECT COUNT(*), model_used FROM complaints GROUP BY model_used')
+            counts = c.fetchall()
+            print("\nModel bazlı şikayet sayıları:")
+            for count in counts:
+                print(f"{count[1]}: {count[0]} şikayet")
+                
+        except Exception as e:
+            print(f"Debug hatası: {e}")
+
+# Modelleri ve vectorizer'ı yükle
+print(f"Scikit-learn version: {sklearn.__version__}")
+warnings.filterwarnings('ignore')
+
+# Model yolunu düzelt (çalışma dizininden bağımsız, app.py'nin yanındaki models/)
+model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+
+# Kayıt defterindeki model anahtarları ve dosyaları
+MODEL_FILES = {
+    'mb': 'multinomial_nb_model.pkl',
+    'sgd': 'sgd_model.pkl',
+    'lr': 'logistic_model.pkl',
+    'dl': 'deep_learning_model.keras',
+    'vectorizer': 'count_vectorizer.pkl',
+    'label_binarizer': 'label_binarizer.pkl',
+    'label_mapping': 'label_mapping.pkl',
+}
+
+# DL modeli isteğe bağlı, diğerleri olmadan uygulama açılamaz
+REQUIRED_MODEL_FILES = [file_name for key, file_name in MODEL_FILES.items() if key != 'dl']
+
+# Doğrusal modellerin NumPy puanlayıcı dosyaları (export-scorers ile üretilir).
+# Kayıt defteri, kaynak pickle'ın SHA-256 özeti eşleşiyorsa pickle yerine bunları yükler.
+SCORER_FILES = {
+    'mb': 'multinomial_nb_scorer.npz',
+    'sgd': 'sgd_scorer.npz',
+    'lr': 'logistic_scorer.npz',
+}
+
+# Vectorizer'ın sıkıştırılmış sözlük dosyası (export-vocabulary ile üretilir); aynı özet kuralıyla yüklenir
+VOCABULARY_FILE = 'count_vectorizer_vocabulary.npz'
+
+def compact_artifact_file(key):
+    """Anahtarın pickle yerine yüklenebilecek NumPy dosyası (yoksa None)"""
+    return VOCABULARY_FILE if key == 'vectorizer' else SCORER_FILES.get(key)
+
+class LinearScorer:
+    """sklearn doğrusal/NB modellerinin NumPy karşılığı: puan = X @ weights + bias, sınıf = argmax
+
+    LogisticRegression ve SGDClassifier için weights coef_.T, bias intercept_;
+    MultinomialNB için weights feature_log_prob_.T, bias class_log_prior_.
+    proba: 'ovr' (sigmoid + normalize), 'softmax', 'modified_huber'
+    ((clip(puan, -1, 1) + 1) / 2 + normalize) veya 'none' (olasılık yok).
+    """
+
+    # SGDClassifier loss -> olasılık biçimi; 'log' ve 'squared_loss' sklearn 1.3 öncesi adlardır.
+    # Listede olmayan bir loss için predict_proba davranışı bilinmediğinden dışa aktarılmaz.
+    SGD_LOSS_PROBA = {
+        'log_loss': 'ovr',
+        'log': 'ovr',
+        'modified_huber': 'modified_huber',
+        'hinge': 'none',
+        'squared_hinge': 'none',
+        'perceptron': 'none',
+        'squared_error': 'none',
+        'squared_loss': 'none',
+        'huber': 'none',
+        'epsilon_insensitive': 'none',
+        'squared_epsilon_insensitive': 'none',
+    }
+
+    def __init__(self, weights, bias, classes, proba, source_sha256):
+        self.weights = weights
+        self.bias = bias
+        self.classes_ = classes
+        self.proba = proba
+        self.source_sha256 = source_sha256
+
+    @classmethod
+    def from_estimator(cls, estimator, source_sha256):
+        if hasattr(estimator, 'feature_log_prob_'):
+            weights, bias, proba = estimator.feature_log_prob_, estimator.class_log_prior_, 'softmax'
+        else:
+            weights, bias = estimator.coef_, estimator.intercept_
+            if hasattr(estimator, 'solver'):
+                proba = cls._logistic_regression_proba(estimator)
+            elif hasattr(estimator, 'loss'):
+                proba = cls.SGD_LOSS_PROBA.get(estimator.loss)
+                if proba is None:
+                    raise ValueError(f"{type(estimator).__name__}: desteklenmeyen loss '{estimator.loss}'")
+            else:
+                proba = 'none'
+        if weights.shape[0] < 3:
+            raise ValueError(f"{type(estimator).__name__}: sadece çok sınıflı modeller dışa aktarılabilir")
+        return cls(np.ascontiguousarray(weights.T, dtype=np.float64), np.asarray(bias, dtype=np.float64),
+                   np.asarray(estimator.classes_), proba, source_sha256)
+
+    @staticmethod
+    def _logistic_regression_proba(estimator):
+        # multi_class parametresini hâlâ kabul eden sklearn sürümlerinde 'ovr' (0.22 öncesi
+        # varsayılan ve 'warn'), ya da 'auto'/'deprecated' iken liblinear çözücü OvR olasılığı
+        # (sigmoid + normalize) verir. Parametreyi kaldıran sürümler çok sınıflıda hep softmax
+        # kullanır; puanlayıcı kurulu sklearn'ün predict_proba'sıyla aynı olmalı (export-scorers doğrular)
+        if 'multi_class' not in type(estimator)._get_param_names():
+            return 'softmax'
+        multi_class = getattr(estimator, 'multi_class', 'auto')
+        if multi_class in ('ovr', 'warn'):
+            return 'ovr'
+        if multi_class in ('auto', 'deprecated') and estimator.solver == 'liblinear':
+            return 'ovr'
+        return 'softmax'
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['weights'], data['bias'], data['classes'], str(data['proba']), str(data['source_sha256']))
+
+    def save(self, path):
+        np.savez(path, weights=self.weights, bias=self.bias, classes=self.classes_,
+                 proba=np.str_(self.proba), source_sha256=np.str_(self.source_sha256))
+
+    def decision_function(self, text_vectors):
+        return text_vectors @ self.weights + self.bias
+
+    def predict(self, text_vectors):
+        return self.classes_[self.decision_function(text_vectors).argmax(axis=1)]
+
+    def predict_proba(self, text_vectors):
+        scores = self.decision_function(text_vectors)
+        if self.proba == 'ovr':
+            probabilities = 1.0 / (1.0 + np.exp(-scores))
+        elif self.proba == 'softmax':
+            probabilities = np.exp(scores - scores.max(axis=1, keepdims=True))
+        elif self.proba == 'modified_huber':
+            probabilities = (np.clip(scores, -1.0, 1.0) + 1.0) / 2.0
+            # Tüm sınıflar 0 çıkarsa sklearn gibi eşit olasılık verilir
+            probabilities[probabilities.sum(axis=1) == 0] = 1.0
+        else:
+            raise AttributeError("Bu model olasılık üretmiyor")
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+class CompactVectorizer:
+    """Eğitilmiş CountVectorizer sözlüğünün sıkıştırılmış karşılığı
+
+    Terimler UTF-8 bayt olarak sıralı sabit genişlikli bir NumPy dizisinde
+    tutulur, token→sütun eşlemesi searchsorted ile yapılır. Çıktı
+    count_vectorizer.transform ile birebir aynı CSR matristir; sadece
+    analyzer='word', ngram_range=(1, 1) ve ek ön işlem içermeyen sözlükler desteklenir.
+    """
+
+    def __init__(self, terms, ids, token_pattern, lowercase, dtype, source_sha256):
+        self.terms = terms
+        self.ids = ids
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.dtype = np.dtype(dtype)
+        self.source_sha256 = source_sha256
+        self.n_features = len(terms)
+        self._pattern = re.compile(token_pattern)
+        self._last_position = len(terms) - 1
+        self._vocabulary = None
+        # Tek belgelik çağrılar için boş satır şablonu; csr_matrix kurucusunun
+        # doğrulaması (~25 µs) tek belgede tüm transform süresinin yarısına denk geliyor
+        self._empty_row = scipy.sparse.csr_matrix((1, self.n_features), dtype=self.dtype)
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer, source_sha256):
+        unsupported = [
+            name for name, supported in [
+                # TF-IDF çıktısı ham sayım değil; ağırlıklandırma ve normalizasyon yapılmaz
+                ('tfidf', not isinstance(vectorizer, TfidfVectorizer)),
+                ('analyzer', vectorizer.analyzer == 'word'),
+                ('ngram_range', tuple(vectorizer.ngram_range) == (1, 1)),
+                ('preprocessor', vectorizer.preprocessor is None),
+                ('tokenizer', vectorizer.tokenizer is None),
+                ('stop_words', not vectorizer.stop_words),
+                ('strip_accents', not vectorizer.strip_accents),
+                ('binary', not vectorizer.binary),
+            ] if not supported
+        ]
+        if unsupported:
+            raise ValueError(f"Desteklenmeyen vectorizer ayarları: {', '.join(unsupported)}")
+        encoded = sorted((term.encode('utf-8'), index) for term, index in vectorizer.vocabulary_.items())
+        terms = np.array([term for term, _ in encoded], dtype=np.bytes_)
+        ids = np.array([index for _, index in encoded], dtype=np.int32)
+        return cls(terms, ids, vectorizer.token_pattern, vectorizer.lowercase,
+                   np.dtype(vectorizer.dtype).name, source_sha256)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['terms'], data['ids'], str(data['token_pattern']), bool(data['lowercase']),
+                       str(data['dtype']), str(data['source_sha256']))
+
+    def save(self, path):
+        np.savez_compressed(path, terms=self.terms, ids=self.ids, token_pattern=np.str_(self.token_pattern),
+                            lowercase=np.bool_(self.lowercase), dtype=np.str_(self.dtype.name),
+                            source_sha256=np.str_(self.source_sha256))
+
+    def transform(self, raw_documents):
+        # Tokenlar belge içinde Python sözlüğüyle sayılır, NumPy'ye sadece farklı
+        # tokenlar gider. Sözlükteki en uzun terimden uzun tokenlar diziye
+        # dönüştürülürken kırpılıp yanlış eşleşebileceği için baştan elenir.
+        max_term_bytes = self.terms.dtype.itemsize
+        tokens = []
+        counts = []
+        indptr = [0]
+        for doc in raw_documents:
+            doc_counts = {}
+            for token in self._pattern.findall(doc.lower() if self.lowercase else doc):
+                doc_counts[token] = doc_counts.get(token, 0) + 1
+            for token, count in doc_counts.items():
+                encoded = token.encode('utf-8')
+                if len(encoded) <= max_term_bytes:
+                    tokens.append(encoded)
+                    counts.append(count)
+            indptr.append(len(tokens))
+        n_docs = len(indptr) - 1
+
+        keys = np.array(tokens, dtype=self.terms.dtype)
+        positions = np.minimum(np.searchsorted(self.terms, keys), self._last_position)
+        found = self.terms[positions] == keys
+        columns = self.ids[positions[found]]
+        data = np.fromiter(counts, dtype=self.dtype, count=len(counts))[found]
+        if n_docs == 1:
+            order = np.argsort(columns)
+            # Şablonun yüzeysel kopyası: diziler zaten geçerli (sıralı, tekrarsız), doğrulama atlanır
+            matrix = copy.copy(self._empty_row)
+            matrix.data = data[order]
+            matrix.indices = columns[order]
+            matrix.indptr = np.array([0, len(columns)], dtype=np.int32)
+            return matrix
+        # Belgeler zaten ardışık; sütunlar her belgenin kendi içinde sıralanır
+        doc_indices = np.repeat(np.arange(n_docs, dtype=np.int64), np.diff(indptr))[found]
+        order = np.argsort(doc_indices * self.n_features + columns)
+        found_before = np.concatenate(([0], np.cumsum(found)))
+        return scipy.sparse.csr_matrix(
+            (data[order], columns[order], found_before[indptr].astype(np.int32)),
+            shape=(n_docs, self.n_features),
         )
-    except Exception as dl_error:
-        print(f"Deep Learning model yükleme hatası: {dl_error}")
-        dl_model = None
 
-    # Label Binarizer'ı yükle
-    with open(os.path.join(model_path, 'label_binarizer.pkl'), 'rb') as f:
-        label_binarizer = pickle.load(f)
+    def get_feature_names_out(self):
+        names = np.empty(self.n_features, dtype=object)
+        names[self.ids] = [term.decode('utf-8') for term in self.terms]
+        return names
+
+    @property
+    def vocabulary_(self):
+        # sklearn uyumluluğu için; sözlük sadece ilk erişimde (CLI araçlarında) kurulur
+        if self._vocabulary is None:
+            self._vocabulary = {term.decode('utf-8'): int(index) for term, index in zip(self.terms, self.ids)}
+        return self._vocabulary
+
+# Model dosyalarının değişip değişmediğine en fazla bu sıklıkta (saniye) bakılır
+MODEL_CHANGE_CHECK_INTERVAL = 2.0
+
+def resident_memory_bytes():
+    """Sürecin o anki yerleşik belleği (RSS, byte); /proc olmayan sistemlerde en yüksek RSS
+
+    Ölçüm süreç geneli olduğu için aynı anda çalışan diğer thread'lerin ayırdığı
+    bellek de sayılır; model yükleme maliyeti için kaba bir göstergedir.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss Linux'ta KB, macOS'ta byte cinsindendir
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+class ModelRegistry:
+    """Model dosyalarını süreç başına bir kez, ilk kullanımda yükleyen kayıt defteri"""
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+        self._artifacts = {}
+        self._stats = {}
+        self._fingerprints = {}
+        self._signatures = {}
+        self._checked_at = {}
+        self._file_hashes = {}
+        self._lock = threading.Lock()
+
+    def _load_pickle(self, file_name):
+        with open(os.path.join(self.model_path, file_name), 'rb') as f:
+            return pickle.load(f)
+
+    def _load_dl_model(self):
+        # Deep Learning modelini yükle (custom_objects ile)
+        try:
+            # TensorFlow sadece DL modeli ilk kez istendiğinde import edilir;
+            # DL trafiği almayan süreçler import süresini ve belleğini ödemez
+            from tensorflow import keras
+
+            dl_model = keras.models.load_model(
+                os.path.join(self.model_path, MODEL_FILES['dl']),
+                custom_objects=None,  # Eğer özel katmanlar/metrikler varsa burada belirtin
+                compile=False  # Modeli compile etmeden yükle
+            )
+            dl_model.compile(
+                optimizer='adam',
+                loss='binary_crossentropy',
+                metrics=['accuracy']
+            )
+            return dl_model
+        except Exception as dl_error:
+            print(f"Deep Learning model yükleme hatası: {dl_error}")
+            return None
+
+    def _load_scorer(self, key):
+        # Dışa aktarılmış NumPy puanlayıcı/sözlük, sadece pickle'ın kendisinden üretildiyse kullanılır
+        artifact_file = compact_artifact_file(key)
+        if artifact_file is None:
+            return None
+        artifact_path = os.path.join(self.model_path, artifact_file)
+        if not os.path.exists(artifact_path):
+            return None
+        loader = CompactVectorizer if key == 'vectorizer' else LinearScorer
+        try:
+            scorer = loader.load(artifact_path)
+        except Exception as e:
+            print(f"Puanlayıcı okunamadı, pickle kullanılacak: {artifact_file} ({e})")  # Debug için
+            return None
+        if scorer.source_sha256 != self._file_hash(os.path.join(self.model_path, MODEL_FILES[key])):
+            print(f"Puanlayıcı güncel değil, pickle kullanılacak: {artifact_file}")  # Debug için
+            return None
+        return scorer
+
+    def missing_files(self):
+        """Diskte bulunmayan zorunlu model dosyalarını döndür"""
+        return [
+            file_name for file_name in REQUIRED_MODEL_FILES
+            if not os.path.exists(os.path.join(self.model_path, file_name))
+        ]
+
+    def get(self, key):
+        """Artefaktı döndür; henüz yüklenmediyse veya dosyası değiştiyse şimdi yükle"""
+        if key in self._artifacts and not self._may_have_changed(key):
+            return self._artifacts[key]
+
+        with self._lock:
+            # Başka bir oturum kilidi beklerken yüklemiş olabilir
+            if key not in self._artifacts or self._file_signature(key) != self._signatures.get(key):
+                self._artifacts[key] = self._load(key)
+            return self._artifacts[key]
+
+    def fingerprint(self, key):
+        """Yüklü model dosyasının SHA-256 özeti (yüklenemediyse None)"""
+        self.get(key)
+        return self._fingerprints.get(key)
+
+    def loaded(self, key):
+        """Artefakt bu süreçte zaten yüklendiyse onu, değilse None döndür (yükleme yapmaz)"""
+        return self._artifacts.get(key)
+
+    def unavailable(self, key):
+        """Artefakt bu süreçte yüklenmeye çalışılıp yüklenemediyse True (yükleme yapmaz)"""
+        return key in self._artifacts and self._artifacts[key] is None
+
+    def file_fingerprint(self, key):
+        """Diskteki model dosyasının SHA-256 özeti; modeli yüklemez (dosya yoksa None)
+
+        Yüklü artefakt için yüklenen dosyanın özeti döner; yüklenmemiş dosyaların
+        özeti dosya imzası (mtime, boyut) değişene kadar saklanır.
+        """
+        if self._artifacts.get(key) is not None:
+            return self._fingerprints.get(key)
+        signature = self._file_signature(key)
+        if signature is None:
+            return None
+        cached = self._file_hashes.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, self._file_hash(os.path.join(self.model_path, MODEL_FILES[key])))
+            self._file_hashes[key] = cached
+        return cached[1]
+
+    def _file_signature(self, key):
+        try:
+            file_stat = os.stat(os.path.join(self.model_path, MODEL_FILES[key]))
+        except OSError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    def _may_have_changed(self, key):
+        # Her çağrıda stat yapmamak için kontrol MODEL_CHANGE_CHECK_INTERVAL ile seyreltilir
+        now = time.monotonic()
+        if now - self._checked_at.get(key, 0.0) < MODEL_CHANGE_CHECK_INTERVAL:
+            return False
+        self._checked_at[key] = now
+        return self._file_signature(key) != self._signatures.get(key)
+
+    def _file_hash(self, file_path):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _load(self, key):
+        file_name = MODEL_FILES[key]
+        # İmza yüklemeden önce alınır; yükleme sırasında yazılan dosya bir sonraki kontrolde yakalanır
+        self._signatures[key] = self._file_signature(key)
+        self._checked_at[key] = time.monotonic()
+
+        # Yükleme öncesi/sonrası RSS farkı; tracemalloc her ayırmayı izlediği için yüklemeyi yavaşlatıyordu
+        memory_before = resident_memory_bytes()
+        start = time.perf_counter()
+        file_format = 'pickle'
+        try:
+            if key == 'dl':
+                artifact = self._load_dl_model()
+                file_format = 'keras'
+            else:
+                artifact = self._load_scorer(key)
+                if artifact is not None:
+                    file_format = 'npz'
+                else:
+                    artifact = self._load_pickle(file_name)
+        finally:
+            load_seconds = time.perf_counter() - start
+            memory_after = resident_memory_bytes()
+
+        file_path = os.path.join(self.model_path, file_name)
+        if artifact is None or not os.path.exists(file_path):
+            self._fingerprints[key] = None
+        else:
+            self._fingerprints[key] = self._file_hash(file_path)
+        # Puanlayıcı yüklendiyse maliyet tablosunda onun dosyası görünür; özet pickle'ınkidir
+        loaded_file = compact_artifact_file(key) if file_format == 'npz' else file_name
+        loaded_path = os.path.join(self.model_path, loaded_file)
+        self._stats[key] = {
+            'model': key,
+            'dosya': loaded_file,
+            'dosya_boyutu_kb': round(os.path.getsize(loaded_path) / 1024, 1) if os.path.exists(loaded_path) else None,
+            'yukleme_suresi_ms': round(load_seconds * 1000, 1),
+            'rss_artisi_kb': (round(max(memory_after - memory_before, 0) / 1024, 1)
+                              if memory_before is not None and memory_after is not None else None),
+            'bicim': file_format,
+            'ozet': (self._fingerprints[key] or '')[:12],
+        }
+        print(f"Model yüklendi: {key} ({self._stats[key]['yukleme_suresi_ms']} ms)")  # Debug için
+        return artifact
+
+    def stats(self):
+        """Yüklenmiş her model için yükleme süresi ve bellek (RSS artışı) maliyeti"""
+        return [self._stats[key] for key in MODEL_FILES if key in self._stats]
 
-    # Label mapping'i yükle
-    with open(os.path.join(model_path, 'label_mapping.pkl'), 'rb') as f:
-        label_mapping = pickle.load(f)
+@st.cache_resource(show_spinner=False)
+def get_model_registry():
+    # Streamlit her etkileşimde modülü yeniden çalıştırır; kayıt defteri
+    # oturumlar ve yeniden çalıştırmalar arasında paylaşılır
+    return ModelRegistry(model_path)
 
-except FileNotFoundError as e:
-    st.error(f"Model dosyası bulunamadı: {str(e)}")
+model_registry = get_model_registry()
+
+missing_model_files = model_registry.missing_files()
+if missing_model_files:
+    st.error(f"Model dosyası bulunamadı: {', '.join(missing_model_files)}")
     st.error(f"Aranan yol: {model_path}")
     st.error(f"Dizindeki dosyalar: {os.listdir(model_path) if os.path.exists(model_path) else 'Dizin bulunamadı'}")
     st.stop()
-except Exception as e:
-    st.error(f"Model yükleme hatası: {str(e)}")
-    st.stop()
+
+# Model çıktısındaki sınıf indeksi -> kategori adı
+CATEGORY_LABELS = {
+    0: 'İgdaş (Doğalgaz dağıtımı ve faturalandırma)',
+    1: 'İett (Toplu taşıma)',
+    2: 'İski (Su dağıtımı ve faturalandırma)',
+    3: 'Diğer İBB iştirakleri',
+    4: 'İlgisiz'
+}
+
+# Toplu sınıflandırmada tek seferde vektörleştirilen metin sayısı
+BATCH_CHUNK_SIZE = 1000
+
+# Tahmin önbelleği sınırları
+PREDICTION_CACHE_SIZE = 10000
+PREDICTION_CACHE_TTL = 3600  # saniye
+
+class PredictionCache:
+    """(model, model dosyası özeti, temiz metin özeti) -> kategori önbelleği
+
+    Kayıtlar PREDICTION_CACHE_TTL sonra geçersiz olur, dolunca en eski
+    kullanılan atılır. Model dosyası değiştiğinde özeti de değiştiği için
+    eski tahminler bir daha eşleşmez.
+    """
+
+    def __init__(self, maxsize=PREDICTION_CACHE_SIZE, ttl=PREDICTION_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            category, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return category
+
+    def put(self, key, category):
+        with self._lock:
+            self._entries[key] = (category, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'boyut': len(self._entries),
+            'kapasite': self.maxsize,
+            'isabet': self.hits,
+            'iska': self.misses,
+            'tahliye': self.evictions,
+            'suresi_dolan': self.expirations,
+            'isabet_orani': round(self.hits / lookups, 3) if lookups else None,
+        }
+
+@st.cache_resource(show_spinner=False)
+def get_prediction_cache():
+    # Aynı süreçteki tüm Streamlit oturumları paylaşır
+    return PredictionCache()
+
+def prediction_cache_key(model, cleaned_text):
+    """Tahmin önbelleği anahtarı; model dosyası yoksa/yüklenemediyse None (önbelleğe alınmaz)"""
+    if model == CASCADE_MODEL:
+        model_fingerprint = cascade_fingerprint()
+    elif model == 'dl':
+        # DL çıktısı label_binarizer ile etikete çevrilir; ikisinden biri değişirse önbellek geçersizdir
+        model_fingerprint = dl_prediction_fingerprint()
+    else:
+        model_fingerprint = model_registry.fingerprint(model)
+    vectorizer_fingerprint = model_registry.fingerprint('vectorizer')
+    if model_fingerprint is None or vectorizer_fingerprint is None:
+        return None
+    text_digest = hashlib.sha256(cleaned_text.encode('utf-8')).digest()
+    return model, model_fingerprint, vectorizer_fingerprint, text_digest
+
+# Deep Learning modeli önünde dinamik gruplama ayarları
+DL_BATCH_MAX_SIZE = 64  # bir model çağrısındaki en fazla satır
+DL_BATCH_MAX_WAIT = 0.005  # ilk istekten sonra diğer isteklerin beklendiği süre (saniye)
+
+class DynamicBatcher:
+    """Eşzamanlı tahmin isteklerini kısa bir süre toplayıp modeli tek seferde çağıran katman
+
+    Her istek bir veya daha fazla satırlık bir dizidir (yoğun ya da seyrek)
+    ve bir Future döner.
+    Arka plandaki thread ilk isteği aldıktan sonra max_wait süresince ya da
+    max_batch_size satıra ulaşana kadar istek toplar, satırları birleştirip
+    predict_fn'i bir kez çağırır ve sonuçları isteklerine dağıtır. Bekleyen
+    başka istek yoksa beklemeden çalışır: tek kullanıcı gecikme ödemez,
+    model çalışırken gelen istekler bir sonraki grupta birleşir.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=DL_BATCH_MAX_SIZE, max_wait=DL_BATCH_MAX_WAIT, stack=np.vstack):
+        self.predict_fn = predict_fn
+        self.stack = stack  # istek satırlarını tek gruba birleştiren fonksiyon
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._stats = {'istek': 0, 'cagri': 0, 'satir': 0}
+        self._stats_lock = threading.Lock()
+        self._outstanding = 0  # gönderilmiş ama sonucu verilmemiş istek sayısı
+        self._thread = threading.Thread(target=self._run, name="dl-gruplayici", daemon=True)
+        self._thread.start()
+
+    def submit(self, rows):
+        future = Future()
+        with self._stats_lock:
+            self._outstanding += 1
+        self._queue.put((rows, future))
+        return future
+
+    def predict(self, rows):
+        """İsteği kuyruğa koy ve sonucunu bekle"""
+        return self.submit(rows).result()
+
+    def stats(self):
+        with self._stats_lock:
+            calls = self._stats['cagri']
+            return {**self._stats, 'ortalama_grup': round(self._stats['satir'] / calls, 2) if calls else None}
+
+    def _next_batch(self):
+        requests = [self._queue.get()]
+        rows = requests[0][0].shape[0]
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch_size and len(requests) < self._outstanding:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            requests.append(request)
+            rows += request[0].shape[0]
+        return requests
+
+    def _run(self):
+        while True:
+            requests = self._next_batch()
+            try:
+                self._process(requests)
+            finally:
+                with self._stats_lock:
+                    self._outstanding -= len(requests)
+
+    def _process(self, requests):
+        # İptal edilmiş istekler modele gönderilmez
+        requests = [(rows, future) for rows, future in requests if future.set_running_or_notify_cancel()]
+        if not requests:
+            return
+        try:
+            batch = requests[0][0] if len(requests) == 1 else self.stack([rows for rows, _ in requests])
+            outputs = self.predict_fn(batch)
+        except BaseException as e:
+            for _, future in requests:
+                future.set_exception(e)
+            return
+        # Sayaçlar sonuçlardan önce güncellenir: sonucu alan çağıran kendi isteğini istatistikte görür
+        with self._stats_lock:
+            self._stats['istek'] += len(requests)
+            self._stats['cagri'] += 1
+            self._stats['satir'] += sum(rows.shape[0] for rows, _ in requests)
+        start = 0
+        for rows, future in requests:
+            future.set_result(outputs[start:start + rows.shape[0]])
+            start += rows.shape[0]
+
+class SparseInputDLModel:
+    """DL modelinin ilk Dense katmanını seyrek girdiyle (CSR @ W + b) hesaplayan sarmalayıcı
+
+    Sözlük boyutundaki yoğun satır hiç oluşturulmaz: ilk katman sadece
+    sıfır olmayan terimlerin ağırlık satırlarını toplar. Kalan katmanlar
+    Keras katmanları olarak (training=False) sırayla çalıştırılır.
+    """
+
+    def __init__(self, first_layer, remaining_layers):
+        weights = first_layer.get_weights()
+        self.kernel = np.asarray(weights[0], dtype=np.float32)
+        self.bias = np.asarray(weights[1], dtype=np.float32) if len(weights) > 1 else None
+        self.activation = first_layer.activation
+        self.remaining_layers = remaining_layers
+
+    @classmethod
+    def from_keras(cls, dl_model, input_dim):
+        """Model sıralı ve girdisi doğrudan bir Dense katmanına gidiyorsa sarmalayıcıyı kur, yoksa None"""
+        from tensorflow import keras
+
+        if not isinstance(dl_model, keras.Sequential):
+            return None
+        layers = [layer for layer in dl_model.layers if not isinstance(layer, keras.layers.InputLayer)]
+        if not layers or not isinstance(layers[0], keras.layers.Dense):
+            return None
+        if layers[0].get_weights()[0].shape[0] != input_dim:
+            return None
+        return cls(layers[0], layers[1:])
+
+    def predict(self, text_vectors):
+        hidden = text_vectors.astype(np.float32) @ self.kernel
+        if self.bias is not None:
+            hidden += self.bias
+        outputs = self.activation(hidden)
+        for layer in self.remaining_layers:
+            outputs = layer(outputs, training=False)
+        return np.asarray(outputs)
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def get_sparse_dl_model(dl_fingerprint, vectorizer_fingerprint, _dl_model, _vectorizer):
+    # Model veya vectorizer dosyası değişince parmak izi değişir ve sarmalayıcı yeniden kurulur
+    try:
+        return SparseInputDLModel.from_keras(_dl_model, len(_vectorizer.get_feature_names_out()))
+    except Exception as e:
+        print(f"Seyrek DL yolu kurulamadı, yoğun yol kullanılacak: {e}")  # Debug için
+        return None
+
+def sparse_dl_model():
+    """Yüklü DL modeli için seyrek girdi sarmalayıcısı; model uygun değilse None"""
+    dl_model = model_registry.get('dl')
+    dl_fingerprint = model_registry.fingerprint('dl')
+    if dl_model is None or dl_fingerprint is None:
+        return None
+    return get_sparse_dl_model(dl_fingerprint, model_registry.fingerprint('vectorizer'),
+                               dl_model, model_registry.get('vectorizer'))
+
+def predict_dl_batch(text_vectors):
+    """Deep Learning modelini bir grup CSR satır üzerinde doğrudan çalıştır (predict'in ek yükü olmadan)
+
+    Model uygunsa ilk katman seyrek girdiyle hesaplanır; değilse satırlar
+    yoğun diziye çevrilip predict_on_batch kullanılır.
+    """
+    sparse_model = sparse_dl_model()
+    if sparse_model is not None:
+        return sparse_model.predict(text_vectors)
+    return predict_dl_dense(text_vectors)
+
+def predict_dl_dense(text_vectors):
+    """Eski yol: sözlük boyutunda yoğun satırlar üzerinde predict_on_batch"""
+    return model_registry.get('dl').predict_on_batch(text_vectors.toarray().astype(np.float32))
+
+def stack_csr_rows(rows):
+    return scipy.sparse.vstack(rows, format='csr')
+
+@st.cache_resource(show_spinner=False)
+def get_dl_batcher():
+    # Aynı süreçteki tüm oturumlar ve arka plan sınıflandırıcıları paylaşır
+    return DynamicBatcher(predict_dl_batch, stack=stack_csr_rows)
+
+# Kademeli (auto) mod: ucuz ve doğru modelden başlanır, model emin değilse sıradakine
+# geçilir. İlk aşama Logistic Regression: bench-cascade ölçümlerinde MultinomialNB'den hem
+# daha hızlı hem daha doğru. Aşamalar sadece sıra onlara gelirse yüklenir (DL'ye hiç
+# çıkılmayan süreçler TensorFlow'u import etmez); yüklenemeyen aşama atlanır ve satırlar
+# son çalışan aşamanın cevabında kalır. SGD hinge kaybıyla eğitildiği için olasılık
+# üretmez, kademeye alınmaz.
+CASCADE_MODEL = 'auto'
+CASCADE_STAGES = ['lr', 'dl']
+CASCADE_MIN_PROBABILITY = 0.8  # en yüksek sınıf olasılığı bunun altındaysa üst aşamaya geç
+CASCADE_MIN_MARGIN = 0.2  # ilk iki sınıf olasılığı arasındaki fark bunun altındaysa üst aşamaya geç
+
+def cascade_predict(text_vectors, min_probability=CASCADE_MIN_PROBABILITY, min_margin=CASCADE_MIN_MARGIN,
+                    stages=CASCADE_STAGES):
+    """Kademeli tahmin: (sınıf indeksleri, her satırı cevaplayan model anahtarları)
+
+    Tüm aşamalar aynı CSR matrisini kullanır; bir aşamada emin olunamayan
+    satırlar sonraki aşamaya sadece kendi satırlarıyla gider. Son aşama
+    dışındakiler olasılık vermelidir.
+    """
+    row_count = text_vectors.shape[0]
+    predictions = np.empty(row_count, dtype=np.int64)
+    answered_by = np.full(row_count, None, dtype=object)
+    remaining = np.arange(row_count)
+    for position, key in enumerate(stages):
+        if not len(remaining):
+            break
+        # Aşama modeli sadece kendisine satır kaldıysa yüklenir
+        model = model_registry.get(key)
+        if model is None:
+            continue
+        rows = text_vectors if len(remaining) == row_count else text_vectors[remaining]
+        start = time.perf_counter()
+        # Sonraki aşamaların hepsinin yüklenemediği zaten biliniyorsa olasılık hesaplanmaz
+        if all(model_registry.unavailable(later) for later in stages[position + 1:]):
+            predictions[remaining] = predict_vectors(rows, key)
+            answered_by[remaining] = key
+            remaining = remaining[:0]
+        else:
+            probabilities = model.predict_proba(rows)
+            # Üst aşama yüklenemezse bu aşamanın cevabı geçerli kalır
+            predictions[remaining] = model.classes_[probabilities.argmax(axis=1)]
+            answered_by[remaining] = key
+            top_two = np.partition(probabilities, -2, axis=1)[:, -2:]
+            confident = (top_two[:, 1] >= min_probability) & (top_two[:, 1] - top_two[:, 0] >= min_margin)
+            remaining = remaining[~confident]
+        metrics.observe('cascade_stage_seconds', (('stage', key),), time.perf_counter() - start)
+    if row_count and answered_by[0] is None:
+        raise ValueError(f"Kademeli mod için hiçbir aşama yüklenemedi: {', '.join(stages)}")
+    return predictions, answered_by.tolist()
+
+def dl_prediction_fingerprint():
+    """DL modeli ve label_binarizer özetleri; DL yüklenemediyse None"""
+    fingerprints = (model_registry.fingerprint('dl'), model_registry.fingerprint('label_binarizer'))
+    return None if None in fingerprints else fingerprints
+
+def cascade_fingerprint():
+    """Kademeli modun tahmin önbelleği için aşama dosyalarının ve eşiklerin özeti
+
+    Dosya özetleri model yüklenmeden alınır; önbellek anahtarı DL'yi yüklememeli.
+    DL aşamasında etiketler label_binarizer ile çözüldüğü için onun özeti de girer.
+    """
+    fingerprints = []
+    for key in CASCADE_STAGES:
+        fingerprint = model_registry.file_fingerprint(key)
+        if key == 'dl' and fingerprint is not None:
+            fingerprint = (fingerprint, model_registry.file_fingerprint('label_binarizer'))
+        fingerprints.append(fingerprint)
+    # Son aşama dışındakiler olasılık verdiği için zorunlu; DL yoksa da kademe çalışır
+    if any(fingerprint is None for fingerprint in fingerprints[:-1]):
+        return None
+    return tuple(fingerprints), CASCADE_MIN_PROBABILITY, CASCADE_MIN_MARGIN
+
+def predict_vectors(text_vector, model='mb'):
+    """Vektörleştirilmiş metinlerin (her satır bir şikayet) sınıf indekslerini döndür"""
+    if model == CASCADE_MODEL:
+        return cascade_predict(text_vector)[0]
+    if model == 'dl':  # Deep Learning için yeni seçenek
+        dl_model = model_registry.get('dl')
+        if dl_model is None:
+            # Arka plan thread'lerinden de çağrılır, burada arayüze yazılmaz; cevap veren
+            # model answering_model ile kaydedilir, yükleme hatası ModelRegistry'de loglanır
+            return model_registry.get('mb').predict(text_vector)
+        # Seyrek vektör doğrudan gönderilir; eşzamanlı isteklerle birlikte tek model çağrısında tahmin yap
+        prediction_proba = get_dl_batcher().predict(text_vector)
+        label_binarizer = model_registry.get('label_binarizer')
+        return label_binarizer.inverse_transform(prediction_proba > 0.5)
+    if model == 'sgd':
+        return model_registry.get('sgd').predict(text_vector)
+    if model == 'lr':
+        return model_registry.get('lr').predict(text_vector)
+    # mb (MultinomialNB)
+    return model_registry.get('mb').predict(text_vector)
 
 def find_label(sentence, model='mb'):
     """Şikayet kategorisini belirle"""
     try:
+        start = time.perf_counter()
         cleaned_text = clean_text(sentence)
+        cleaned_at = time.perf_counter()
+        metrics.observe('classification_stage_seconds', (('model', model), ('stage', 'clean_text')), cleaned_at - start)
+
+        # Aynı/benzer şikayet tekrar gönderildiyse vektörleştirme ve tahmini atla
+        prediction_cache = get_prediction_cache()
+        cache_key = prediction_cache_key(model, cleaned_text)
+        category = prediction_cache.get(cache_key) if cache_key is not None else None
+        vectorize_start = time.perf_counter()
+        metrics.observe('classification_stage_seconds', (('model', model), ('stage', 'cache')),
+                        vectorize_start - cleaned_at)
+        if category is not None:
+            return category
+
+        count_vectorizer = model_registry.get('vectorizer')
         text_vector = count_vectorizer.transform([cleaned_text])
-        
-        if model == 'dl':  # Deep Learning için yeni seçenek
-            if dl_model is None:
-                st.warning("Deep Learning modeli yüklenemedi. Varsayılan model (MultinomialNB) kullanılıyor.")
-                prediction = mb_model.predict(text_vector)[0]
-            else:
-                # Text vector'ü dense array'e çevir
-                text_array = text_vector.toarray()
-                # Tahmin yap
-                prediction_proba = dl_model.predict(text_array)
-                prediction = label_binarizer.inverse_transform(prediction_proba > 0.5)[0]
-        elif model == 'sgd':
-            prediction = sgd_model.predict(text_vector)[0]
-        elif model == 'lr':
-            prediction = best_lr_model.predict(text_vector)[0]
-        else:  # mb (MultinomialNB)
-            prediction = mb_model.predict(text_vector)[0]
-        
-        labels = {
-            0: 'İgdaş (Doğalgaz dağıtımı ve faturalandırma)',
-            1: 'İett (Toplu taşıma)',
-            2: 'İski (Su dağıtımı ve faturalandırma)',
-            3: 'Diğer İBB iştirakleri',
-            4: 'İlgisiz'
-        }
-        
-        return labels[prediction]
+        vectorized_at = time.perf_counter()
+        prediction = predict_vectors(text_vector, model)[0]
+        predicted_at = time.perf_counter()
+        category = CATEGORY_LABELS[prediction]
+        metrics.observe('classification_stage_seconds', (('model', model), ('stage', 'vectorize')),
+                        vectorized_at - vectorize_start)
+        metrics.observe('classification_stage_seconds', (('model', model), ('stage', 'predict')),
+                        predicted_at - vectorized_at)
+
+        if cache_key is not None:
+            prediction_cache.put(cache_key, category)
+        return category
         
     except Exception as e:
         st.error(f"Seçilen model ({model}) ile tahmin yapılamadı: {str(e)}")
         return None
 
+def find_labels(texts, model='mb', chunk_size=BATCH_CHUNK_SIZE):
+    """Şikayetleri toplu sınıflandır, kategorileri giriş sırasıyla döndür
+
+    Metinler chunk_size'lık parçalar halinde tek bir seyrek matrise
+    vektörleştirilir ve her parça için model bir kez çağrılır. Hatalar
+    yutulmaz; toplu işlerde çağıran taraf ele alır.
+    """
+    count_vectorizer = model_registry.get('vectorizer')
+    categories = []
+    chunk = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) == chunk_size:
+            categories.extend(_label_chunk(count_vectorizer, chunk, model))
+            chunk = []
+    if chunk:
+        categories.extend(_label_chunk(count_vectorizer, chunk, model))
+    return categories
+
+def answering_model(model):
+    """Seçilen modelin yerine fiilen cevap veren model (DL yüklenemezse predict_vectors MultinomialNB'ye düşer)"""
+    return 'mb' if model == 'dl' and model_registry.get('dl') is None else model
+
+def find_labels_with_stages(texts, model='mb', chunk_size=BATCH_CHUNK_SIZE):
+    """find_labels gibi; ayrıca her şikayeti cevaplayan modelin anahtarını döndürür
+
+    Kademeli modda bu, cevap veren aşamadır; diğer modlarda seçilen modelin kendisi.
+    """
+    texts = list(texts)
+    if model != CASCADE_MODEL:
+        return find_labels(texts, model, chunk_size), [answering_model(model)] * len(texts)
+    count_vectorizer = model_registry.get('vectorizer')
+    categories = []
+    answered_by = []
+    for start in range(0, len(texts), chunk_size):
+        text_vectors = count_vectorizer.transform([clean_text(text) for text in texts[start:start + chunk_size]])
+        predictions, stages = cascade_predict(text_vectors)
+        categories.extend(CATEGORY_LABELS[prediction] for prediction in predictions)
+        answered_by.extend(stages)
+    return categories, answered_by
+
+# Topluluk (ensemble) puanlamasında çalışan modeller; sütun adları complaint_predictions ile aynı
+ENSEMBLE_MODELS = ['mb', 'sgd', 'lr', 'dl']
+# Çoğunluk oyunda eşitlik olursa sınıf, bu sıradaki ilk modelin oyuna göre seçilir
+ENSEMBLE_TIE_BREAK = ['dl', 'lr', 'sgd', 'mb']
+
+def ensemble_models(load_dl=False):
+    """Topluluk oylamasına katılacak model anahtarları
+
+    Arka plan sınıflandırıcısı ve admin paneli DL'yi sadece süreçte zaten yüklüyse
+    katar: DL trafiği almayan süreçler TensorFlow import maliyetini ödemez.
+    backfill-ensemble gibi çevrim dışı işler load_dl ile DL'yi yükler.
+    """
+    keys = []
+    for key in ENSEMBLE_MODELS:
+        if key == 'dl' and not load_dl:
+            available = model_registry.loaded('dl') is not None
+        else:
+            available = model_registry.get(key) is not None
+        if available:
+            keys.append(key)
+    return keys
+
+def ensemble_fingerprint(keys):
+    """Verilen modellerle üretilen topluluk tahminlerinin kısa özeti (dosya özetlerinden, model yüklemez)"""
+    keys = ['vectorizer'] + [key for key in ENSEMBLE_MODELS if key in keys]
+    if 'dl' in keys:
+        keys.append('label_binarizer')
+    fingerprints = tuple((key, model_registry.file_fingerprint(key)) for key in keys)
+    return hashlib.sha256(repr(fingerprints).encode()).hexdigest()[:16]
+
+def current_ensemble_fingerprints():
+    """Şu anki model dosyalarıyla puanlanmış satırların alabileceği özetler: DL'siz ve DL'li"""
+    base = [key for key in ENSEMBLE_MODELS if key != 'dl']
+    return ensemble_fingerprint(base), ensemble_fingerprint(base + ['dl'])
+
+def ensemble_predict(text_vectors, keys=None):
+    """Topluluk modellerini (varsayılan: ensemble_models()) aynı CSR matrisi üzerinde çalıştır
+
+    ({model anahtarı: sınıf indeksleri}, çoğunluk oyu sınıf indeksleri) döndürür.
+    Listede olmayan ya da yüklenemeyen modeller (ör. DL) oylamaya katılmaz.
+    """
+    votes = {
+        key: np.asarray(predict_vectors(text_vectors, key))
+        for key in (ensemble_models() if keys is None else keys)
+    }
+    rows = np.arange(text_vectors.shape[0])
+    vote_counts = np.zeros((len(rows), len(CATEGORY_LABELS)), dtype=np.int32)
+    for predictions in votes.values():
+        np.add.at(vote_counts, (rows, predictions), 1)
+    top_count = vote_counts.max(axis=1)
+    majority = np.full(len(rows), -1, dtype=np.int64)
+    for key in ENSEMBLE_TIE_BREAK:
+        if key in votes:
+            undecided = (majority == -1) & (vote_counts[rows, votes[key]] == top_count)
+            majority[undecided] = votes[key][undecided]
+    return votes, majority
+
+def save_ensemble_predictions(c, complaint_ids, votes, majority):
+    """Topluluk tahminlerini çağıranın transaction'ında complaint_predictions'a yaz"""
+    scored_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    fingerprint = ensemble_fingerprint(list(votes))
+    c.executemany(f'''
+        INSERT OR REPLACE INTO complaint_predictions
+        (complaint_id, {', '.join(ENSEMBLE_MODELS)}, majority, scored_at, fingerprint)
+        VALUES (?, {', '.join('?' * len(ENSEMBLE_MODELS))}, ?, ?, ?)
+    ''', [
+        (complaint_id,
+         *(CATEGORY_LABELS[votes[key][index]] if key in votes else None for key in ENSEMBLE_MODELS),
+         CATEGORY_LABELS[majority[index]], scored_at, fingerprint)
+        for index, complaint_id in enumerate(complaint_ids)
+    ])
+
+def _label_chunk(count_vectorizer, texts, model):
+    # Aşama süreleri parça başına ölçülür (find_label'daki şikayet başına ölçümlerle aynı metrik)
+    start = time.perf_counter()
+    cleaned_texts = [clean_text(text) for text in texts]
+    cleaned_at = time.perf_counter()
+    text_vectors = count_vectorizer.transform(cleaned_texts)
+    vectorized_at = time.perf_counter()
+    predictions = predict_vectors(text_vectors, model)
+    predicted_at = time.perf_counter()
+    metrics.observe('classification_stage_seconds', (('model', model), ('stage', 'clean_text')), cleaned_at - start)
+    metrics.observe('classification_stage_seconds', (('model', model), ('stage', 'vectorize')),
+                    vectorized_at - cleaned_at)
+    metrics.observe('classification_stage_seconds', (('model', model), ('stage', 'predict')),
+                    predicted_at - vectorized_at)
+    return [CATEGORY_LABELS[prediction] for prediction in predictions]
+
+# clean_text adımlarının önceden derlenmiş desenleri (uygulama sırası önemli)
+EMAIL_PATTERN = re.compile(r'\b[\w\-.]+?@\w+?\.\w{2,4}\b')
+URL_PATTERN = re.compile(r'(http[s]?\S+)|(\w+\.[A-Za-z]{2,4}\S*)')
+PHONE_PATTERN = re.compile(r'\b(\+\d{1,2}\s)?\d?[\-(.]?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b')
+NUMBER_PATTERN = re.compile(r'\d+(\.\d+)?')
+DIGIT_PATTERN = re.compile(r'\d')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\d\s]')
+
+class TextNormalizer:
+    """clean_text ile birebir aynı çıktıyı daha az geçişle üreten metin temizleyici
+
+    Desenler modül seviyesinde bir kez derlenir, tetikleyici karakteri
+    olmayan adımlar (@, nokta/http, para birimi, rakam) atlanır. Boşluk
+    birleştirme ve baş/son boşluk temizliği split() ile aynı sonucu
+    verdiği için ayrı regex geçişi yapılmaz.
+    """
+
+    def __init__(self, stop_words, stemmer):
+        self.stop_words = frozenset(stop_words)
+        self.stemmer = stemmer
+        self._regex_histogram = metrics.histogram('text_normalizer_seconds', (('step', 'regex'),))
+        self._stem_histogram = metrics.histogram('text_normalizer_seconds', (('step', 'stem'),))
+
+    def tokens(self, string):
+        """Stopword'leri atılmış ve kökleri bulunmuş terim listesi"""
+        start = time.perf_counter()
+        message = str(string)
+        if '@' in message:
+            message = EMAIL_PATTERN.sub('emailaddr', message)
+        if '.' in message or 'http' in message:
+            message = URL_PATTERN.sub(' ', message)
+        if '₺' in message or '$' in message:
+            message = message.replace('₺', 'money').replace('$', 'money')
+        if DIGIT_PATTERN.search(message):
+            message = PHONE_PATTERN.sub('phonenumbr', message)
+            message = NUMBER_PATTERN.sub('numbr', message)
+        message = PUNCTUATION_PATTERN.sub(' ', message)
+        rewritten_at = time.perf_counter()
+
+        stop_words = self.stop_words
+        stem = self.stemmer.stem
+        tokens = [stem(term) for term in message.lower().split() if term not in stop_words]
+        self._regex_histogram.observe(rewritten_at - start)
+        self._stem_histogram.observe(time.perf_counter() - rewritten_at)
+        return tokens
+
+    def normalize(self, string):
+        return ' '.join(self.tokens(string))
+
+# Kök bulma önbelleğinin en fazla tutacağı terim sayısı
+STEM_CACHE_SIZE = 50000
+
+class StemCache:
+    """TurkishStemmer önünde sınırlı boyutlu LRU önbellek
+
+    Şikayet kelime dağılımı çok çarpık olduğu için aynı kelimeler tekrar
+    tekrar kök bulmaya gider. Sayaçlar admin panelinde gösterilir.
+    """
+
+    def __init__(self, stemmer, maxsize=STEM_CACHE_SIZE):
+        self._stemmer = stemmer
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stem(self, term):
+        with self._lock:
+            stemmed = self._cache.get(term)
+            if stemmed is not None:
+                self._cache.move_to_end(term)
+                self.hits += 1
+                return stemmed
+
+        # Kök bulma kilit dışında yapılır, diğer oturumlar beklemez
+        stemmed = self._stemmer.stem(term)
+        with self._lock:
+            self.misses += 1
+            self._cache[term] = stemmed
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        return stemmed
+
+    def prewarm(self, terms):
+        """Terimleri isabet/ıska sayaçlarını etkilemeden önbelleğe al"""
+        for term in terms:
+            if len(self._cache) >= self.maxsize:
+                break
+            if term not in self._cache:
+                self._cache[term] = self._stemmer.stem(term)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'boyut': len(self._cache),
+            'kapasite': self.maxsize,
+            'isabet': self.hits,
+            'iska': self.misses,
+            'tahliye': self.evictions,
+            'isabet_orani': round(self.hits / lookups, 3) if lookups else None,
+        }
+
+@st.cache_resource(show_spinner=False)
+def get_stem_cache():
+    # Tüm oturumlar aynı önbelleği kullanır; vectorizer sözlüğü kök hallerinde
+    # yazılan kelimeleri (fatura, su, otobüs...) içerdiği için ön ısıtmada kullanılır
+    stem_cache = StemCache(porter)
+    stem_cache.prewarm(model_registry.get('vectorizer').get_feature_names_out())
+    return stem_cache
+
+text_normalizer = TextNormalizer(stop_words, get_stem_cache())
+
 def clean_text(string):
     """Metin temizleme fonksiyonu"""
+    return text_normalizer.normalize(string)
+
+def clean_text_reference(string):
+    """Eski regex zinciri; sadece TextNormalizer çıktısını doğrulamak ve kıyaslamak için"""
     message = re.sub(r'\b[\w\-.]+?@\w+?\.\w{2,4}\b', 'emailaddr', str(string))
     message = re.sub(r'(http[s]?\S+)|(\w+\.[A-Za-z]{2,4}\S*)', ' ', message)
     message = re.sub(r'₺|\$', 'money', message)
@@ -344,609 +2414,1219 @@ def clean_text(string):
         if term not in set(stop_words)
     )
 
-# CSS stillerini güncelle
-st.markdown("""
-<style>
-    /* Ana tema renkleri */
-    :root {
-        --primary-color: #0083b0;
-        --secondary-color: #00b4db;
-        --background-color: #f8f9fa;
-        --text-color: #2c3e50;
-    }
+# Arka plan sınıflandırma ayarları
+CLASSIFICATION_WORKERS = 2
+CLASSIFICATION_BATCH_SIZE = 64  # bir mikro-grupta en fazla şikayet
+CLASSIFICATION_BATCH_WAIT = 0.05  # ilk şikayetten sonra grubun dolması için beklenen süre (saniye)
+CLASSIFICATION_MAX_ATTEMPTS = 4  # bu kadar başarısız denemeden sonra FAILED_CATEGORY yazılır
+CLASSIFICATION_RETRY_DELAY = 1.0  # ilk tekrar denemeden önceki bekleme, her denemede iki katına çıkar
+CLASSIFICATION_RETRY_MAX_DELAY = 10.0
+
+class ClassificationWorker:
+    """Bekleyen şikayetleri arka planda mikro-gruplar halinde sınıflandıran thread havuzu
+
+    Kuyrukta şikayet id'leri bekler. Her thread ilk id'den sonra kısa bir süre
+    daha id toplar, şikayetleri modele göre gruplar ve her grup için modeli
+    bir kez çağırır. Kategoriler tek transaction'da yazılır; sadece hâlâ bekleyen
+    şikayetler güncellenir. Başarısız şikayetler artan beklemeyle tekrar kuyruğa
+    alınır, denemeler tükenirse FAILED_CATEGORY ve hata mesajı yazılır.
+    """
+
+    def __init__(self, path, workers=CLASSIFICATION_WORKERS, batch_size=CLASSIFICATION_BATCH_SIZE,
+                 batch_wait=CLASSIFICATION_BATCH_WAIT, max_attempts=CLASSIFICATION_MAX_ATTEMPTS,
+                 retry_delay=CLASSIFICATION_RETRY_DELAY):
+        self.db = get_shared_database(path)
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue()
+        self._attempts = {}  # şikayet id -> başarısız deneme sayısı
+        self._stats = {'sinif': 0, 'grup': 0, 'hata': 0, 'basarisiz': 0}
+        self._stats_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"siniflandirici-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, complaint_id):
+        self._queue.put(complaint_id)
+
+    def recover(self):
+        """Önceki süreçten bekleyen kalmış şikayetleri kuyruğa al"""
+        with self.db.connection() as conn:
+            complaint_ids = [row[0] for row in conn.execute(
+                'SELECT id FROM complaints WHERE category = ? ORDER BY id', (PENDING_CATEGORY,))]
+        for complaint_id in complaint_ids:
+            self.submit(complaint_id)
+        return len(complaint_ids)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        with self._stats_lock:
+            return {**self._stats, 'kuyruk': self.pending(), 'tekrar': len(self._attempts)}
+
+    def _next_batch(self):
+        complaint_ids = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(complaint_ids) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                complaint_ids.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return complaint_ids
+
+    def _run(self):
+        while True:
+            self._process(self._next_batch())
+
+    def _process(self, complaint_ids):
+        try:
+            failures = self.classify(complaint_ids)
+        except Exception as e:
+            if len(complaint_ids) > 1:
+                # Hatanın kaynağı tek bir şikayet olabilir: grup tek tek yeniden denenir
+                for complaint_id in complaint_ids:
+                    self._process([complaint_id])
+                return
+            failures = {complaint_ids[0]: e}
+        for complaint_id, error in failures.items():
+            self._retry_later(complaint_id, error)
+
+    def _retry_later(self, complaint_id, error):
+        """Başarısız şikayeti artan beklemeyle tekrar kuyruğa al; denemeler tükendiyse vazgeç"""
+        with self._stats_lock:
+            attempts = self._attempts.get(complaint_id, 0) + 1
+            self._attempts[complaint_id] = attempts
+            self._stats['hata'] += 1
+        print(f"Arka plan sınıflandırma hatası (şikayet id {complaint_id}, deneme {attempts}): {error}")  # Debug için
+        if attempts >= self.max_attempts:
+            self._give_up(complaint_id, error)
+            return
+        delay = min(self.retry_delay * 2 ** (attempts - 1), CLASSIFICATION_RETRY_MAX_DELAY)
+        timer = threading.Timer(delay, self.submit, (complaint_id,))
+        timer.daemon = True
+        timer.start()
+
+    def _give_up(self, complaint_id, error):
+        """Hâlâ bekleyen şikayete FAILED_CATEGORY ve hata mesajını yaz"""
+        try:
+            with self.db.transaction() as c:
+                c.execute('''
+                    UPDATE complaints SET category = ?, classification_error = ?
+                    WHERE id = ? AND category = ?
+                ''', (FAILED_CATEGORY, f"{type(error).__name__}: {error}"[:500], complaint_id, PENDING_CATEGORY))
+                updated = c.rowcount
+        except Exception as e:
+            # Şikayet bekleyen olarak kalır, bir sonraki süreçte recover() ile tekrar denenir
+            print(f"Sınıflandırılamayan şikayet kaydedilemedi (id {complaint_id}): {e}")  # Debug için
+            return
+        with self._stats_lock:
+            self._attempts.pop(complaint_id, None)
+            self._stats['basarisiz'] += 1
+        if updated:
+            invalidate_analytics()
+
+    def classify(self, complaint_ids):
+        """Verilen şikayetlerden bekleyenleri modele göre gruplayıp sınıflandır
+
+        Tahmini başarısız olan model gruplarının şikayetlerini {id: hata} olarak
+        döndürür; diğerleri yine de yazılır. Topluluk tahmini (tüm modeller) ayrıca
+        denenir, başarısız olması sınıflandırmayı engellemez.
+        """
+        placeholders = ', '.join('?' * len(complaint_ids))
+        with self.db.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT id, user_id, complaint_text, model_used FROM complaints
+                WHERE id IN ({placeholders}) AND category = ?
+            ''', list(complaint_ids) + [PENDING_CATEGORY]).fetchall()
+        if not rows:
+            return {}
+
+        # Metinler bir kez temizlenip vektörleştirilir; tüm modeller bu matris üzerinde
+        # bir kez çalışır, seçilen modelin sonucu varsa topluluk oylarından alınır.
+        # Ortak aşamalar 'worker', topluluk tahmini 'ensemble' model etiketiyle ölçülür
+        start = time.perf_counter()
+        cleaned_texts = [clean_text(row[2]) for row in rows]
+        cleaned_at = time.perf_counter()
+        text_vectors = model_registry.get('vectorizer').transform(cleaned_texts)
+        vectorized_at = time.perf_counter()
+        metrics.observe('classification_stage_seconds', (('model', 'worker'), ('stage', 'clean_text')),
+                        cleaned_at - start)
+        metrics.observe('classification_stage_seconds', (('model', 'worker'), ('stage', 'vectorize')),
+                        vectorized_at - cleaned_at)
+        try:
+            votes, majority = ensemble_predict(text_vectors)
+        except Exception as e:
+            print(f"Topluluk tahmini atlandı: {e}")  # Debug için
+            votes, majority = {}, None
+        metrics.observe('classification_stage_seconds', (('model', 'ensemble'), ('stage', 'predict')),
+                        time.perf_counter() - vectorized_at)
+        by_model = {}
+        for index, row in enumerate(rows):
+            by_model.setdefault(MODEL_KEYS.get(row[3], 'mb'), []).append(index)
+        updates = []
+        failures = {}
+        for model, indices in by_model.items():
+            predict_start = time.perf_counter()
+            try:
+                if model in votes:
+                    predictions, stages = votes[model][indices], [model] * len(indices)
+                elif model == CASCADE_MODEL:
+                    predictions, stages = cascade_predict(text_vectors[indices])
+                else:
+                    predictions = predict_vectors(text_vectors[indices], model)
+                    stages = [answering_model(model)] * len(indices)
+            except Exception as e:
+                failures.update((rows[index][0], e) for index in indices)
+                continue
+            # Topluluk oylarından alınan sonuçlar için bu süre sadece dilimlemedir
+            metrics.observe('classification_stage_seconds', (('model', model), ('stage', 'predict')),
+                            time.perf_counter() - predict_start)
+            for index, prediction, stage in zip(indices, predictions, stages):
+                updates.append((CATEGORY_LABELS[prediction], MODEL_DISPLAY_NAMES[stage], rows[index][0], PENDING_CATEGORY))
+
+        write_start = time.perf_counter()
+        with self.db.transaction() as c:
+            c.executemany('''
+                UPDATE complaints SET category = ?, answered_by = ? WHERE id = ? AND category = ?
+            ''', updates)
+            if majority is not None:
+                save_ensemble_predictions(c, [row[0] for row in rows], votes, majority)
+        metrics.observe('classification_stage_seconds', (('model', 'worker'), ('stage', 'db_write')),
+                        time.perf_counter() - write_start)
+        invalidate_analytics()
+        with self._stats_lock:
+            for update in updates:
+                self._attempts.pop(update[2], None)
+            self._stats['sinif'] += len(updates)
+            self._stats['grup'] += 1
+        return failures
+
+@st.cache_resource(show_spinner=False)
+def get_classification_worker(path):
+    worker = ClassificationWorker(path)
+    recovered = worker.recover()
+    if recovered:
+        print(f"Bekleyen {recovered} şikayet sınıflandırma kuyruğuna alındı")  # Debug için
+    return worker
+
+# Veritabanını başlat (metin temizleyiciden sonra: arama dizini clean_text kullanır)
+bootstrap_database(DB_PATH)
+
+# Streamlit altında çalışırken sınıflandırıcıyı başlat (önceki süreçten kalanlar da işlenir)
+if st.runtime.exists():
+    get_classification_worker(DB_PATH)
+    if METRICS_PORT:
+        start_metrics_server(METRICS_HOST, METRICS_PORT)
+
+# Komut satırı araçları
+# Ölçüm betiği (benchmarks.py), model dışa aktarma doğrulamaları ve testlerdeki örnek şikayetler
+STARTUP_PROBE_TEXT = "Doğalgaz faturam bu ay çok yüksek geldi, sayaç okuması yanlış yapılmış."
+
+BENCHMARK_TEXTS = [
+    STARTUP_PROBE_TEXT,
+    "Otobüs durakta beklemeden geçip gitti, 45 dakikadır bekliyoruz.",
+    "Mahallemizde iki gündür su kesintisi var ve hiçbir açıklama yapılmadı.",
+    "Metrobüs çok kalabalık, sabah saatlerinde sefer sayısı artırılmalı.",
+    "Su faturama 850 ₺ yansıtılmış, sayaç arızalı olabilir mi?",
+    "Park alanındaki çöpler günlerdir toplanmıyor, belediye ilgilenmiyor.",
+    "Doğalgaz kesintisi nedeniyle evde ısınamıyoruz, lütfen yardımcı olun.",
+    "Bu hafta sonu maç ne zaman başlıyor?",
+]
+
+# TextNormalizer'ın clean_text_reference ile birebir aynı çıktı vermesi gereken örnekler
+NORMALIZER_GOLDEN_TEXTS = BENCHMARK_TEXTS + [
+    "",
+    "   ",
+    "Bana ahmet.yilmaz@example.com adresinden ulaşabilirsiniz.",
+    "Detaylar https://www.ibb.istanbul/sikayet?id=12 sayfasında, ayrıca iett.gov.tr de bakın.",
+    "Telefonum +90 532 123 4567, ev: (212) 555-1234, iş 212.555.1234",
+    "Fatura tutarı 1.250,75 ₺ ve $30 ek ücret, toplam 3.5 kat arttı!!!",
+    "İSTANBUL'DA İETT OTOBÜSLERİ ÇOK GEÇ GELİYOR...",
+    "a@b.co.uk\tadresine\n\nmail attım;   cevap yok :(",
+    "ıi İI şŞ çÇ ğĞ üÜ öÖ — “tırnak” ‘tek’ … ½ ² ٣",
+    "http:yanlis-link ve www.site.com.tr/yol ve dosya.pdf",
+    "0212 444 1 871 numaralı ALO 153'e 15.000 kez ulaşamadım",
+    "Su__kesintisi___var 12:30-14:45 arası, 2024-05-01 tarihinde",
+]
+
+def reclassify_complaints(args):
+    """complaints tablosunu id sırasıyla sayfa sayfa okuyup seçilen modelle yeniden sınıflandır
+
+    Her sayfa tek transaction'da yazılır ve son işlenen id aynı transaction'da
+    reclassify_checkpoints tablosuna kaydedilir; --resume ile kalınan yerden devam edilir.
+    Bellekte aynı anda sadece bir sayfa tutulur.
+    """
+    model_name = MODEL_DISPLAY_NAMES[args.model]
+    # predict_vectors yüklenemeyen DL yerine sessizce MultinomialNB'ye düşer; bu komut
+    # model_used'ı seçilen modelle yazdığı için yüklenemeyen modelle hiç başlamaz
+    if args.model == CASCADE_MODEL:
+        required = ['vectorizer'] + CASCADE_STAGES[:-1]
+    elif args.model == 'dl':
+        required = ['vectorizer', 'dl', 'label_binarizer']
+    else:
+        required = ['vectorizer', args.model]
+    missing = [key for key in required if model_registry.get(key) is None]
+    if missing:
+        print(f"Yeniden sınıflandırma başlatılamadı, model yüklenemedi: {', '.join(missing)}")
+        return 1
+    db = get_db()
+    last_id = args.start_after
+    try:
+        with db.transaction() as c:
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS reclassify_checkpoints (
+                    model TEXT PRIMARY KEY,
+                    last_id INTEGER NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+        with db.connection() as conn:
+            if args.resume:
+                checkpoint = conn.execute(
+                    'SELECT last_id FROM reclassify_checkpoints WHERE model = ?', (args.model,)
+                ).fetchone()
+                if checkpoint:
+                    last_id = checkpoint[0]
+                    print(f"Kaldığı yerden devam ediliyor, son işlenen id: {last_id}")
+            total = conn.execute('SELECT COUNT(*) FROM complaints WHERE id > ?', (last_id,)).fetchone()[0]
+
+        processed = 0
+        start = time.perf_counter()
+
+        while True:
+            with db.connection() as conn:
+                rows = conn.execute('''
+                    SELECT id, complaint_text
+                    FROM complaints
+                    WHERE id > ?
+                    ORDER BY id
+                    LIMIT ?
+                ''', (last_id, args.page_size)).fetchall()
+            if not rows:
+                break
+
+            categories, answered_by = find_labels_with_stages(
+                (row[1] for row in rows), args.model, chunk_size=args.page_size
+            )
+
+            with db.transaction() as c:
+                c.executemany(
+                    'UPDATE complaints SET category = ?, model_used = ?, answered_by = ? WHERE id = ?',
+                    [(category, model_name, MODEL_DISPLAY_NAMES[stage], row[0])
+                     for row, category, stage in zip(rows, categories, answered_by)]
+                )
+                c.execute('''
+                    INSERT OR REPLACE INTO reclassify_checkpoints (model, last_id, updated_at)
+                    VALUES (?, ?, ?)
+                ''', (args.model, rows[-1][0], datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            last_id = rows[-1][0]
+
+            processed += len(rows)
+            elapsed = time.perf_counter() - start
+            print(f"{processed}/{total} şikayet işlendi, son id: {last_id}, "
+                  f"{processed / elapsed:.0f} şikayet/sn")
+
+        invalidate_analytics()
+        print(f"Tamamlandı: {processed} şikayet {model_name} ile yeniden sınıflandırıldı "
+              f"({time.perf_counter() - start:.1f} sn)")
+        return 0
+    except Exception as e:
+        print(f"Yeniden sınıflandırma hatası (son işlenen id: {last_id}): {e}")
+        return 1
+
+@contextmanager
+def temporary_database():
+    """Ölçümler ve testler için DB_PATH'i geçici, boş bir veritabanına yönlendir"""
+    global DB_PATH
+    import tempfile
+
+    previous_path = DB_PATH
+    with tempfile.TemporaryDirectory() as directory:
+        DB_PATH = os.path.join(directory, 'complaints.db')
+        try:
+            bootstrap_database(DB_PATH)
+            yield get_db()
+        finally:
+            get_db().close()
+            DB_PATH = previous_path
+
+def check_complaint_stats(args):
+    """complaint_stats sayaçlarını complaints tablosundan yeniden hesaplananlarla karşılaştır"""
+    bootstrap_database(DB_PATH)
+    db = get_db()
+    with db.connection() as conn:
+        stored = {row[:4]: row[4] for row in conn.execute(
+            'SELECT day, model_used, category, status, complaint_count FROM complaint_stats')}
+        expected = {row[:4]: row[4] for row in conn.execute(f'''
+            SELECT {STATS_KEY_COLUMNS.format(row='complaints')}, COUNT(*)
+            FROM complaints
+            GROUP BY 1, 2, 3, 4
+        ''')}
+
+    drifted = sorted(key for key in stored.keys() | expected.keys() if stored.get(key) != expected.get(key))
+    for key in drifted:
+        print(f"✗ {' / '.join(key)}: sayaç {stored.get(key, 0)}, gerçek {expected.get(key, 0)}")
+    print(f"{len(expected)} anahtar, {sum(expected.values())} şikayet, {len(drifted)} sapma")
+
+    if drifted and args.rebuild:
+        with db.transaction() as c:
+            rebuild_complaint_stats(c)
+        invalidate_analytics()
+        print("complaint_stats yeniden oluşturuldu")
+        return 0
+    return 1 if drifted else 0
+
+def load_sklearn_model(key):
+    """Kayıt defterini atlayıp pickle'daki sklearn modelini ve dosyanın SHA-256 özetini oku"""
+    file_path = os.path.join(model_path, MODEL_FILES[key])
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    return pickle.loads(data), hashlib.sha256(data).hexdigest()
+
+def scorer_test_texts(size):
+    """Doğrulama için örnek metinler + sözlükten kelime eklenmiş türevleri (temizlenmiş halde)"""
+    vocabulary = sorted(model_registry.get('vectorizer').vocabulary_)
+    texts = list(NORMALIZER_GOLDEN_TEXTS)
+    texts += [
+        f"{BENCHMARK_TEXTS[i % len(BENCHMARK_TEXTS)]} {vocabulary[(i * 7919) % len(vocabulary)]}"
+        for i in range(size)
+    ]
+    return [clean_text(text) for text in texts]
+
+def scorer_test_corpus(size):
+    """Puanlayıcı doğrulaması için vektörleştirilmiş test metinleri"""
+    return model_registry.get('vectorizer').transform(scorer_test_texts(size))
+
+def verify_scorer(estimator, scorer, text_vectors):
+    """Puanlayıcı sklearn modeliyle aynı etiketleri (ve olasılıkları) veriyor mu"""
+    mismatches = int((estimator.predict(text_vectors) != scorer.predict(text_vectors)).sum())
+    max_proba_diff = None
+    if scorer.proba != 'none':
+        max_proba_diff = float(np.abs(estimator.predict_proba(text_vectors) - scorer.predict_proba(text_vectors)).max())
+    return mismatches, max_proba_diff
+
+def export_scorers(args):
+    """Doğrusal modelleri NumPy puanlayıcı dosyalarına aktar ve sklearn ile aynı sonucu verdiklerini doğrula"""
+    text_vectors = scorer_test_corpus(args.corpus_size)
+    failures = 0
+    for key, scorer_file in SCORER_FILES.items():
+        estimator, source_sha256 = load_sklearn_model(key)
+        scorer = LinearScorer.from_estimator(estimator, source_sha256)
+        mismatches, max_proba_diff = verify_scorer(estimator, scorer, text_vectors)
+        proba_note = '' if max_proba_diff is None else f", en büyük olasılık farkı {max_proba_diff:.1e}"
+        if mismatches or (max_proba_diff or 0.0) > 1e-9:
+            failures += 1
+            print(f"✗ {key}: {text_vectors.shape[0]} metinde {mismatches} farklı etiket{proba_note}, dışa aktarılmadı")
+            continue
+        scorer_path = os.path.join(model_path, scorer_file)
+        scorer.save(scorer_path)
+        print(f"✓ {key}: {scorer_file} ({os.path.getsize(scorer_path) / 1024:.0f} KB), "
+              f"{text_vectors.shape[0]} metinde etiketler aynı{proba_note}")
+    return 1 if failures else 0
+
+def same_csr(expected, actual):
+    """İki CSR matris dtype, yapı ve değer olarak birebir aynı mı"""
+    return (
+        expected.shape == actual.shape
+        and expected.dtype == actual.dtype
+        and np.array_equal(expected.indptr, actual.indptr)
+        and np.array_equal(expected.indices, actual.indices)
+        and np.array_equal(expected.data, actual.data)
+    )
 
-    /* Animasyonlar için keyframe tanımlamaları */
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(20px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
+def export_vocabulary(args):
+    """Vectorizer sözlüğünü sıkıştırılmış NumPy dosyasına aktar ve transform çıktısının aynı olduğunu doğrula"""
+    vectorizer, source_sha256 = load_sklearn_model('vectorizer')
+    compact = CompactVectorizer.from_vectorizer(vectorizer, source_sha256)
+    texts = scorer_test_texts(args.corpus_size)
+    # Hem toplu hem tek belgelik çağrı aynı matrisi vermeli
+    same = same_csr(vectorizer.transform(texts), compact.transform(texts)) and all(
+        same_csr(vectorizer.transform([text]), compact.transform([text])) for text in texts[:200]
+    )
+    if not same:
+        print(f"✗ vectorizer: {len(texts)} metinde transform çıktısı farklı, dışa aktarılmadı")
+        return 1
+    vocabulary_path = os.path.join(model_path, VOCABULARY_FILE)
+    compact.save(vocabulary_path)
+    print(f"✓ vectorizer: {VOCABULARY_FILE} ({os.path.getsize(vocabulary_path) / 1024:.0f} KB, "
+          f"{compact.n_features} terim), {len(texts)} metinde çıktı aynı")
+    return 0
+
+def backfill_ensemble(args):
+    """Topluluk tahmini olmayan ya da eski (--rescore ile tüm) şikayetleri id sırasıyla sayfa sayfa puanla
+
+    Eski tahmin, özeti (fingerprint) şu anki model dosyalarının özetlerinden
+    (current_ensemble_fingerprints) hiçbiri olmayan satırdır. DL yüklenebiliyorsa
+    oylamaya katılır. Her sayfa bir kez temizlenip vektörleştirilir, tüm modeller aynı
+    matrisle çalışır ve sonuçlar tek transaction'da yazılır. Bekleyen şikayetler
+    arka plan sınıflandırıcısı tarafından puanlandığı için atlanır.
+    """
+    db = get_db()
+    vectorizer = model_registry.get('vectorizer')
+    keys = ensemble_models(load_dl=True)
+    fingerprints = current_ensemble_fingerprints()
+    missing_only = '' if args.rescore else '''
+        AND NOT EXISTS (SELECT 1 FROM complaint_predictions p WHERE p.complaint_id = c.id AND p.fingerprint IN (?, ?))
+    '''
+    missing_params = () if args.rescore else fingerprints
+    with db.connection() as conn:
+        total = conn.execute(f'''
+            SELECT COUNT(*) FROM complaints c WHERE c.category != ? {missing_only}
+        ''', (PENDING_CATEGORY, *missing_params)).fetchone()[0]
+    print(f"Puanlanacak şikayet: {total}, modeller: {', '.join(keys)}")
+
+    last_id = 0
+    processed = 0
+    start = time.perf_counter()
+    while True:
+        with db.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT c.id, c.complaint_text FROM complaints c
+                WHERE c.id > ? AND c.category != ? {missing_only}
+                ORDER BY c.id
+                LIMIT ?
+            ''', (last_id, PENDING_CATEGORY, *missing_params, args.page_size)).fetchall()
+        if not rows:
+            break
+        votes, majority = ensemble_predict(vectorizer.transform([clean_text(row[1]) for row in rows]), keys)
+        with db.transaction() as c:
+            save_ensemble_predictions(c, [row[0] for row in rows], votes, majority)
+        last_id = rows[-1][0]
+        processed += len(rows)
+        print(f"{processed}/{total} şikayet puanlandı, son id: {last_id}, "
+              f"{processed / (time.perf_counter() - start):.0f} şikayet/sn")
+
+    invalidate_analytics()
+    agreement = get_model_agreement(fingerprints)
+    print(f"Puanlı şikayet: {agreement['scored']}, tüm modeller aynı: {agreement['all_agree']}")
+    for key, rate in agreement['with_majority'].items():
+        print(f"  {MODEL_DISPLAY_NAMES[key]:<20} çoğunlukla uyum: {rate}")
+    return 0
+
+def run_cli(argv):
+    parser = argparse.ArgumentParser(description="İBB Şikayet Kategorilendirme Sistemi komut satırı araçları")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    reclassify_parser = subparsers.add_parser('reclassify', help="complaints tablosunu seçilen modelle yeniden sınıflandır")
+    reclassify_parser.add_argument('--model', required=True, choices=list(MODEL_DISPLAY_NAMES))
+    reclassify_parser.add_argument('--page-size', type=int, default=BATCH_CHUNK_SIZE)
+    reclassify_parser.add_argument('--start-after', type=int, default=0, help="Bu id'den sonraki kayıtlardan başla")
+    reclassify_parser.add_argument('--resume', action='store_true', help="Son kayıtlı kontrol noktasından devam et")
+    reclassify_parser.set_defaults(func=reclassify_complaints)
+
+    stats_parser = subparsers.add_parser('check-stats', help="Dashboard sayaçlarını complaints tablosuyla karşılaştır")
+    stats_parser.add_argument('--rebuild', action='store_true', help="Sapma varsa sayaçları baştan hesapla")
+    stats_parser.set_defaults(func=check_complaint_stats)
+
+    export_parser = subparsers.add_parser('export-scorers', help="Doğrusal modelleri NumPy puanlayıcı dosyalarına aktar")
+    export_parser.add_argument('--corpus-size', type=int, default=5000, help="doğrulama metni sayısı")
+    export_parser.set_defaults(func=export_scorers)
+
+    vocabulary_parser = subparsers.add_parser('export-vocabulary', help="Vectorizer sözlüğünü sıkıştırılmış NumPy dosyasına aktar")
+    vocabulary_parser.add_argument('--corpus-size', type=int, default=5000)
+    vocabulary_parser.set_defaults(func=export_vocabulary)
+
+    backfill_parser = subparsers.add_parser('backfill-ensemble', help="Mevcut şikayetleri tüm modellerle puanla (complaint_predictions)")
+    backfill_parser.add_argument('--page-size', type=int, default=BATCH_CHUNK_SIZE)
+    backfill_parser.add_argument('--rescore', action='store_true', help="Daha önce puanlananları da yeniden puanla")
+    backfill_parser.set_defaults(func=backfill_ensemble)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+# `python app.py <komut>` ile çağrıldığında arayüzü çizmeden komutu çalıştır.
+# `streamlit run` altında (çalışma zamanı varken) arayüz her zaman çizilir.
+if __name__ == "__main__" and len(sys.argv) > 1 and not st.runtime.exists():
+    sys.exit(run_cli(sys.argv[1:]))
+
+def main():
+    """Streamlit arayüzünü çiz; `streamlit run app.py` her etkileşimde baştan çalıştırır"""
+    # CSS stillerini güncelle
+    st.markdown("""
+    <style>
+        /* Ana tema renkleri */
+        :root {
+            --primary-color: #0083b0;
+            --secondary-color: #00b4db;
+            --background-color: #f8f9fa;
+            --text-color: #2c3e50;
+        }
 
-    @keyframes pulse {
-        0% { transform: scale(1); }
-        50% { transform: scale(1.05); }
-        100% { transform: scale(1); }
-    }
+        /* Animasyonlar için keyframe tanımlamaları */
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(20px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
 
-    @keyframes slideIn {
-        from { transform: translateX(-100%); opacity: 0; }
-        to { transform: translateX(0); opacity: 1; }
-    }
+        @keyframes pulse {
+            0% { transform: scale(1); }
+            50% { transform: scale(1.05); }
+            100% { transform: scale(1); }
+        }
 
-    /* Header container stili */
-    .header-container {
-        background: linear-gradient(135deg, #2c3e50, #3498db);
-        padding: 2rem;
-        border-radius: 15px;
-        margin-bottom: 2rem;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        animation: slideIn 0.8s ease-out;
-    }
+        @keyframes slideIn {
+            from { transform: translateX(-100%); opacity: 0; }
+            to { transform: translateX(0); opacity: 1; }
+        }
 
-    /* Buton stili */
-    .stButton>button {
-        width: 100%;
-        border-radius: 25px !important;
-        height: 3em;
-        background: linear-gradient(45deg, var(--secondary-color), var(--primary-color)) !important;
-        color: white !important;
-        font-weight: bold !important;
-        border: none !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.2) !important;
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-2px) !important;
-        box-shadow: 0 6px 20px rgba(0,0,0,0.3) !important;
-        animation: pulse 1s infinite;
-    }
-    
-    .stButton>button:active {
-        transform: translateY(1px) !important;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.2) !important;
-    }
+        /* Header container stili */
+        .header-container {
+            background: linear-gradient(135deg, #2c3e50, #3498db);
+            padding: 2rem;
+            border-radius: 15px;
+            margin-bottom: 2rem;
+            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+            animation: slideIn 0.8s ease-out;
+        }
 
-    /* Metin alanı stili */
-    .css-1v0mbdj.ebxwdo61, .st-emotion-cache-1v0mbdj.ebxwdo61 {
-        border-radius: 15px;
-        border: 2px solid rgba(0,131,176,0.1);
-        padding: 1.5rem;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.05);
-        background-color: white;
-        transition: all 0.3s ease;
-        animation: fadeIn 0.5s ease-out;
-    }
-    
-    .css-1v0mbdj.ebxwdo61:focus-within {
-        border-color: var(--primary-color);
-        box-shadow: 0 4px 20px rgba(0,131,176,0.15);
-        transform: translateY(-2px);
-    }
+        /* Buton stili */
+        .stButton>button {
+            width: 100%;
+            border-radius: 25px !important;
+            height: 3em;
+            background: linear-gradient(45deg, var(--secondary-color), var(--primary-color)) !important;
+            color: white !important;
+            font-weight: bold !important;
+            border: none !important;
+            transition: all 0.3s ease !important;
+            box-shadow: 0 4px 15px rgba(0,0,0,0.2) !important;
+            position: relative;
+            overflow: hidden;
+        }
 
-    /* Şikayet kutusu stili */
-    .complaint-box {
-        padding: 1.5rem;
-        border-radius: 15px;
-        background: rgba(255, 255, 255, 0.1);
-        margin: 1rem 0;
-        border-left: 5px solid var(--primary-color);
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        transition: all 0.3s ease;
-        animation: fadeIn 0.5s ease-out;
-    }
-    
-    .complaint-box:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 6px 20px rgba(0,0,0,0.15);
-        background: rgba(255, 255, 255, 0.15);
-    }
+        .stButton>button:hover {
+            transform: translateY(-2px) !important;
+            box-shadow: 0 6px 20px rgba(0,0,0,0.3) !important;
+            animation: pulse 1s infinite;
+        }
 
-    /* Radio butonları stili */
-    .st-emotion-cache-1v0mbdj {
-        background-color: white;
-        border-radius: 10px;
-        padding: 0.5rem;
-        transition: all 0.3s ease;
-    }
-    
-    .st-emotion-cache-1v0mbdj:hover {
-        background-color: rgba(255,255,255,0.9);
-        transform: translateY(-1px);
-    }
+        .stButton>button:active {
+            transform: translateY(1px) !important;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.2) !important;
+        }
 
-    /* Success message stili */
-    .st-emotion-cache-1eqh5xj {
-        border-radius: 10px;
-        animation: fadeIn 0.5s ease-out;
-        transition: all 0.3s ease;
-    }
+        /* Metin alanı stili */
+        .css-1v0mbdj.ebxwdo61, .st-emotion-cache-1v0mbdj.ebxwdo61 {
+            border-radius: 15px;
+            border: 2px solid rgba(0,131,176,0.1);
+            padding: 1.5rem;
+            box-shadow: 0 4px 15px rgba(0,0,0,0.05);
+            background-color: white;
+            transition: all 0.3s ease;
+            animation: fadeIn 0.5s ease-out;
+        }
 
-    /* Loading spinner stili */
-    .stSpinner {
-        animation: pulse 1s infinite;
-    }
+        .css-1v0mbdj.ebxwdo61:focus-within {
+            border-color: var(--primary-color);
+            box-shadow: 0 4px 20px rgba(0,131,176,0.15);
+            transform: translateY(-2px);
+        }
 
-    /* Hover efektleri */
-    .complaint-box p strong {
-        color: var(--primary-color);
-        transition: all 0.3s ease;
-    }
-    
-    .complaint-box:hover p strong {
-        color: var(--secondary-color);
-    }
+        /* Şikayet kutusu stili */
+        .complaint-box {
+            padding: 1.5rem;
+            border-radius: 15px;
+            background: rgba(255, 255, 255, 0.1);
+            margin: 1rem 0;
+            border-left: 5px solid var(--primary-color);
+            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+            transition: all 0.3s ease;
+            animation: fadeIn 0.5s ease-out;
+        }
 
-    /* Tab stili */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-        background-color: transparent;
-    }
+        .complaint-box:hover {
+            transform: translateY(-3px);
+            box-shadow: 0 6px 20px rgba(0,0,0,0.15);
+            background: rgba(255, 255, 255, 0.15);
+        }
 
-    .stTabs [data-baseweb="tab"] {
-        height: 50px;
-        border-radius: 10px;
-        background-color: rgba(255,255,255,0.1);
-        transition: all 0.3s ease;
-        border: none !important;
-        padding: 0 20px;
-    }
+        /* Radio butonları stili */
+        .st-emotion-cache-1v0mbdj {
+            background-color: white;
+            border-radius: 10px;
+            padding: 0.5rem;
+            transition: all 0.3s ease;
+        }
 
-    .stTabs [data-baseweb="tab"]:hover {
-        background-color: rgba(255,255,255,0.2);
-        transform: translateY(-2px);
-    }
+        .st-emotion-cache-1v0mbdj:hover {
+            background-color: rgba(255,255,255,0.9);
+            transform: translateY(-1px);
+        }
 
-    .stTabs [aria-selected="true"] {
-        background-color: var(--primary-color) !important;
-        color: white !important;
-    }
+        /* Success message stili */
+        .st-emotion-cache-1eqh5xj {
+            border-radius: 10px;
+            animation: fadeIn 0.5s ease-out;
+            transition: all 0.3s ease;
+        }
 
-    /* Genel animasyonlar */
-    .stMarkdown, .stText {
-        animation: fadeIn 0.5s ease-out;
-    }
+        /* Loading spinner stili */
+        .stSpinner {
+            animation: pulse 1s infinite;
+        }
 
-    /* Şikayet kartları grid container */
-    .complaints-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-        gap: 20px;
-        padding: 20px 0;
-    }
+        /* Hover efektleri */
+        .complaint-box p strong {
+            color: var(--primary-color);
+            transition: all 0.3s ease;
+        }
 
-    /* Şikayet kartı stili */
-    .complaint-card {
-        background: white;
-        border-radius: 15px;
-        padding: 20px;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-        transition: all 0.3s ease;
-        border-left: 5px solid var(--primary-color);
-        margin-bottom: 20px;
-        animation: fadeIn 0.5s ease-out;
-    }
-    
-    .complaint-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 25px rgba(0,0,0,0.2);
-        background: linear-gradient(145deg, rgba(255, 255, 255, 0.15), rgba(255, 255, 255, 0.1));
-    }
+        .complaint-box:hover p strong {
+            color: var(--secondary-color);
+        }
 
-    @keyframes cardPop {
-        0% {
-            opacity: 0;
-            transform: scale(0.95) translateY(20px);
+        /* Tab stili */
+        .stTabs [data-baseweb="tab-list"] {
+            gap: 8px;
+            background-color: transparent;
         }
-        100% {
-            opacity: 1;
-            transform: scale(1) translateY(0);
+
+        .stTabs [data-baseweb="tab"] {
+            height: 50px;
+            border-radius: 10px;
+            background-color: rgba(255,255,255,0.1);
+            transition: all 0.3s ease;
+            border: none !important;
+            padding: 0 20px;
         }
-    }
 
-    /* Status badge stili */
-    .status-badge {
-        display: inline-block;
-        padding: 5px 10px;
-        border-radius: 20px;
-        font-size: 0.8em;
-        font-weight: bold;
-        background: var(--primary-color);
-        color: white;
-        margin-top: 10px;
-    }
+        .stTabs [data-baseweb="tab"]:hover {
+            background-color: rgba(255,255,255,0.2);
+            transform: translateY(-2px);
+        }
 
-    /* Şikayet içeriği stili */
-    .complaint-content {
-        flex-grow: 1;
-        margin: 15px 0;
-    }
+        .stTabs [aria-selected="true"] {
+            background-color: var(--primary-color) !important;
+            color: white !important;
+        }
 
-    .complaint-content p {
-        margin: 5px 0;
-    }
+        /* Genel animasyonlar */
+        .stMarkdown, .stText {
+            animation: fadeIn 0.5s ease-out;
+        }
 
-    /* Footer stili */
-    .complaint-footer {
-        margin-top: 15px;
-        padding-top: 15px;
-        border-top: 1px solid rgba(0, 0, 0, 0.1);
-    }
+        /* Şikayet kartları grid container */
+        .complaints-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+            gap: 20px;
+            padding: 20px 0;
+        }
 
-    /* Zaman bilgisi stili */
-    .time-info {
-        display: flex;
-        flex-direction: column;
-        gap: 8px;
-        font-size: 0.9em;
-    }
+        /* Şikayet kartı stili */
+        .complaint-card {
+            background: white;
+            border-radius: 15px;
+            padding: 20px;
+            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+            transition: all 0.3s ease;
+            border-left: 5px solid var(--primary-color);
+            margin-bottom: 20px;
+            animation: fadeIn 0.5s ease-out;
+        }
 
-    .created-date, .time-ago {
-        display: flex;
-        align-items: center;
-        padding: 6px 12px;
-        background: rgba(255, 255, 255, 0.15);
-        border-radius: 8px;
-        color: #2c3e50;
-        font-weight: 500;
-        transition: all 0.3s ease;
-        backdrop-filter: blur(5px);
-        border: 1px solid rgba(255, 255, 255, 0.2);
-    }
+        .complaint-card:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 8px 25px rgba(0,0,0,0.2);
+            background: linear-gradient(145deg, rgba(255, 255, 255, 0.15), rgba(255, 255, 255, 0.1));
+        }
 
-    .created-date:hover, .time-ago:hover {
-        background: rgba(255, 255, 255, 0.25);
-        transform: translateX(5px);
-    }
+        @keyframes cardPop {
+            0% {
+                opacity: 0;
+                transform: scale(0.95) translateY(20px);
+            }
+            100% {
+                opacity: 1;
+                transform: scale(1) translateY(0);
+            }
+        }
 
-    .icon {
-        width: 16px;
-        height: 16px;
-        margin-right: 8px;
-        color: #2c3e50;
-        opacity: 0.8;
-    }
+        /* Status badge stili */
+        .status-badge {
+            display: inline-block;
+            padding: 5px 10px;
+            border-radius: 20px;
+            font-size: 0.8em;
+            font-weight: bold;
+            background: var(--primary-color);
+            color: white;
+            margin-top: 10px;
+        }
 
-    .time-info span:hover .icon {
-        opacity: 1;
-    }
+        /* Şikayet içeriği stili */
+        .complaint-content {
+            flex-grow: 1;
+            margin: 15px 0;
+        }
 
-    /* Grid düzeni için ek stiller */
-    .st-emotion-cache-12w0qpk {
-        gap: 1rem;
-    }
+        .complaint-content p {
+            margin: 5px 0;
+        }
 
-    .st-emotion-cache-1r6slb0 {
-        padding: 0 0.5rem;
-    }
+        /* Footer stili */
+        .complaint-footer {
+            margin-top: 15px;
+            padding-top: 15px;
+            border-top: 1px solid rgba(0, 0, 0, 0.1);
+        }
 
-    .icon {
-        vertical-align: middle;
-        margin-right: 5px;
-        opacity: 0.8;
-    }
+        /* Zaman bilgisi stili */
+        .time-info {
+            display: flex;
+            flex-direction: column;
+            gap: 8px;
+            font-size: 0.9em;
+        }
 
-    .time-info span:hover .icon {
-        opacity: 1;
-        transform: scale(1.1);
-    }
+        .created-date, .time-ago {
+            display: flex;
+            align-items: center;
+            padding: 6px 12px;
+            background: rgba(255, 255, 255, 0.15);
+            border-radius: 8px;
+            color: #2c3e50;
+            font-weight: 500;
+            transition: all 0.3s ease;
+            backdrop-filter: blur(5px);
+            border: 1px solid rgba(255, 255, 255, 0.2);
+        }
 
-    .time-info span {
-        display: flex;
-        align-items: center;
-        gap: 5px;
-    }
+        .created-date:hover, .time-ago:hover {
+            background: rgba(255, 255, 255, 0.25);
+            transform: translateX(5px);
+        }
 
-    /* Model bazlı şikayetler için ek stiller */
-    .model-section {
-        background: rgba(255, 255, 255, 0.05);
-        padding: 20px;
-        border-radius: 15px;
-        margin: 20px 0;
-        border-left: 5px solid var(--primary-color);
-    }
+        .icon {
+            width: 16px;
+            height: 16px;
+            margin-right: 8px;
+            color: #2c3e50;
+            opacity: 0.8;
+        }
 
-    .model-header {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        margin-bottom: 15px;
-    }
+        .time-info span:hover .icon {
+            opacity: 1;
+        }
 
-    .model-count {
-        background: var(--primary-color);
-        color: white;
-        padding: 5px 15px;
-        border-radius: 20px;
-        font-size: 0.9em;
-    }
-</style>
-""", unsafe_allow_html=True)
+        /* Grid düzeni için ek stiller */
+        .st-emotion-cache-12w0qpk {
+            gap: 1rem;
+        }
 
-# CSS'e Font Awesome CDN'ini ekleyelim
-st.markdown("""
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">
-""", unsafe_allow_html=True)
+        .st-emotion-cache-1r6slb0 {
+            padding: 0 0.5rem;
+        }
 
-# Logo dosyasını base64'e çevir
-def get_base64_from_file(file_path):
-    with open(file_path, "rb") as f:
-        data = f.read()
-    return base64.b64encode(data).decode()
+        .icon {
+            vertical-align: middle;
+            margin-right: 5px;
+            opacity: 0.8;
+        }
 
-# Logo'yu base64'e çevir
-logo_base64 = get_base64_from_file("/Users/kemalsongur/Desktop/Masaüstü - Kemal's MacBook Pro/YZO/ibb-logo.svg")
+        .time-info span:hover .icon {
+            opacity: 1;
+            transform: scale(1.1);
+        }
 
-# Header'ı güncelle
-st.markdown("""
-    <div class="header-container">
-        <div style="display: grid; grid-template-columns: 250px 1fr; gap: 30px;">
-            <div style="background: white; padding: 15px; border-radius: 15px; display: flex; justify-content: center; align-items: center; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
-                <img src="data:image/svg+xml;base64,{}" style="height: 150px; transition: all 0.3s ease;" onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
-            </div>
-            <div style="display: flex; flex-direction: column; justify-content: center;">
-                <h1 style='margin: 0; font-size: 2.5em; background: linear-gradient(45deg, #ffffff, #f0f0f0); -webkit-background-clip: text; -webkit-text-fill-color: transparent;'>
-                    İBB Şikayet Kategorilendirme Sistemi
-                </h1>
-                <p style='margin: 10px 0 0 0; font-size: 1.2em; color: rgba(255,255,255,0.9);'>
-                    Yapay Zeka Destekli Şikayet Yönetim Sistemi
-                </p>
+        .time-info span {
+            display: flex;
+            align-items: center;
+            gap: 5px;
+        }
+
+        /* Model bazlı şikayetler için ek stiller */
+        .model-section {
+            background: rgba(255, 255, 255, 0.05);
+            padding: 20px;
+            border-radius: 15px;
+            margin: 20px 0;
+            border-left: 5px solid var(--primary-color);
+        }
+
+        .model-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 15px;
+        }
+
+        .model-count {
+            background: var(--primary-color);
+            color: white;
+            padding: 5px 15px;
+            border-radius: 20px;
+            font-size: 0.9em;
+        }
+    </style>
+    """, unsafe_allow_html=True)
+
+    # CSS'e Font Awesome CDN'ini ekleyelim
+    st.markdown("""
+        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">
+    """, unsafe_allow_html=True)
+
+    # Logo dosyasını base64'e çevir
+    def get_base64_from_file(file_path):
+        with open(file_path, "rb") as f:
+            data = f.read()
+        return base64.b64encode(data).decode()
+
+    # Logo'yu base64'e çevir
+    logo_base64 = get_base64_from_file("/Users/kemalsongur/Desktop/Masaüstü - Kemal's MacBook Pro/YZO/ibb-logo.svg")
+
+    # Header'ı güncelle
+    st.markdown("""
+        <div class="header-container">
+            <div style="display: grid; grid-template-columns: 250px 1fr; gap: 30px;">
+                <div style="background: white; padding: 15px; border-radius: 15px; display: flex; justify-content: center; align-items: center; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
+                    <img src="data:image/svg+xml;base64,{}" style="height: 150px; transition: all 0.3s ease;" onmouseover="this.style.transform='scale(1.05)'" onmouseout="this.style.transform='scale(1)'">
+                </div>
+                <div style="display: flex; flex-direction: column; justify-content: center;">
+                    <h1 style='margin: 0; font-size: 2.5em; background: linear-gradient(45deg, #ffffff, #f0f0f0); -webkit-background-clip: text; -webkit-text-fill-color: transparent;'>
+                        İBB Şikayet Kategorilendirme Sistemi
+                    </h1>
+                    <p style='margin: 10px 0 0 0; font-size: 1.2em; color: rgba(255,255,255,0.9);'>
+                        Yapay Zeka Destekli Şikayet Yönetim Sistemi
+                    </p>
+                </div>
             </div>
         </div>
-    </div>
-""".format(logo_base64), unsafe_allow_html=True)
+    """.format(logo_base64), unsafe_allow_html=True)
 
-# Tabs oluştur
-tab1, tab2, tab3 = st.tabs(["📝 Yeni Şikayet", "🔍 Şikayet Sorgula", "👨‍💼 Admin Paneli"])
+    # Tabs oluştur
+    tab1, tab2, tab3 = st.tabs(["📝 Yeni Şikayet", "🔍 Şikayet Sorgula", "👨‍💼 Admin Paneli"])
 
-with tab1:
-    st.markdown("### 👤 Kişisel Bilgiler")
-    
-    # Kişisel bilgiler formu
-    with st.form("user_form"):
-        col1, col2 = st.columns(2)
-        with col1:
-            name = st.text_input("Ad Soyad*")
-            email = st.text_input("E-posta*")
-        with col2:
-            phone = st.text_input("Telefon")
-        
-        st.markdown("### 🤖 Model Seçimi")
-        model_choice = st.selectbox(
-            "Model Seçin",
-            ["MultinomialNB", "SGD Classifier", "Logistic Regression", "Deep Learning"],
-            key="model_select"
-        )
-        
-        # Model mapping'i güncelle
-        model_type_mapping = {
-            "MultinomialNB": "mb",
-            "SGD Classifier": "sgd",
-            "Logistic Regression": "lr",
-            "Deep Learning": "dl"
-        }
-        
-        st.markdown("### ✍️ Şikayet Detayları")
-        complaint_text = st.text_area(
-            "Lütfen şikayetinizi detaylı bir şekilde açıklayın:*",
-            height=120
-        )
-        
-        submit_button = st.form_submit_button("🚀 Şikayet Oluştur")
-        
-        if submit_button:
-            if not name or not email or not complaint_text:
-                st.error("⚠️ Lütfen zorunlu alanları doldurun!")
-            else:
-                with st.spinner("🔄 Şikayetiniz yapay zeka tarafından analiz ediliyor..."):
-                    try:
-                        # Kullanıcıyı kaydet/güncelle
-                        user_id = save_user(name, email, phone)
-                        
-                        # Model tipini al
-                        model_type = model_type_mapping[model_choice]
-                        
-                        # Şikayeti analiz et
-                        category = find_label(complaint_text, model_type)
-                        
-                        if category:
-                            complaint_number = np.random.randint(100000, 999999)
-                            
-                            # Şikayeti kaydet
-                            save_complaint(
+    # Arka plan sınıflandırmasını bekleyen şikayet için yoklama aralığı ve en uzun yoklama süresi (saniye)
+    CLASSIFICATION_POLL_INTERVAL = 1.0
+    CLASSIFICATION_POLL_TIMEOUT = 60.0
+
+    @st.fragment(run_every=CLASSIFICATION_POLL_INTERVAL)
+    def show_classification_progress(complaint_number, submitted_at):
+        complaint = get_complaint_by_number(complaint_number)
+        timed_out = time.time() - submitted_at > CLASSIFICATION_POLL_TIMEOUT
+        if (complaint and complaint[2] != PENDING_CATEGORY) or timed_out:
+            # Kategori hazır ya da süre doldu: sayfanın tamamı yenilenir, yoklama durur
+            st.rerun()
+        st.info(f"{PENDING_CATEGORY_LABEL}: şikayet #{complaint_number} kategorisi birazdan burada görünecek.")
+
+    with tab1:
+        st.markdown("### 👤 Kişisel Bilgiler")
+
+        # Kişisel bilgiler formu
+        with st.form("user_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                name = st.text_input("Ad Soyad*")
+                email = st.text_input("E-posta*")
+            with col2:
+                phone = st.text_input("Telefon")
+
+            st.markdown("### 🤖 Model Seçimi")
+            model_choice = st.selectbox(
+                "Model Seçin",
+                list(MODEL_DISPLAY_NAMES.values()),
+                help="Auto (Kademeli): önce Logistic Regression, emin olunamazsa Deep Learning",
+                key="model_select"
+            )
+
+
+            st.markdown("### ✍️ Şikayet Detayları")
+            complaint_text = st.text_area(
+                "Lütfen şikayetinizi detaylı bir şekilde açıklayın:*",
+                height=120
+            )
+
+            submit_button = st.form_submit_button("🚀 Şikayet Oluştur")
+
+            if submit_button:
+                if not name or not email or not complaint_text:
+                    st.error("⚠️ Lütfen zorunlu alanları doldurun!")
+                else:
+                    with st.spinner("🔄 Şikayetiniz kaydediliyor..."):
+                        try:
+                            # Kullanıcıyı kaydet/güncelle
+                            user_id = save_user(name, email, phone)
+
+                            # Şikayet hemen kaydedilir, kategorisi arka planda seçilen modelle belirlenir
+                            complaint_number = save_complaint(
                                 user_id=user_id,
-                                complaint_number=complaint_number,
                                 complaint_text=complaint_text,
-                                category=category,
+                                category=PENDING_CATEGORY,
                                 model_used=model_choice  # Tam model adını kullan
                             )
-                            
-                            st.success("✅ Şikayetiniz başarıyla kaydedildi!")
-                            st.write(f"Şikayet numaranız: {complaint_number}")
-                            
-                    except Exception as e:
-                        st.error(f"Bir hata oluştu: {str(e)}")
-                        print(f"Hata detayı: {str(e)}")  # Debug için
-
-# Tab2 içinde, session state kullanarak e-posta adresini saklayalım
-if 'search_email' not in st.session_state:
-    st.session_state.search_email = ''
-
-with tab2:
-    st.markdown("### 🔍 Şikayet Sorgulama")
-    
-    search_method = st.radio(
-        "Arama Yöntemi",
-        ["E-posta ile Ara", "Şikayet Numarası ile Ara"]
-    )
-    
-    if search_method == "E-posta ile Ara":
-        search_email = st.text_input("E-posta Adresiniz", value=st.session_state.search_email)
-        st.session_state.search_email = search_email
-        
-        show_complaints = st.button("Şikayetlerimi Göster")
-        
-        if show_complaints or st.session_state.search_email:
-            if st.session_state.search_email:
-                complaints = get_user_complaints(st.session_state.search_email.strip())
-                if complaints:
-                    st.success(f"📋 Toplam {len(complaints)} adet şikayet bulundu.")
-                    
-                    # Şikayetleri kategorilere göre grupla
-                    categorized_complaints = {
-                        'İgdaş': [],
-                        'İett': [],
-                        'İski': [],
-                        'Diğer İBB': [],
-                        'İlgisiz': []
-                    }
-                    
-                    for complaint in complaints:
-                        category = complaint[2]
-                        if 'İgdaş' in category:
-                            categorized_complaints['İgdaş'].append(complaint)
-                        elif 'İett' in category:
-                            categorized_complaints['İett'].append(complaint)
-                        elif 'İski' in category:
-                            categorized_complaints['İski'].append(complaint)
-                        elif 'Diğer' in category:
-                            categorized_complaints['Diğer İBB'].append(complaint)
-                        else:
-                            categorized_complaints['İlgisiz'].append(complaint)
-                    
-                    # Kategorilere göre sekmeleri oluştur
-                    tabs = st.tabs([
-                        f"🔥 İgdaş ({len(categorized_complaints['İgdaş'])})",
-                        f"🚌 İett ({len(categorized_complaints['İett'])})",
-                        f"💧 İski ({len(categorized_complaints['İski'])})",
-                        f"🏢 Diğer İBB ({len(categorized_complaints['Diğer İBB'])})",
-                        f"❓ İlgisiz ({len(categorized_complaints['İlgisiz'])})"
-                    ])
-                    
-                    # Her sekme için şikayetleri göster
-                    for tab_idx, (category, tab) in enumerate(zip(categorized_complaints.keys(), tabs)):
-                        with tab:
-                            if categorized_complaints[category]:
-                                for complaint in categorized_complaints[category]:
-                                    complaint_number = complaint[0]
-                                    status = complaint[3]
-                                    created_date = complaint[4]
-                                    time_ago = format_time_ago(created_date)
-                                    formatted_date = datetime.strptime(created_date, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y %H:%M')
-                                    
-                                    st.markdown(f"""
-                                        <div class="complaint-card">
-                                            <div class="complaint-header">
-                                                <h4 style="margin:0; color: var(--primary-color);">Şikayet #{complaint_number}</h4>
-                                                <div class="status-badge">{status}</div>
-                                            </div>
-                                            <div class="complaint-content">
-                                                <p style="margin-top:10px;">
-                                                    {complaint[1]}
-                                                </p>
-                                            </div>
-                                            <div class="complaint-footer">
-                                                <div class="time-info">
-                                                    <span class="created-date">
-                                                        <i class="far fa-calendar-alt icon"></i>
-                                                        {formatted_date}
-                                                    </span>
-                                                    <span class="time-ago">
-                                                        <i class="far fa-clock icon"></i>
-                                                        {time_ago}
-                                                    </span>
-                                                </div>
-                                            </div>
-                                        </div>
-                                        <br>
-                                    """, unsafe_allow_html=True)
+
+                            if complaint_number:
+                                st.success("✅ Şikayetiniz başarıyla kaydedildi!")
+                                st.write(f"Şikayet numaranız: {complaint_number}")
+                                st.session_state.submitted_complaint_number = complaint_number
+                                st.session_state.submitted_complaint_at = time.time()
                             else:
-                                st.info(f"Bu kategoride henüz şikayet bulunmuyor.")
+                                st.error("⚠️ Şikayetiniz kaydedilemedi, lütfen tekrar deneyin.")
+
+                        except Exception as e:
+                            st.error(f"Bir hata oluştu: {str(e)}")
+                            print(f"Hata detayı: {str(e)}")  # Debug için
+
+        # Son gönderilen şikayetin kategorisi hazır olana kadar sadece bu bölüm yenilenir
+        submitted_number = st.session_state.get('submitted_complaint_number')
+        if submitted_number:
+            submitted_complaint = get_complaint_by_number(submitted_number)
+            submitted_at = st.session_state.get('submitted_complaint_at', 0.0)
+            if submitted_complaint and submitted_complaint[2] == PENDING_CATEGORY:
+                if time.time() - submitted_at <= CLASSIFICATION_POLL_TIMEOUT:
+                    show_classification_progress(submitted_number, submitted_at)
                 else:
-                    st.warning("❌ Bu e-posta adresine ait şikayet bulunamadı.")
-            else:
-                st.error("⚠️ Lütfen e-posta adresinizi girin!")
+                    st.warning(f"Şikayet #{submitted_number} kaydedildi ancak kategorisi henüz belirlenemedi. "
+                               "Daha sonra 'Şikayet Sorgula' sekmesinden kontrol edebilirsiniz.")
+            elif submitted_complaint and submitted_complaint[2] == FAILED_CATEGORY:
+                st.error(f"Şikayet #{submitted_number} kaydedildi ancak otomatik olarak sınıflandırılamadı; "
+                         "kategorisi ekibimiz tarafından belirlenecek.")
+            elif submitted_complaint:
+                st.info(f"📂 Şikayet #{submitted_number} kategorisi: {submitted_complaint[2]}")
+
+    # Tab2 içinde, session state kullanarak e-posta adresini saklayalım
+    if 'search_email' not in st.session_state:
+        st.session_state.search_email = ''
+    if 'user_complaints_cache' not in st.session_state:
+        st.session_state.user_complaints_cache = {}
+
+    with tab2:
+        st.markdown("### 🔍 Şikayet Sorgulama")
+
+        search_method = st.radio(
+            "Arama Yöntemi",
+            ["E-posta ile Ara", "Şikayet Numarası ile Ara"]
+        )
 
-    else:  # Şikayet Numarası ile Ara
-        complaint_number = st.text_input("Şikayet Numarası", key="complaint_number")
-        
-        if st.button("Şikayeti Göster"):
-            if complaint_number:
-                try:
-                    complaint = get_complaint_by_number(complaint_number)
-                    if complaint:
-                        st.success("📋 Şikayet bulundu.")
-                        st.markdown(f"""
-                            <div class="complaint-box">
-                                <p><strong>Şikayet No:</strong> {complaint[0]}</p>
-                                <p><strong>Şikayet Sahibi:</strong> {complaint[5]}</p>
-                                <p><strong>E-posta:</strong> {complaint[6]}</p>
-                                <p><strong>Şikayet:</strong> {complaint[1]}</p>
-                                <p><strong>Kategori:</strong> {complaint[2]}</p>
-                                <p><strong>Durum:</strong> {complaint[3]}</p>
-                                <p><strong>Tarih:</strong> {complaint[4]}</p>
-                            </div>
-                        """, unsafe_allow_html=True)
+        if search_method == "E-posta ile Ara":
+            search_email = st.text_input("E-posta Adresiniz", value=st.session_state.search_email)
+            st.session_state.search_email = search_email
+
+            show_complaints = st.button("Şikayetlerimi Göster")
+
+            if show_complaints or st.session_state.search_email:
+                if st.session_state.search_email:
+                    complaints = cached_user_complaints(st.session_state.user_complaints_cache,
+                                                        st.session_state.search_email.strip())
+                    if complaints:
+                        st.success(f"📋 Toplam {len(complaints)} adet şikayet bulundu.")
+
+                        # Şikayetleri kategorilere göre grupla
+                        categorized_complaints = {
+                            'İgdaş': [],
+                            'İett': [],
+                            'İski': [],
+                            'Diğer İBB': [],
+                            'İlgisiz': []
+                        }
+                        pending_complaints = []
+                        failed_complaints = []
+
+                        for complaint in complaints:
+                            category = complaint[2]
+                            if category == PENDING_CATEGORY:
+                                pending_complaints.append(complaint)
+                            elif category == FAILED_CATEGORY:
+                                failed_complaints.append(complaint)
+                            elif 'İgdaş' in category:
+                                categorized_complaints['İgdaş'].append(complaint)
+                            elif 'İett' in category:
+                                categorized_complaints['İett'].append(complaint)
+                            elif 'İski' in category:
+                                categorized_complaints['İski'].append(complaint)
+                            elif 'Diğer' in category:
+                                categorized_complaints['Diğer İBB'].append(complaint)
+                            else:
+                                categorized_complaints['İlgisiz'].append(complaint)
+
+                        # Kategorilere göre sekmeleri oluştur
+                        tab_labels = [
+                            f"🔥 İgdaş ({len(categorized_complaints['İgdaş'])})",
+                            f"🚌 İett ({len(categorized_complaints['İett'])})",
+                            f"💧 İski ({len(categorized_complaints['İski'])})",
+                            f"🏢 Diğer İBB ({len(categorized_complaints['Diğer İBB'])})",
+                            f"❓ İlgisiz ({len(categorized_complaints['İlgisiz'])})"
+                        ]
+                        # Henüz sınıflandırılmamış şikayetler ayrı sekmede
+                        if pending_complaints:
+                            categorized_complaints[PENDING_CATEGORY_LABEL] = pending_complaints
+                            tab_labels.append(f"{PENDING_CATEGORY_LABEL} ({len(pending_complaints)})")
+                        if failed_complaints:
+                            categorized_complaints[FAILED_CATEGORY_LABEL] = failed_complaints
+                            tab_labels.append(f"{FAILED_CATEGORY_LABEL} ({len(failed_complaints)})")
+                        tabs = st.tabs(tab_labels)
+
+                        # Her sekme için şikayetleri göster
+                        for tab_idx, (category, tab) in enumerate(zip(categorized_complaints.keys(), tabs)):
+                            with tab:
+                                if categorized_complaints[category]:
+                                    for complaint in categorized_complaints[category]:
+                                        complaint_number = complaint[0]
+                                        status = complaint[3]
+                                        created_date = complaint[4]
+                                        time_ago = format_time_ago(created_date)
+                                        formatted_date = datetime.strptime(created_date, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y %H:%M')
+
+                                        st.markdown(f"""
+                                            <div class="complaint-card">
+                                                <div class="complaint-header">
+                                                    <h4 style="margin:0; color: var(--primary-color);">Şikayet #{complaint_number}</h4>
+                                                    <div class="status-badge">{status}</div>
+                                                </div>
+                                                <div class="complaint-content">
+                                                    <p style="margin-top:10px;">
+                                                        {complaint[1]}
+                                                    </p>
+                                                </div>
+                                                <div class="complaint-footer">
+                                                    <div class="time-info">
+                                                        <span class="created-date">
+                                                            <i class="far fa-calendar-alt icon"></i>
+                                                            {formatted_date}
+                                                        </span>
+                                                        <span class="time-ago">
+                                                            <i class="far fa-clock icon"></i>
+                                                            {time_ago}
+                                                        </span>
+                                                    </div>
+                                                </div>
+                                            </div>
+                                            <br>
+                                        """, unsafe_allow_html=True)
+                                else:
+                                    st.info(f"Bu kategoride henüz şikayet bulunmuyor.")
                     else:
-                        st.warning("❌ Bu şikayet numarasına ait kayıt bulunamadı.")
-                except ValueError:
-                    st.error("⚠️ Lütfen geçerli bir şikayet numarası girin!")
-            else:
-                st.error("⚠️ Lütfen şikayet numarasını girin!")
+                        st.warning("❌ Bu e-posta adresine ait şikayet bulunamadı.")
+                else:
+                    st.error("⚠️ Lütfen e-posta adresinizi girin!")
 
-# Yeni tab3 (Model Bazlı Şikayetler) ekle
-with tab3:
-    st.markdown("### 👨‍💼 Admin Girişi")
-    
-    if 'admin_logged_in' not in st.session_state:
-        st.session_state.admin_logged_in = False
-    
-    if not st.session_state.admin_logged_in:
-        with st.form("admin_login"):
-            username = st.text_input("Kullanıcı Adı")
-            password = st.text_input("Şifre", type="password")
-            login_button = st.form_submit_button("Giriş Yap")
-            
-            if login_button:
-                if verify_admin(username, password):
-                    st.session_state.admin_logged_in = True
-                    st.rerun()
+        else:  # Şikayet Numarası ile Ara
+            complaint_number = st.text_input("Şikayet Numarası", key="complaint_number")
+
+            if st.button("Şikayeti Göster"):
+                if complaint_number:
+                    try:
+                        complaint = get_complaint_by_number(complaint_number)
+                        if complaint:
+                            st.success("📋 Şikayet bulundu.")
+                            st.markdown(f"""
+                                <div class="complaint-box">
+                                    <p><strong>Şikayet No:</strong> {complaint[0]}</p>
+                                    <p><strong>Şikayet Sahibi:</strong> {complaint[5]}</p>
+                                    <p><strong>E-posta:</strong> {complaint[6]}</p>
+                                    <p><strong>Şikayet:</strong> {complaint[1]}</p>
+                                    <p><strong>Kategori:</strong> {display_category(complaint[2])}</p>
+                                    <p><strong>Durum:</strong> {complaint[3]}</p>
+                                    <p><strong>Tarih:</strong> {complaint[4]}</p>
+                                </div>
+                            """, unsafe_allow_html=True)
+                        else:
+                            st.warning("❌ Bu şikayet numarasına ait kayıt bulunamadı.")
+                    except ValueError:
+                        st.error("⚠️ Lütfen geçerli bir şikayet numarası girin!")
                 else:
-                    st.error("Hatalı kullanıcı adı veya şifre!")
-    else:
-        # Çıkış yap butonu
-        if st.button("Çıkış Yap", key="logout"):
+                    st.error("⚠️ Lütfen şikayet numarasını girin!")
+
+    # Yeni tab3 (Model Bazlı Şikayetler) ekle
+    with tab3:
+        st.markdown("### 👨‍💼 Admin Girişi")
+
+        if 'admin_logged_in' not in st.session_state:
             st.session_state.admin_logged_in = False
-            st.rerun()
-        
-        # Admin sekmelerini oluştur
-        admin_tab1, admin_tab2 = st.tabs(["📊 Tüm Şikayetler", "🤖 Model Bazlı Analiz"])
-        
-        with admin_tab1:
-            st.markdown("### 📊 Tüm Şikayetler")
-            
-            # Şikayetleri getir
-            complaints = get_all_complaints()
-            
-            if not complaints:
-                st.warning("Henüz hiç şikayet bulunmuyor.")
-            else:
-                st.success(f"Toplam {len(complaints)} şikayet bulundu.")
-                
-                # Durum filtreleme
-                status_filter = st.multiselect(
-                    "Durum Filtrele",
-                    ["İnceleniyor", "Çözümleniyor", "Çözüldü"],
-                    default=["İnceleniyor", "Çözümleniyor", "Çözüldü"]
-                )
-                
-                # Her şikayet için kart oluştur
-                for complaint in complaints:
-                    if complaint[3] in status_filter:  # status filtresi
+
+        if not st.session_state.admin_logged_in:
+            with st.form("admin_login"):
+                username = st.text_input("Kullanıcı Adı")
+                password = st.text_input("Şifre", type="password")
+                login_button = st.form_submit_button("Giriş Yap")
+
+                if login_button:
+                    if verify_admin(username, password):
+                        st.session_state.admin_logged_in = True
+                        st.rerun()
+                    else:
+                        st.error("Hatalı kullanıcı adı veya şifre!")
+        else:
+            # Çıkış yap butonu
+            if st.button("Çıkış Yap", key="logout"):
+                st.session_state.admin_logged_in = False
+                st.rerun()
+
+            # Admin sekmelerini oluştur
+            admin_tab1, admin_tab2, admin_tab3 = st.tabs(["📊 Tüm Şikayetler", "🤖 Model Bazlı Analiz", "⏱️ Performans"])
+
+            with admin_tab1:
+                st.markdown("### 📊 Tüm Şikayetler")
+
+                # Filtreler SQL'de uygulanır, sadece bir sayfa şikayet getirilir
+                search_query = st.text_input("🔎 Şikayet İçeriğinde Ara", key="admin_search_query").strip()
+                filter_col1, filter_col2 = st.columns(2)
+                with filter_col1:
+                    status_filter = st.multiselect(
+                        "Durum Filtrele",
+                        COMPLAINT_STATUSES,
+                        default=COMPLAINT_STATUSES
+                    )
+                    category_filter = st.selectbox("Kategori Filtrele",
+                                                   ["Tümü"] + list(CATEGORY_LABELS.values()) + [FAILED_CATEGORY])
+                with filter_col2:
+                    model_filter = st.selectbox("Model Filtrele", ["Tümü"] + list(MODEL_DISPLAY_NAMES.values()))
+                    date_range = st.date_input("Tarih Aralığı", value=[])
+
+                filters = {
+                    'statuses': status_filter,
+                    'category': None if category_filter == "Tümü" else category_filter,
+                    'model': None if model_filter == "Tümü" else model_filter,
+                    'date_from': date_range[0] if len(date_range) > 0 else None,
+                    'date_to': date_range[1] if len(date_range) > 1 else None,
+                }
+
+                # Filtreler değişince ilk sayfaya dön; her sayfanın başlangıç imleci saklanır
+                # (aramada imleç sonuç sırasındaki konumdur, sonuçlar alaka sırasıyla gelir)
+                filter_key = repr((filters, search_query))
+                if st.session_state.get('admin_filter_key') != filter_key:
+                    st.session_state.admin_filter_key = filter_key
+                    st.session_state.admin_page_cursors = [None]
+                page_cursors = st.session_state.admin_page_cursors
+
+                if search_query:
+                    total_complaints = count_search_results(search_query, filters)
+                else:
+                    total_complaints = count_complaints(filters)
+
+                if total_complaints == 0:
+                    st.warning("Bu filtrelere uyan şikayet bulunmuyor.")
+                else:
+                    if search_query:
+                        st.success(f"Toplam {format_search_count(total_complaints)} şikayet bulundu.")
+                        if total_complaints > SEARCH_COUNT_CAP:
+                            st.caption("Çok fazla eşleşme var: sonuçlar en yeniden eskiye sıralandı, "
+                                       "alaka sırası için aramayı daraltın.")
+                        total_complaints = min(total_complaints, SEARCH_COUNT_CAP)
+                    else:
+                        st.success(f"Toplam {total_complaints} şikayet bulundu.")
+                    page_number = len(page_cursors)
+                    page_count = (total_complaints + ADMIN_PAGE_SIZE - 1) // ADMIN_PAGE_SIZE
+                    if search_query:
+                        complaints_page = search_complaints(search_query, filters, offset=page_cursors[-1] or 0)
+                    else:
+                        complaints_page = get_complaints_page(filters, after=page_cursors[-1])
+                    st.caption(f"Sayfa {page_number} / {page_count}")
+
+                    # Sadece bu sayfadaki şikayetler için kart oluştur
+                    for complaint in complaints_page:
                         with st.container():
                             col1, col2 = st.columns([3, 1])
-                            
+
                             with col1:
                                 st.markdown(f"""
                                     <div class="complaint-card">
@@ -954,85 +3634,128 @@ with tab3:
                                         <p><strong>Müşteri:</strong> {complaint[5]}</p>
                                         <p><strong>E-posta:</strong> {complaint[6]}</p>
                                         <p><strong>Telefon:</strong> {complaint[7] or 'Belirtilmemiş'}</p>
-                                        <p><strong>Kategori:</strong> {complaint[2]}</p>
+                                        <p><strong>Kategori:</strong> {display_category(complaint[2])}</p>
                                         <p><strong>Şikayet:</strong> {complaint[1]}</p>
                                         <p><strong>Tarih:</strong> {complaint[4]}</p>
                                         <p><strong>Mevcut Durum:</strong> {complaint[3]}</p>
                                     </div>
                                 """, unsafe_allow_html=True)
-                            
+
                             with col2:
                                 new_status = st.selectbox(
                                     "Durum Güncelle",
-                                    ["İnceleniyor", "Çözümleniyor", "Çözüldü"],
+                                    COMPLAINT_STATUSES,
                                     key=f"select_{complaint[0]}",
-                                    index=["İnceleniyor", "Çözümleniyor", "Çözüldü"].index(complaint[3])
+                                    index=COMPLAINT_STATUSES.index(complaint[3])
                                 )
-                                
+
                                 if st.button("Güncelle", key=f"update_{complaint[0]}"):
                                     update_complaint_status(complaint[0], new_status)
                                     st.success("Durum güncellendi!")
                                     time.sleep(1)
                                     st.rerun()
-        
-        with admin_tab2:
-            st.markdown("### 🤖 Model Bazlı Analiz")
-            
-            # Debug bilgisi göster
-            st.markdown("#### Model Dağılımı")
-            
-            # Tüm şikayetleri modellere göre grupla
-            model_complaints = {
-                'MultinomialNB': [],
-                'SGD Classifier': [],
-                'Logistic Regression': [],
-                'Deep Learning': []  # Deep Learning eklendi
-            }
-            
-            # Her şikayeti uygun modele ekle
-            for complaint in complaints:
-                model = complaint[8] if complaint[8] else "Bilinmeyen"  # model_used 8. indekste
-                if model in model_complaints:
-                    model_complaints[model].append(complaint)
-                elif model == "mb":
-                    model_complaints['MultinomialNB'].append(complaint)
-                elif model == "sgd":
-                    model_complaints['SGD Classifier'].append(complaint)
-                elif model == "lr":
-                    model_complaints['Logistic Regression'].append(complaint)
-                elif model == "dl":  # Deep Learning için yeni kontrol
-                    model_complaints['Deep Learning'].append(complaint)
-            
-            # Model istatistiklerini göster
-            col1, col2, col3, col4 = st.columns(4)  # 4 sütuna çıkarıldı
-            
-            with col1:
-                nb_count = len(model_complaints['MultinomialNB'])
-                st.metric("MultinomialNB", nb_count)
-            with col2:
-                sgd_count = len(model_complaints['SGD Classifier'])
-                st.metric("SGD Classifier", sgd_count)
-            with col3:
-                lr_count = len(model_complaints['Logistic Regression'])
-                st.metric("Logistic Regression", lr_count)
-            with col4:  # Deep Learning için yeni metrik
-                dl_count = len(model_complaints['Deep Learning'])
-                st.metric("Deep Learning", dl_count)
-
-            st.markdown("---")
-            
-            # Her model için ayrı bir bölüm oluştur
-            for model_name, model_complaints_list in model_complaints.items():
-                with st.expander(f"🔹 {model_name} ({len(model_complaints_list)} şikayet)"):
-                    if model_complaints_list:
-                        for complaint in model_complaints_list:
+
+                    # Sayfa gezintisi
+                    prev_col, next_col = st.columns(2)
+                    with prev_col:
+                        if st.button("⬅️ Önceki Sayfa", key="admin_prev_page", disabled=page_number == 1):
+                            page_cursors.pop()
+                            st.rerun()
+                    with next_col:
+                        next_cursor = ((page_cursors[-1] or 0) + ADMIN_PAGE_SIZE if search_query
+                                       else next_page_cursor(complaints_page))
+                        if st.button("Sonraki Sayfa ➡️", key="admin_next_page",
+                                     disabled=page_number >= page_count or not complaints_page or next_cursor is None):
+                            page_cursors.append(next_cursor)
+                            st.rerun()
+
+            with admin_tab2:
+                st.markdown("### 🤖 Model Bazlı Analiz")
+
+                st.markdown("#### Model Dağılımı")
+
+                # Sayımlar SQL'de gruplanır ve kısa süreli önbellekten okunur
+                analytics = get_model_analytics()
+                model_counts = analytics['model_counts']
+
+                # Model istatistiklerini göster
+                metric_columns = st.columns(len(MODEL_DISPLAY_NAMES))
+                for metric_column, model_name in zip(metric_columns, MODEL_DISPLAY_NAMES.values()):
+                    with metric_column:
+                        st.metric(model_name, model_counts.get(model_name, 0))
+
+                if analytics['cascade_stages']:
+                    st.markdown("#### Kademeli Mod: Cevap Veren Aşama")
+                    cascade_df = pd.DataFrame(analytics['cascade_stages'], columns=['Aşama', 'Sayı'])
+                    cascade_df['Oran'] = (cascade_df['Sayı'] / cascade_df['Sayı'].sum()).map('{:.0%}'.format)
+                    st.dataframe(cascade_df, hide_index=True)
+
+                # Her şikayet tüm modellerle bir kez puanlanır; oranlar kayıtlı tahminlerden hesaplanır
+                st.markdown("#### Model Uyumu")
+                agreement = get_model_agreement(current_ensemble_fingerprints())
+                if agreement['stale']:
+                    st.caption(f"{agreement['stale']} şikayetin tahmini eski model dosyalarıyla yapılmış ve "
+                               "oranlara katılmadı. Yeniden puanlamak için: python app.py backfill-ensemble")
+                if agreement['scored']:
+                    agreement_columns = st.columns(2)
+                    agreement_columns[0].metric("Puanlanan şikayet", agreement['scored'])
+                    agreement_columns[1].metric("Tüm modeller aynı", f"{agreement['all_agree']:.0%}")
+                    st.dataframe(pd.DataFrame([
+                        {'Model': MODEL_DISPLAY_NAMES[key],
+                         'Çoğunlukla uyum': f"{rate:.0%}" if rate is not None else "—"}
+                        for key, rate in agreement['with_majority'].items()
+                    ]), hide_index=True)
+                    pairwise_df = pd.DataFrame(index=[MODEL_DISPLAY_NAMES[key] for key in ENSEMBLE_MODELS],
+                                               columns=[MODEL_DISPLAY_NAMES[key] for key in ENSEMBLE_MODELS], dtype=object)
+                    for (first, second), rate in agreement['pairwise'].items():
+                        cell = f"{rate:.0%}" if rate is not None else "—"
+                        pairwise_df.loc[MODEL_DISPLAY_NAMES[first], MODEL_DISPLAY_NAMES[second]] = cell
+                        pairwise_df.loc[MODEL_DISPLAY_NAMES[second], MODEL_DISPLAY_NAMES[first]] = cell
+                    st.markdown("**İkili uyum**")
+                    st.dataframe(pairwise_df.fillna("—"))
+                else:
+                    st.info("Henüz puanlanmış şikayet yok. Mevcut şikayetler için: python app.py backfill-ensemble")
+
+                if analytics['breakdown']:
+                    breakdown_df = pd.DataFrame(analytics['breakdown'], columns=['Model', 'Kategori', 'Durum', 'Sayı'])
+                    breakdown_df['Kategori'] = breakdown_df['Kategori'].map(display_category)
+                    st.markdown("#### Model ve Kategori Dağılımı")
+                    st.bar_chart(breakdown_df.pivot_table(
+                        index='Model', columns='Kategori', values='Sayı', aggfunc='sum', fill_value=0
+                    ))
+                    st.markdown("#### Model ve Durum Dağılımı")
+                    st.dataframe(breakdown_df.pivot_table(
+                        index='Model', columns='Durum', values='Sayı', aggfunc='sum', fill_value=0
+                    ))
+
+                    daily_df = pd.DataFrame(analytics['daily'], columns=['Gün', 'Model', 'Sayı'])
+                    st.markdown("#### Günlük Şikayet Sayısı")
+                    st.line_chart(daily_df.pivot_table(
+                        index='Gün', columns='Model', values='Sayı', aggfunc='sum', fill_value=0
+                    ))
+
+                st.markdown("---")
+
+                # Şikayet kartları sadece bir model seçildiğinde yüklenir
+                st.markdown("#### Şikayet Detayları")
+                drilldown_model = st.selectbox(
+                    "Şikayetlerini görmek istediğiniz model",
+                    ["Seçiniz"] + list(MODEL_DISPLAY_NAMES.values()),
+                    key="analytics_drilldown_model"
+                )
+                if drilldown_model != "Seçiniz":
+                    model_complaints_page = get_complaints_page({'model': drilldown_model})
+                    if model_complaints_page:
+                        st.caption(f"🔹 {drilldown_model}: toplam {model_counts.get(drilldown_model, 0)} şikayetten "
+                                   f"en yeni {len(model_complaints_page)} tanesi")
+                        for complaint in model_complaints_page:
                             st.markdown(f"""
                                 <div class="complaint-card">
                                     <div class="complaint-header">
                                         <h4>Şikayet #{complaint[0]}</h4>
                                         <div class="status-badge">{complaint[3]}</div>
                                     </div>
-                                    <p><strong>Kategori:</strong> {complaint[2]}</p>
+                                    <p><strong>Kategori:</strong> {display_category(complaint[2])}</p>
                                     <p><strong>Şikayet:</strong> {complaint[1]}</p>
                                     <p><strong>Tarih:</strong> {complaint[4]}</p>
                                 </div>
@@ -1041,170 +3764,59 @@ with tab3:
                     else:
                         st.info(f"Bu modele ait şikayet bulunmuyor.")
 
-# Footer
-st.markdown("---")
-st.markdown("""
-    <div style='text-align: center; color: #666;'>
-        <p>©  {year} İBB Şikayet Kategorilendirme Sistemi | Tüm Hakları Saklıdır</p>
-        <p style='font-size: 0.9em;'>Geliştirici: <strong>Kemal Songur</strong></p>
-    </div>
-""".format(year=datetime.now().year), unsafe_allow_html=True)
-
-# Veritabanını sıfırlamak için önce bu fonksiyonu ekleyelim
-def reset_db():
-    # Eğer veritabanı dosyası varsa sil
-    if os.path.exists('complaints.db'):
-        return  # Veritabanı varsa hiçbir şey yapma
-    
-    # Yeni veritabanını oluştur
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    
-    # Kullanıcılar tablosu
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL UNIQUE,
-            phone TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Şikayetler tablosu
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS complaints (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            complaint_number INTEGER NOT NULL,
-            complaint_text TEXT NOT NULL,
-            category TEXT NOT NULL,
-            model_used TEXT NOT NULL,
-            status TEXT DEFAULT 'İnceleniyor',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-# Veritabanını başlat (sıfırlama olmadan)
-init_db()
-
-def update_existing_statuses():
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    c.execute('''
-        UPDATE complaints 
-        SET status = 'İnceleniyor' 
-        WHERE status = 'İşleme Alındı' OR status = 'İnceleme Yapılıyor'
-    ''')
-    conn.commit()
-    conn.close()
-
-# Ana kodun başında çağırın
-update_existing_statuses()
-
-def update_existing_model_names():
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    try:
-        c.execute('''
-            UPDATE complaints 
-            SET model_used = 'MultinomialNB' 
-            WHERE model_used = 'mb' OR model_used IS NULL OR model_used = '';
-            
-            UPDATE complaints 
-            SET model_used = 'SGD Classifier' 
-            WHERE model_used = 'sgd';
-            
-            UPDATE complaints 
-            SET model_used = 'Logistic Regression' 
-            WHERE model_used = 'lr';
-        ''')
-        conn.commit()
-    except Exception as e:
-        print(f"Model güncelleme hatası: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
-
-# Ana kodun başında çağır
-update_existing_model_names()
-
-# Mevcut kayıtları güncellemek için yeni fonksiyon
-def update_model_names():
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    try:
-        # Önce mevcut model isimlerini kontrol et
-        c.execute('SELECT DISTINCT model_used FROM complaints')
-        current_models = c.fetchall()
-        print("Mevcut model isimleri:", current_models)  # Debug için
-        
-        # Model isimlerini güncelle
-        c.execute('''
-            UPDATE complaints 
-            SET model_used = 'MultinomialNB' 
-            WHERE model_used = 'mb' OR model_used = '';
-        ''')
-        c.execute('''
-            UPDATE complaints 
-            SET model_used = 'SGD Classifier' 
-            WHERE model_used = 'sgd';
-        ''')
-        c.execute('''
-            UPDATE complaints 
-            SET model_used = 'Logistic Regression' 
-            WHERE model_used = 'lr';
-        ''')
-        c.execute('''
-            UPDATE complaints 
-            SET model_used = 'Deep Learning' 
-            WHERE model_used = 'dl';
-        ''')
-        conn.commit()
-        
-        # Güncelleme sonrası kontrol
-        c.execute('SELECT DISTINCT model_used FROM complaints')
-        updated_models = c.fetchall()
-        print("Güncellenmiş model isimleri:", updated_models)  # Debug için
-        
-    except Exception as e:
-        print(f"Model güncelleme hatası: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
+                # Model yükleme maliyetleri (süreç başına bir kez ölçülür)
+                with st.expander("⚙️ Model Yükleme Maliyetleri"):
+                    model_load_stats = model_registry.stats()
+                    if model_load_stats:
+                        st.table(model_load_stats)
+                    else:
+                        st.info("Bu süreçte henüz model yüklenmedi.")
+                    st.markdown("**Kök bulma önbelleği**")
+                    st.table([get_stem_cache().stats()])
+                    st.markdown("**Tahmin önbelleği**")
+                    st.table([get_prediction_cache().stats()])
+                    st.markdown("**Arka plan sınıflandırma**")
+                    st.table([get_classification_worker(DB_PATH).stats()])
+                    st.markdown("**Deep Learning dinamik gruplama**")
+                    st.table([get_dl_batcher().stats()])
+
+            with admin_tab3:
+                st.markdown("### ⏱️ Performans")
+                st.caption("Bu süreç başladığından beri ölçülen süreler (ms). "
+                           "Yüzdelikler histogram kovalarından tahmin edilir.")
+                metric_rows = metrics.rows()
+                if metric_rows:
+                    metric_sections = [
+                        ("Sınıflandırma aşamaları", 'classification_stage_seconds'),
+                        ("Metin temizleme", 'text_normalizer_seconds'),
+                        ("Veritabanı sorguları", 'db_query_seconds'),
+                        ("Yazma kilidi bekleme", 'db_lock_wait_seconds'),
+                    ]
+                    for section_title, metric_name in metric_sections:
+                        section_rows = [row for row in metric_rows if row['metrik'] == metric_name]
+                        if section_rows:
+                            st.markdown(f"#### {section_title}")
+                            st.dataframe(pd.DataFrame(section_rows).drop(columns='metrik'), hide_index=True)
+                else:
+                    st.info("Henüz ölçüm yok.")
+                if METRICS_PORT and start_metrics_server(METRICS_HOST, METRICS_PORT) is not None:
+                    st.caption(f"Prometheus: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
+    # Footer
+    st.markdown("---")
+    st.markdown("""
+        <div style='text-align: center; color: #666;'>
+            <p>©  {year} İBB Şikayet Kategorilendirme Sistemi | Tüm Hakları Saklıdır</p>
+            <p style='font-size: 0.9em;'>Geliştirici: <strong>Kemal Songur</strong></p>
+        </div>
+    """.format(year=datetime.now().year), unsafe_allow_html=True)
 
-# Debug fonksiyonu
-def debug_complaints():
-    conn = sqlite3.connect('complaints.db')
-    c = conn.cursor()
-    try:
-        c.execute('''
-            SELECT complaint_number, model_used, category, status
-            FROM complaints
-            ORDER BY created_at DESC
-            LIMIT 10
-        ''')
-        complaints = c.fetchall()
-        print("\nSon 10 şikayet:")
-        for complaint in complaints:
-            print(f"Şikayet #{complaint[0]}: Model={complaint[1]}, Kategori={complaint[2]}, Durum={complaint[3]}")
-            
-        c.execute('SELECT COUNT(*), model_used FROM complaints GROUP BY model_used')
-        counts = c.fetchall()
-        print("\nModel bazlı şikayet sayıları:")
-        for count in counts:
-            print(f"{count[1]}: {count[0]} şikayet")
-            
-    except Exception as e:
-        print(f"Debug hatası: {e}")
-    finally:
-        conn.close()
+# Arayüz sadece betik olarak çalıştırıldığında çizilir; testler ve ölçüm betiği modülü import eder
+if __name__ == "__main__":
+    main()
 
 # Ana kodun sonuna ekle
-if __name__ == "__main__":
+# (streamlit run de __main__ olarak çalıştırır; bakım çıktıları her etkileşimde tekrarlanmasın)
+if __name__ == "__main__" and not st.runtime.exists():
     update_model_names()  # Mevcut kayıtları güncelle
     debug_complaints()    # Debug bilgilerini göster
@@ -0,0 +1,1044 @@
+"""İBB Şikayet Kategorilendirme Sistemi ölçüm betiği
+
+Kullanım: python benchmarks.py <ölçüm> [seçenekler]
+
+app.py'yi modül olarak yükler (arayüz çizilmez); modeller ve veritabanı
+uygulamanın kendi giriş noktalarıyla ölçülür. Yazma yapan ölçümler
+temporary_database() ile geçici bir veritabanında çalışır.
+"""
+import argparse
+import gc
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import sklearn
+
+import app
+from app import (
+    ADMIN_PAGE_SIZE, BATCH_CHUNK_SIZE, BENCHMARK_TEXTS, CASCADE_MIN_MARGIN, CASCADE_MIN_PROBABILITY,
+    CASCADE_STAGES, CATEGORY_LABELS, COMPLAINT_STATUSES, CompactVectorizer, DL_BATCH_MAX_SIZE,
+    DL_BATCH_MAX_WAIT, Database, DynamicBatcher, LinearScorer, METRICS_HOST, MODEL_DISPLAY_NAMES, MODEL_FILES,
+    MetricsRegistry, NORMALIZER_GOLDEN_TEXTS, PUNCTUATION_PATTERN, SCORER_FILES, STARTUP_PROBE_TEXT,
+    STEM_CACHE_SIZE, StemCache, VOCABULARY_FILE, allocate_complaint_number, bootstrap_database,
+    cached_user_complaints, cascade_predict, clean_text, clean_text_reference, complaint_search_available,
+    complaint_search_text, count_search_results, debug_complaints, ensemble_models, ensemble_predict,
+    find_label, find_labels, format_search_count, get_db, get_prediction_cache, get_user_complaints,
+    index_complaint_search, init_db, load_sklearn_model, migrate_model_names, migrate_status_names,
+    model_path, model_registry, porter, predict_dl_batch, predict_dl_dense, predict_vectors, same_csr,
+    save_complaint, scorer_test_corpus, scorer_test_texts, search_complaints, sparse_dl_model, stack_csr_rows,
+    start_metrics_server, temporary_database, update_model_names, verify_scorer,
+)
+
+def probe_startup(args):
+    """Tek bir sınıflandırma için gereken yükleme maliyetini ölç (alt süreçte çalışır)"""
+    start = time.perf_counter()
+    category = find_label(STARTUP_PROBE_TEXT, args.model)
+    first_prediction_seconds = time.perf_counter() - start
+
+    # ru_maxrss Linux'ta KB, macOS'ta byte cinsindendir
+    import resource
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        max_rss //= 1024
+
+    print(json.dumps({
+        'model': args.model,
+        'kategori': category,
+        'ilk_tahmin_ms': round(first_prediction_seconds * 1000, 1),
+        'max_rss_mb': round(max_rss / 1024, 1),
+        'tensorflow_yuklu': 'tensorflow' in sys.modules,
+    }, ensure_ascii=False))
+    return 0
+
+def benchmark_startup(args):
+    """Her model için soğuk başlangıç süresini ayrı süreçlerde ölç"""
+    results = []
+    for model in args.models:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), 'startup-probe', '--model', model],
+                capture_output=True, text=True
+            )
+            wall_seconds = time.perf_counter() - start
+            if completed.returncode != 0:
+                print(f"Başlangıç ölçümü başarısız ({model}):\n{completed.stderr}")
+                return 1
+            # Modülün kendi çıktıları arasından son JSON satırını al
+            probe = json.loads(completed.stdout.strip().splitlines()[-1])
+            probe['soguk_baslangic_ms'] = round(wall_seconds * 1000, 1)
+            results.append(probe)
+
+    print(f"{'model':<6} {'soğuk başlangıç':>16} {'ilk tahmin':>12} {'max RSS':>10}  tensorflow")
+    for model in args.models:
+        runs = [r for r in results if r['model'] == model]
+        cold = sorted(r['soguk_baslangic_ms'] for r in runs)[len(runs) // 2]
+        first = sorted(r['ilk_tahmin_ms'] for r in runs)[len(runs) // 2]
+        rss = max(r['max_rss_mb'] for r in runs)
+        print(f"{model:<6} {cold:>13.1f} ms {first:>9.1f} ms {rss:>7.1f} MB  {runs[0]['tensorflow_yuklu']}")
+    return 0
+
+def benchmark_normalizer(args):
+    """TextNormalizer'ı eski regex zinciriyle karşılaştır: çıktı eşitliği ve terim/sn"""
+    import random
+
+    # Altın örnekler + rastgele zor girdiler ile çıktı eşitliğini doğrula
+    rng = random.Random(args.seed)
+    alphabet = "abcçdefgğhıijklmnoöprsştuüvyzİIŞĞÜÖÇ0123456789 .,;:@-_/()+$₺\t\n!?'\"%&=#"
+    samples = list(NORMALIZER_GOLDEN_TEXTS)
+    samples += [
+        ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 120)))
+        for _ in range(args.fuzz)
+    ]
+    mismatches = [text for text in samples if clean_text(text) != clean_text_reference(text)]
+    if mismatches:
+        print(f"{len(mismatches)} örnekte çıktı farklı, ilk örnek: {mismatches[0]!r}")
+        return 1
+    print(f"{len(samples)} örnekte çıktılar birebir aynı")
+
+    texts = NORMALIZER_GOLDEN_TEXTS * args.repeat
+    token_count = sum(len(clean_text(text).split()) for text in texts)
+    for label, func in [("eski regex zinciri", clean_text_reference), ("TextNormalizer", clean_text)]:
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<20} {token_count / elapsed:12.0f} terim/sn")
+    return 0
+
+def benchmark_stem_cache(args):
+    """Zipf dağılımlı şikayet kelimeleri üzerinde önbellekli/önbelleksiz kök bulma hızı"""
+    import random
+
+    rng = random.Random(args.seed)
+    # Gerçekçi kelime havuzu: örnek şikayetlerin kelimeleri + vectorizer sözlüğü
+    words = []
+    for text in NORMALIZER_GOLDEN_TEXTS:
+        for word in PUNCTUATION_PATTERN.sub(' ', text).lower().split():
+            if word not in words:
+                words.append(word)
+    words += [term for term in model_registry.get('vectorizer').vocabulary_ if term not in words]
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(len(words))]
+    tokens = rng.choices(words, weights=weights, k=args.tokens)
+
+    def measure(label, stem):
+        start = time.perf_counter()
+        for token in tokens:
+            stem(token)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<24} {len(tokens) / elapsed:12.0f} terim/sn")
+
+    measure("önbelleksiz", porter.stem)
+    cold_cache = StemCache(porter, maxsize=args.maxsize)
+    measure("soğuk önbellek", cold_cache.stem)
+    print(f"  {cold_cache.stats()}")
+    warm_cache = StemCache(porter, maxsize=args.maxsize)
+    warm_cache.prewarm(model_registry.get('vectorizer').vocabulary_)
+    measure("ön ısıtılmış önbellek", warm_cache.stem)
+    print(f"  {warm_cache.stats()}")
+    return 0
+
+def benchmark_batch(args):
+    """find_label döngüsü ile find_labels'ı aynı metinler üzerinde karşılaştır"""
+    # Her metne sözlükten farklı bir kelime eklenir ki find_label tahmin önbelleğine düşmesin
+    vocabulary = sorted(model_registry.get('vectorizer').vocabulary_)
+    texts = [
+        f"{BENCHMARK_TEXTS[i % len(BENCHMARK_TEXTS)]} {vocabulary[i % len(vocabulary)]}"
+        for i in range(args.size)
+    ]
+    # Modelleri önceden yükle ki ölçüme yükleme süresi karışmasın
+    find_labels(texts[:1], args.model)
+
+    start = time.perf_counter()
+    single = [find_label(text, args.model) for text in texts]
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = find_labels(texts, args.model, chunk_size=args.chunk_size)
+    batch_seconds = time.perf_counter() - start
+
+    if single != batch:
+        print("Uyarı: toplu ve tekil sonuçlar farklı!")
+        return 1
+    print(f"{args.size} metin, model={args.model}")
+    print(f"find_label döngüsü: {single_seconds * 1e6 / args.size:9.1f} µs/metin")
+    print(f"find_labels:        {batch_seconds * 1e6 / args.size:9.1f} µs/metin "
+          f"({single_seconds / batch_seconds:.1f}x)")
+    return 0
+
+class UnpooledDatabase(Database):
+    """Eski erişim şekli: her çağrıda yeni bağlantı, varsayılan journal modu (sadece ölçüm için)"""
+
+    @contextmanager
+    def connection(self):
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+def _run_db_workload(db, writers, readers, seconds):
+    """writers thread'i şikayet kaydeder, readers thread'i sorgular; saniyedeki işlem sayısını döndür"""
+    stop_at = time.perf_counter() + seconds
+    counts = {'yazma': 0, 'okuma': 0, 'hata': 0}
+    counts_lock = threading.Lock()
+
+    def writer(worker_id):
+        i = 0
+        while time.perf_counter() < stop_at:
+            email = f"kullanici{worker_id}_{i % 50}@example.com"
+            try:
+                with db.transaction() as c:
+                    c.execute('INSERT OR IGNORE INTO users (name, email, phone) VALUES (?, ?, ?)',
+                              ('Test Kullanıcı', email, None))
+                    c.execute('SELECT id FROM users WHERE email = ?', (email,))
+                    user_id = c.fetchone()[0]
+                    c.execute('''
+                        INSERT INTO complaints
+                        (user_id, complaint_number, complaint_text, category, model_used, status, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (user_id, allocate_complaint_number(c), BENCHMARK_TEXTS[i % len(BENCHMARK_TEXTS)],
+                          CATEGORY_LABELS[i % len(CATEGORY_LABELS)], 'MultinomialNB', 'İnceleniyor',
+                          datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                key = 'yazma'
+            except sqlite3.OperationalError:
+                key = 'hata'
+            with counts_lock:
+                counts[key] += 1
+            i += 1
+
+    def reader(worker_id):
+        i = 0
+        while time.perf_counter() < stop_at:
+            email = f"kullanici{i % max(writers, 1)}_{i % 50}@example.com"
+            try:
+                with db.connection() as conn:
+                    conn.execute('''
+                        SELECT c.complaint_number, c.complaint_text, c.category,
+                               c.status, c.created_at, u.name, u.email, c.model_used
+                        FROM complaints c
+                        JOIN users u ON c.user_id = u.id
+                        WHERE u.email = ?
+                        ORDER BY c.created_at DESC
+                    ''', (email,)).fetchall()
+                key = 'okuma'
+            except sqlite3.OperationalError:
+                key = 'hata'
+            with counts_lock:
+                counts[key] += 1
+            i += 1
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {key: value / seconds for key, value in counts.items()}
+
+def benchmark_db(args):
+    """Eski bağlantı-başına-çağrı erişimi ile WAL bağlantı havuzunu eşzamanlı yük altında karşılaştır"""
+    print(f"{args.writers} yazıcı, {args.readers} okuyucu, {args.seconds} sn")
+    with temporary_database() as pooled_db:
+        # Eski davranış için ayrı dosya: WAL kalıcı olduğu için rollback journal'a geri alınır
+        legacy_db = UnpooledDatabase(pooled_db.path + '.legacy')
+        with sqlite3.connect(legacy_db.path) as conn:
+            conn.execute('PRAGMA journal_mode=DELETE')
+        with get_db().connection() as conn:
+            schema = [row[0] for row in conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
+                "AND name NOT LIKE 'complaints_fts%'"
+            )]
+        with legacy_db.transaction() as c:
+            for statement in schema:
+                c.execute(statement)
+            c.execute('INSERT INTO complaint_number_sequence (id, next_value) VALUES (1, 0)')
+
+        for label, db in [("bağlantı başına çağrı", legacy_db), ("WAL bağlantı havuzu", pooled_db)]:
+            rates = _run_db_workload(db, args.writers, args.readers, args.seconds)
+            print(f"{label:<22} {rates['yazma']:8.0f} kayıt/sn {rates['okuma']:8.0f} sorgu/sn "
+                  f"{rates['hata']:6.1f} hata/sn")
+    return 0
+
+def benchmark_rerun(args):
+    """Bir Streamlit yeniden çalıştırmasında harcanan veritabanı süresi: eski akış ve yeni akış"""
+    import io
+    from contextlib import redirect_stdout
+
+    with temporary_database() as db:
+        with db.transaction() as c:
+            c.execute("INSERT INTO users (name, email) VALUES ('Test Kullanıcı', 'test@example.com')")
+            c.executemany('''
+                INSERT INTO complaints (user_id, complaint_number, complaint_text, category, model_used, status, created_at)
+                VALUES (1, ?, ?, ?, ?, ?, ?)
+            ''', (
+                (100000 + i, BENCHMARK_TEXTS[i % len(BENCHMARK_TEXTS)], CATEGORY_LABELS[i % len(CATEGORY_LABELS)],
+                 MODEL_DISPLAY_NAMES[('mb', 'sgd', 'lr', 'dl')[i % 4]], 'İnceleniyor', '2024-01-01 12:00:00')
+                for i in range(args.rows)
+            ))
+
+        def legacy_rerun():
+            # Eskiden her yeniden çalıştırmada modül seviyesinde yapılanlar
+            init_db()
+            with db.transaction() as c:
+                migrate_status_names(c)
+            with db.transaction() as c:
+                migrate_model_names(c)
+            init_db()
+            with redirect_stdout(io.StringIO()):
+                update_model_names()
+                debug_complaints()
+
+        def current_rerun():
+            bootstrap_database(app.DB_PATH)
+
+        print(f"{args.rows} şikayetlik tabloda, {args.repeat} yeniden çalıştırma ortalaması:")
+        for label, rerun in [("eski akış", legacy_rerun), ("yeni akış", current_rerun)]:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                rerun()
+            elapsed = (time.perf_counter() - start) / args.repeat
+            print(f"{label:<10} {elapsed * 1000:10.3f} ms/yeniden çalıştırma")
+    return 0
+
+def benchmark_user_lookup(args):
+    """1 ve 1000 şikayeti olan kullanıcılar için e-posta ile şikayet sorgulama süresi"""
+    with temporary_database() as db:
+        with db.transaction() as c:
+            c.executemany('INSERT INTO users (name, email) VALUES (?, ?)',
+                          (('Test Kullanıcı', f"kullanici{i}@example.com") for i in range(args.users)))
+            c.execute("INSERT INTO users (name, email) VALUES ('Tek Şikayet', 'tek@example.com')")
+            single_id = c.lastrowid
+            c.execute("INSERT INTO users (name, email) VALUES ('Çok Şikayet', 'cok@example.com')")
+            heavy_id = c.lastrowid
+            rows = [(1 + i % args.users, i) for i in range(args.rows)]
+            rows += [(single_id, args.rows)] + [(heavy_id, args.rows + 1 + i) for i in range(1000)]
+            c.executemany('''
+                INSERT INTO complaints (user_id, complaint_number, complaint_text, category, model_used, status, created_at)
+                VALUES (?, ?, ?, 'İlgisiz', 'MultinomialNB', 'İnceleniyor', ?)
+            ''', ((user_id, 100000 + n, BENCHMARK_TEXTS[n % len(BENCHMARK_TEXTS)],
+                   f"2024-01-{1 + n % 28:02d} {n % 24:02d}:00:00") for user_id, n in rows))
+
+        def legacy_lookup(email):
+            # Eski akış: önce kullanıcı, sonra e-posta üzerinden ikinci bir JOIN sorgusu
+            with get_db().connection() as conn:
+                if not conn.execute('SELECT id FROM users WHERE email = ?', (email,)).fetchone():
+                    return []
+                return conn.execute('''
+                    SELECT c.complaint_number, c.complaint_text, c.category,
+                           c.status, c.created_at, u.name, u.email, c.model_used
+                    FROM complaints c
+                    JOIN users u ON c.user_id = u.id
+                    WHERE u.email = ?
+                    ORDER BY c.created_at DESC
+                ''', (email,)).fetchall()
+
+        session_cache = {}
+        lookups = [
+            ("eski iki sorgu", legacy_lookup),
+            ("tek sorgu", get_user_complaints),
+            ("oturum önbelleği", lambda email: cached_user_complaints(session_cache, email)),
+        ]
+        print(f"{args.rows} dolgu şikayeti, {args.repeat} sorgu ortalaması:")
+        for email, label in [('tek@example.com', '1 şikayet'), ('cok@example.com', '1000 şikayet')]:
+            for name, lookup in lookups:
+                count = len(lookup(email))
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    lookup(email)
+                elapsed = (time.perf_counter() - start) / args.repeat
+                print(f"{label:<13} {name:<17} {count:5d} satır {elapsed * 1000:9.3f} ms")
+    return 0
+
+def benchmark_search(args):
+    """FTS5 içerik araması ile LIKE taramasını büyük bir şikayet tablosunda karşılaştır"""
+    import random
+
+    rng = random.Random(args.seed)
+    vocabulary = sorted(model_registry.get('vectorizer').vocabulary_)
+    with temporary_database() as db:
+        with db.connection() as conn:
+            available = complaint_search_available(conn)
+        if not available:
+            print("FTS5 kullanılamıyor, ölçüm yapılamadı")
+            return 1
+        texts = [f"{BENCHMARK_TEXTS[i % len(BENCHMARK_TEXTS)]} {rng.choice(vocabulary)} {rng.choice(vocabulary)}"
+                 for i in range(args.rows)]
+        # save_complaint gibi: dizin metni kilit dışında hazırlanır, satırlar tek transaction'da yazılır
+        start = time.perf_counter()
+        search_rows = [(i + 1, complaint_search_text(text)) for i, text in enumerate(texts)]
+        cleaned_at = time.perf_counter()
+        with db.transaction() as c:
+            c.execute("INSERT INTO users (name, email) VALUES ('Test Kullanıcı', 'test@example.com')")
+            c.executemany('''
+                INSERT INTO complaints (id, user_id, complaint_number, complaint_text, category, model_used, status, created_at)
+                VALUES (?, 1, ?, ?, ?, 'MultinomialNB', ?, ?)
+            ''', ((i + 1, 100000 + i, text, CATEGORY_LABELS[i % len(CATEGORY_LABELS)],
+                   COMPLAINT_STATUSES[i % len(COMPLAINT_STATUSES)], f"2024-01-{1 + i % 28:02d} {i % 24:02d}:00:00")
+                  for i, text in enumerate(texts)))
+            index_complaint_search(c, search_rows)
+        written_at = time.perf_counter()
+        print(f"{args.rows} şikayet: metin temizleme {cleaned_at - start:.1f} s (kilit dışında), "
+              f"ekleme ve dizinleme {written_at - cleaned_at:.2f} s ({args.rows / (written_at - cleaned_at):.0f} satır/s)")
+
+        # Admin panelinin varsayılanı (tüm durumlar) ve bir kategori seçilmiş hali
+        default_filters = {'statuses': COMPLAINT_STATUSES}
+        category_filters = {'statuses': COMPLAINT_STATUSES, 'category': CATEGORY_LABELS[2]}
+        queries = ["fatura", "su kesintisi", "otobüs durakta bekliyoruz", vocabulary[len(vocabulary) // 2]]
+        print(f"{'arama':<28} {'sonuç':>6} {'sayfa':>9} {'sayım':>9} {'kategori':>9} {'sayfa':>9} {'sayım':>9} "
+              f"{'LIKE sayfa':>11}")
+        for query in queries:
+            timings = []
+            for run in (lambda: search_complaints(query, default_filters),
+                        lambda: count_search_results(query, default_filters),
+                        lambda: search_complaints(query, category_filters),
+                        lambda: count_search_results(query, category_filters),
+                        lambda: _like_search_page(query)):
+                run()
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    run()
+                timings.append((time.perf_counter() - start) / args.repeat * 1000)
+            print(f"{query:<28} {format_search_count(count_search_results(query, default_filters)):>6} "
+                  f"{timings[0]:7.2f}ms {timings[1]:7.2f}ms "
+                  f"{format_search_count(count_search_results(query, category_filters)):>9} "
+                  f"{timings[2]:7.2f}ms {timings[3]:7.2f}ms {timings[4]:9.2f}ms")
+    return 0
+
+def _like_search_page(query):
+    # Karşılaştırma için FTS5 olmadan yapılacak arama: metin üzerinde LIKE taraması
+    words = query.split()
+    with get_db().connection() as conn:
+        return conn.execute(f'''
+            SELECT c.complaint_number FROM complaints c
+            WHERE {' AND '.join('c.complaint_text LIKE ?' for _ in words)}
+            ORDER BY c.created_at DESC, c.id DESC
+            LIMIT ?
+        ''', [f'%{word}%' for word in words] + [ADMIN_PAGE_SIZE]).fetchall()
+
+def benchmark_dl_batcher(args):
+    """Deep Learning modeli: istek başına predict ile dinamik gruplamayı eşzamanlılık altında karşılaştır"""
+    dl_model = model_registry.get('dl')
+    if dl_model is None:
+        print("Deep Learning modeli yüklenemedi, ölçüm yapılamadı")
+        return 1
+    count_vectorizer = model_registry.get('vectorizer')
+    rows = count_vectorizer.transform([clean_text(text) for text in BENCHMARK_TEXTS])
+    batcher = DynamicBatcher(predict_dl_batch, max_batch_size=args.max_batch_size, max_wait=args.max_wait_ms / 1000,
+                             stack=stack_csr_rows)
+    # İlk çağrılardaki graf izleme maliyeti ölçüme karışmasın
+    dl_model.predict(rows[:1].toarray(), verbose=0)
+    batcher.predict(rows[:1])
+
+    modes = [
+        ("istek başına predict", lambda row: dl_model.predict(row.toarray(), verbose=0)),
+        ("dinamik gruplama", batcher.predict),
+    ]
+    print(f"grup en fazla {args.max_batch_size} satır, en fazla {args.max_wait_ms} ms bekleme, "
+          f"thread başına {args.requests} istek")
+    print(f"{'eşzamanlılık':>12} {'yöntem':<22} {'p50 ms':>8} {'p99 ms':>8} {'istek/s':>9}")
+    for concurrency in args.concurrency:
+        for name, predict in modes:
+            latencies = []
+            latencies_lock = threading.Lock()
+
+            def client(worker_id):
+                own = []
+                for i in range(args.requests):
+                    row = rows[(worker_id + i) % rows.shape[0]]
+                    start = time.perf_counter()
+                    predict(row)
+                    own.append(time.perf_counter() - start)
+                with latencies_lock:
+                    latencies.extend(own)
+
+            threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            print(f"{concurrency:>12} {name:<22} {p50:8.2f} {p99:8.2f} {len(latencies) / elapsed:9.0f}")
+    print(f"gruplayıcı: {batcher.stats()}")
+    return 0
+
+def benchmark_dl_sparse(args):
+    """DL modeli: yoğun (toarray) ve seyrek girdi yollarını çıktı, süre ve bellek açısından karşılaştır"""
+    if model_registry.get('dl') is None:
+        print("Deep Learning modeli yüklenemedi, ölçüm yapılamadı")
+        return 1
+    sparse_model = sparse_dl_model()
+    if sparse_model is None:
+        print("Model seyrek yola uygun değil (sıralı olmalı ve girdisi doğrudan bir Dense katmanına gitmeli)")
+        return 1
+    vocabulary = sorted(model_registry.get('vectorizer').vocabulary_)
+    texts = [
+        f"{BENCHMARK_TEXTS[i % len(BENCHMARK_TEXTS)]} {vocabulary[i % len(vocabulary)]}"
+        for i in range(args.batch_size)
+    ]
+    text_vectors = model_registry.get('vectorizer').transform([clean_text(text) for text in texts])
+
+    dense_outputs = predict_dl_dense(text_vectors)
+    sparse_outputs = sparse_model.predict(text_vectors)
+    label_binarizer = model_registry.get('label_binarizer')
+    same_labels = np.array_equal(label_binarizer.inverse_transform(dense_outputs > 0.5),
+                                 label_binarizer.inverse_transform(sparse_outputs > 0.5))
+    print(f"en büyük çıktı farkı {np.abs(dense_outputs - sparse_outputs).max():.2e}, "
+          f"etiketler {'aynı' if same_labels else 'FARKLI'}")
+
+    print(f"{'satır':>6} {'yol':<7} {'süre ms':>9} {'numpy tepe bellek KB':>21}")
+    for size in (1, args.batch_size):
+        batch = text_vectors[:size]
+        for name, predict in [("yoğun", predict_dl_dense), ("seyrek", sparse_model.predict)]:
+            predict(batch)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                predict(batch)
+            elapsed = (time.perf_counter() - start) / args.repeat
+            tracemalloc.start()
+            predict(batch)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{size:>6} {name:<7} {elapsed * 1000:9.3f} {peak / 1024:21.1f}")
+    return 0 if same_labels else 1
+
+def benchmark_scorers(args):
+    """Pickle'daki sklearn modelleri ile NumPy puanlayıcılarını yükleme ve tahmin süresinde karşılaştır"""
+    text_vectors = scorer_test_corpus(args.batch_size)
+    print(f"{'model':<5} {'biçim':<7} {'dosya KB':>9} {'yükleme ms':>11} {'1 satır µs':>11} "
+          f"{f'{args.batch_size} satır ms':>13}")
+    failures = 0
+    for key, scorer_file in SCORER_FILES.items():
+        scorer_path = os.path.join(model_path, scorer_file)
+        if not os.path.exists(scorer_path):
+            print(f"{key:<5} {scorer_file} yok, önce 'python app.py export-scorers' çalıştırın")
+            failures += 1
+            continue
+        pickle_path = os.path.join(model_path, MODEL_FILES[key])
+        loaders = [
+            ("pickle", pickle_path, lambda: load_sklearn_model(key)[0]),
+            ("npz", scorer_path, lambda: LinearScorer.load(scorer_path)),
+        ]
+        models = {}
+        for name, file_path, load in loaders:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                models[name] = load()
+            load_ms = (time.perf_counter() - start) / args.repeat * 1000
+            model = models[name]
+            single = text_vectors[:1]
+            start = time.perf_counter()
+            for _ in range(args.repeat * 10):
+                model.predict(single)
+            single_us = (time.perf_counter() - start) / (args.repeat * 10) * 1e6
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                model.predict(text_vectors)
+            batch_ms = (time.perf_counter() - start) / args.repeat * 1000
+            print(f"{key:<5} {name:<7} {os.path.getsize(file_path) / 1024:9.0f} {load_ms:11.2f} "
+                  f"{single_us:11.1f} {batch_ms:13.2f}")
+        mismatches, _ = verify_scorer(models['pickle'], models['npz'], text_vectors)
+        if mismatches or models['npz'].source_sha256 != load_sklearn_model(key)[1]:
+            print(f"✗ {key}: puanlayıcı pickle ile uyuşmuyor ({mismatches} farklı etiket)")
+            failures += 1
+    return 1 if failures else 0
+
+def benchmark_vectorizer(args):
+    """sklearn CountVectorizer ile sıkıştırılmış sözlüğü bellek ve belge başına süre olarak karşılaştır"""
+    vocabulary_path = os.path.join(model_path, VOCABULARY_FILE)
+    if not os.path.exists(vocabulary_path):
+        print(f"{VOCABULARY_FILE} yok, önce 'python app.py export-vocabulary' çalıştırın")
+        return 1
+    texts = scorer_test_texts(args.batch_size)
+    loaders = [
+        ("sklearn", os.path.join(model_path, MODEL_FILES['vectorizer']), lambda: load_sklearn_model('vectorizer')[0]),
+        ("compact", vocabulary_path, lambda: CompactVectorizer.load(vocabulary_path)),
+    ]
+    print(f"{'biçim':<8} {'dosya KB':>9} {'bellek KB':>10} {'yükleme ms':>11} {'1 belge µs':>11} "
+          f"{f'{len(texts)} belge ms':>14}")
+    vectorizers = {}
+    for name, file_path, load in loaders:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        vectorizer = load()
+        load_ms = (time.perf_counter() - start) * 1000
+        resident = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        vectorizers[name] = vectorizer
+        start = time.perf_counter()
+        for i in range(args.repeat * 100):
+            vectorizer.transform([texts[i % len(texts)]])
+        single_us = (time.perf_counter() - start) / (args.repeat * 100) * 1e6
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            vectorizer.transform(texts)
+        batch_ms = (time.perf_counter() - start) / args.repeat * 1000
+        print(f"{name:<8} {os.path.getsize(file_path) / 1024:9.0f} {resident / 1024:10.0f} {load_ms:11.2f} "
+              f"{single_us:11.1f} {batch_ms:14.2f}")
+    if not same_csr(vectorizers['sklearn'].transform(texts), vectorizers['compact'].transform(texts)):
+        print("✗ sıkıştırılmış sözlük sklearn ile aynı matrisi üretmiyor")
+        return 1
+    return 0
+
+# Uçtan uca ölçüm için sentetik şikayet kalıpları (kategori indeksi -> cümleler).
+# {tutar}, {telefon}, {eposta}, {url}, {sure}, {yer} alanları üretim sırasında doldurulur.
+SYNTHETIC_COMPLAINT_SENTENCES = {
+    0: [
+        "Doğalgaz faturam bu ay {tutar} geldi, sayaç okuması yanlış yapılmış olmalı.",
+        "{yer} bölgesinde {sure} saattir doğalgaz kesintisi var, evde ısınamıyoruz.",
+        "Kombi bağlantısı için randevu aldım ama İgdaş ekibi gelmedi.",
+        "Apartmanda gaz kokusu var, acil hattı {telefon} aradım kimse açmadı.",
+        "Doğalgaz aboneliğimi kapattırdım ama hâlâ {tutar} fatura kesiliyor.",
+        "Sayaç değişiminden sonra gaz tüketimim iki katına çıktı.",
+    ],
+    1: [
+        "{yer} durağında otobüs {sure} dakikadır gelmiyor, seferler aksıyor.",
+        "Metrobüs sabah saatlerinde çok kalabalık, sefer sayısı artırılmalı.",
+        "Şoför durakta durmadan geçip gitti, hat numarası 34 olan otobüs.",
+        "İstanbulkart'ımdan iki kez {tutar} kesildi, iade istiyorum.",
+        "Otobüsün kliması çalışmıyor, yolcular sıcaktan bunaldı.",
+        "Gece seferleri {yer} hattında iptal edilmiş, duyuru yapılmadı.",
+    ],
+    2: [
+        "Mahallemizde {sure} saattir su kesintisi var ve açıklama yapılmadı.",
+        "Su faturama {tutar} yansıtılmış, sayaç arızalı olabilir.",
+        "{yer} caddesinde ana boru patladı, sokak su altında kaldı.",
+        "Musluktan gelen su bulanık ve kötü kokuyor.",
+        "İski'ye {telefon} numarasından ulaşamıyorum, arıza kaydı açılmadı.",
+        "Kanalizasyon taştı, evin önü pis su doldu.",
+    ],
+    3: [
+        "Parktaki çöpler günlerdir toplanmıyor, belediye ilgilenmiyor.",
+        "{yer} sahilindeki aydınlatmalar yanmıyor, akşamları çok karanlık.",
+        "İsbak sinyalizasyonu arızalı, kavşakta trafik kilitleniyor.",
+        "Otoparkta {tutar} ücret alındı ama fiş verilmedi.",
+        "Kaldırımdaki çukur {sure} gündür kapatılmadı, yaşlılar düşüyor.",
+        "Sokak hayvanları için yapılan başvuruma dönüş olmadı.",
+    ],
+    4: [
+        "Bu hafta sonu maç ne zaman başlıyor?",
+        "En iyi kahveyi hangi kafe yapıyor, önerisi olan var mı?",
+        "Yeni çıkan telefonun fiyatı {tutar}, almaya değer mi?",
+        "Yarın hava yağmurlu olacak mı?",
+        "Dizinin yeni bölümü {sure} dakika sürmüş, çok beğendim.",
+        "Tatil için {yer} tarafında otel önerisi arıyorum.",
+    ],
+}
+
+# Uzun metinleri kategori bilgisi taşımayan laf kalabalığıyla uzatan cümleler
+SYNTHETIC_FILLER_SENTENCES = [
+    "Daha önce de defalarca başvurdum ama hiçbir sonuç alamadım.",
+    "Bu konuda komşularım da aynı sorunu yaşıyor.",
+    "Lütfen en kısa sürede ilgilenin, artık gerçekten bıktık.",
+    "Geçen ay da benzer bir durum olmuştu, o zaman da kimse dönmedi.",
+    "Çağrı merkezinde {sure} dakika bekletildim.",
+    "Detaylar için {url} adresindeki başvuruma bakabilirsiniz.",
+    "Bana {eposta} adresinden veya {telefon} numarasından ulaşabilirsiniz.",
+    "Vergimi düzenli ödüyorum, bu hizmeti hak ediyorum.",
+    "Sosyal medyada da paylaştım, çok kişi aynı şeyi yazıyor.",
+    "Ne zaman çözüleceğine dair bir tarih verilmesini istiyorum.",
+]
+
+SYNTHETIC_PLACES = ["Kadıköy", "Üsküdar", "Beşiktaş", "Esenyurt", "Bakırköy", "Sarıyer", "Ümraniye", "Fatih"]
+
+# Metin boyu -> (kategori cümlesi sayısı, dolgu cümlesi sayısı)
+SYNTHETIC_TEXT_SIZES = {
+    'kisa': (1, 0),
+    'orta': (2, 2),
+    'uzun': (4, 20),
+}
+
+def synthetic_complaints(count, size='orta', seed=0):
+    """Tekrar üretilebilir, etiketli sentetik Türkçe şikayetler: [(metin, kategori indeksi), ...]
+
+    Metinlerde e-posta, telefon, URL ve ₺ tutarları bulunur; 'uzun' boy
+    kategoriyle ilgisiz dolgu cümleleriyle uzatılmış metinler üretir.
+    """
+    import random
+
+    rng = random.Random(f"{seed}-{size}")
+    category_sentences, filler_sentences = SYNTHETIC_TEXT_SIZES[size]
+
+    def fill(sentence):
+        return sentence.format(
+            tutar=rng.choice([f"{rng.randint(50, 5000)} ₺", f"{rng.randint(1, 30)}.{rng.randint(100, 999)},{rng.randint(10, 99)} ₺"]),
+            telefon=rng.choice([f"0{rng.randint(212, 216)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+                                f"+90 5{rng.randint(30, 59)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}"]),
+            eposta=f"{rng.choice(['ahmet', 'ayse', 'mehmet', 'zeynep'])}.{rng.randint(1, 999)}@example.com",
+            url=f"https://www.ibb.istanbul/basvuru?id={rng.randint(1000, 99999)}",
+            sure=rng.randint(2, 90),
+            yer=rng.choice(SYNTHETIC_PLACES),
+        )
+
+    complaints = []
+    for _ in range(count):
+        label = rng.randrange(len(SYNTHETIC_COMPLAINT_SENTENCES))
+        sentences = rng.sample(SYNTHETIC_COMPLAINT_SENTENCES[label], category_sentences)
+        sentences += rng.choices(SYNTHETIC_FILLER_SENTENCES, k=filler_sentences)
+        rng.shuffle(sentences)
+        complaints.append((' '.join(fill(sentence) for sentence in sentences), label))
+    return complaints
+
+# Gönderim hattının ölçülen aşamaları; uctan_uca uygulamanın kendi giriş noktalarını kullanır
+PIPELINE_STAGES = ['clean_text', 'vectorize', 'predict', 'save_complaint', 'uctan_uca']
+
+def time_pipeline_stages(batches, model, user_id):
+    """Bir tekrar: her aşamanın tüm gruplardaki toplam süresi (saniye) ve sınıf tahminleri"""
+    vectorizer = model_registry.get('vectorizer')
+    totals = dict.fromkeys(PIPELINE_STAGES, 0.0)
+    predictions = []
+    for batch in batches:
+        start = time.perf_counter()
+        cleaned_texts = [clean_text(text) for text in batch]
+        cleaned_at = time.perf_counter()
+        text_vectors = vectorizer.transform(cleaned_texts)
+        vectorized_at = time.perf_counter()
+        batch_predictions = predict_vectors(text_vectors, model)
+        predicted_at = time.perf_counter()
+        for text, prediction in zip(batch, batch_predictions):
+            save_complaint(user_id, text, CATEGORY_LABELS[prediction], model)
+        saved_at = time.perf_counter()
+        totals['clean_text'] += cleaned_at - start
+        totals['vectorize'] += vectorized_at - cleaned_at
+        totals['predict'] += predicted_at - vectorized_at
+        totals['save_complaint'] += saved_at - predicted_at
+        predictions.extend(batch_predictions)
+
+    # Tekil gönderim find_label, toplu iş find_labels ile yapılır; tahmin önbelleği boşaltılır
+    # ki önceki tekrarın sonuçları ölçüme karışmasın
+    get_prediction_cache.clear()
+    start = time.perf_counter()
+    for batch in batches:
+        categories = [find_label(batch[0], model)] if len(batch) == 1 else find_labels(batch, model)
+        for text, category in zip(batch, categories):
+            save_complaint(user_id, text, category, model)
+    totals['uctan_uca'] = time.perf_counter() - start
+    return totals, predictions
+
+def compare_pipeline_results(results, baseline, tolerance):
+    """Referans sonuçlara göre metin başına süresi tolerance oranından fazla artan ölçümler"""
+    def result_key(result):
+        return result['model'], result['boyut'], result['grup'], result['asama']
+
+    baseline_results = {result_key(result): result for result in baseline['sonuclar']}
+    regressions = []
+    for result in results:
+        reference = baseline_results.get(result_key(result))
+        if reference is None or not reference['metin_basina_us']:
+            continue
+        ratio = result['metin_basina_us'] / reference['metin_basina_us']
+        if ratio > 1 + tolerance:
+            regressions.append((result, reference, ratio))
+    return regressions
+
+def benchmark_pipeline(args):
+    """Sentetik şikayetlerle temizleme, vektörleştirme, tahmin ve kaydı model, metin boyu ve grup boyuna göre ölç"""
+    import io
+    import platform
+    from contextlib import redirect_stdout
+
+    models = [model for model in args.models if model != 'dl' or model_registry.get('dl') is not None]
+    if len(models) < len(args.models):
+        print("DL modeli yüklenemedi, 'dl' ölçümden çıkarıldı")
+    results = []
+    print(f"{'model':<5} {'boy':<5} {'grup':>5} " + ' '.join(f"{stage:>14}" for stage in PIPELINE_STAGES)
+          + f" {'doğruluk':>9}   (µs/metin)")
+    with temporary_database() as db:
+        with db.transaction() as c:
+            c.execute("INSERT INTO users (name, email) VALUES ('Ölçüm Kullanıcısı', 'bench@example.com')")
+            user_id = c.lastrowid
+        for size in args.sizes:
+            complaints = synthetic_complaints(args.texts, size, args.seed)
+            texts = [text for text, _ in complaints]
+            labels = [label for _, label in complaints]
+            for model in models:
+                # Modelleri önceden yükle ki ölçüme yükleme süresi karışmasın
+                find_labels(texts[:1], model)
+                for batch_size in args.batch_sizes:
+                    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+                    runs = []
+                    with redirect_stdout(io.StringIO()):  # save_complaint'in debug çıktıları
+                        for _ in range(args.repeat):
+                            runs.append(time_pipeline_stages(batches, model, user_id))
+                    accuracy = float(np.mean(np.asarray(runs[0][1]) == np.asarray(labels)))
+                    per_text = {}
+                    for stage in PIPELINE_STAGES:
+                        # Tekrarların medyanı, gürültülü tek ölçümlere karşı
+                        seconds = sorted(totals[stage] for totals, _ in runs)[len(runs) // 2]
+                        per_text[stage] = round(seconds / len(texts) * 1e6, 2)
+                        results.append({
+                            'model': model,
+                            'boyut': size,
+                            'grup': batch_size,
+                            'asama': stage,
+                            'metin_basina_us': per_text[stage],
+                            'toplam_ms': round(seconds * 1000, 3),
+                            'dogruluk': round(accuracy, 4),
+                        })
+                    print(f"{model:<5} {size:<5} {batch_size:>5} "
+                          + ' '.join(f"{per_text[stage]:14.1f}" for stage in PIPELINE_STAGES)
+                          + f" {accuracy:9.3f}")
+
+    report = {
+        'ortam': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'sqlite': sqlite3.sqlite_version,
+        },
+        'parametreler': {
+            'modeller': models,
+            'boyutlar': args.sizes,
+            'gruplar': args.batch_sizes,
+            'metin_sayisi': args.texts,
+            'tekrar': args.repeat,
+            'tohum': args.seed,
+        },
+        'sonuclar': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar yazıldı: {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_pipeline_results(results, baseline, args.tolerance)
+    for result, reference, ratio in regressions:
+        print(f"✗ {result['model']}/{result['boyut']}/{result['grup']} {result['asama']}: "
+              f"{reference['metin_basina_us']:.1f} → {result['metin_basina_us']:.1f} µs/metin ({ratio:.2f}x)")
+    if regressions:
+        print(f"{len(regressions)} ölçümde %{args.tolerance * 100:.0f} üzeri yavaşlama var ({args.baseline})")
+        return 1
+    print(f"Referansa göre yavaşlama yok ({args.baseline}, tolerans %{args.tolerance * 100:.0f})")
+    return 0
+
+def benchmark_metrics(args):
+    """Ölçüm noktası maliyetini ölç ve /metrics uç noktasının find_label aşamalarını yayınladığını doğrula"""
+    from urllib.request import urlopen
+
+    registry = MetricsRegistry()
+    labels = (('model', 'mb'), ('stage', 'vectorize'))
+    histogram = registry.histogram('classification_stage_seconds', labels)
+
+    def labelled_span():
+        start = time.perf_counter()
+        registry.observe('classification_stage_seconds', labels, time.perf_counter() - start)
+
+    def bound_span():
+        start = time.perf_counter()
+        histogram.observe(time.perf_counter() - start)
+
+    for label, span in [("etiketle arama", labelled_span), ("bağlı histogram", bound_span)]:
+        start = time.perf_counter()
+        for _ in range(args.spans):
+            span()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<16} {elapsed / args.spans * 1e6:8.3f} µs/ölçüm")
+
+    for text in BENCHMARK_TEXTS:
+        find_label(text, args.model)
+    server = start_metrics_server(METRICS_HOST, 0)
+    if server is None:
+        return 1
+    try:
+        with urlopen(f"http://{METRICS_HOST}:{server.server_port}/metrics", timeout=5) as response:
+            body = response.read().decode('utf-8')
+    finally:
+        server.shutdown()
+    expected = f'classification_stage_seconds_count{{model="{args.model}",stage="clean_text"}}'
+    if expected not in body:
+        print(f"✗ /metrics çıktısında {expected} yok")
+        return 1
+    print(f"✓ /metrics: {sum(1 for line in body.splitlines() if '_count' in line)} seri")
+    return 0
+
+def benchmark_cascade(args):
+    """Tekil modeller ve farklı eşiklerdeki kademeli mod: şikayet başına ortalama süre ve doğruluk"""
+    complaints = synthetic_complaints(args.texts, args.size, args.seed)
+    labels = np.array([label for _, label in complaints])
+    text_vectors = model_registry.get('vectorizer').transform([clean_text(text) for text, _ in complaints])
+    # Gönderimler tek tek sınıflandırılır; satırlar ölçümden önce ayrılır
+    rows = [text_vectors[i] for i in range(text_vectors.shape[0])]
+
+    def measure(predict):
+        predict(rows[0])  # modelleri önceden yükle
+        start = time.perf_counter()
+        outputs = [predict(row) for row in rows]
+        return (time.perf_counter() - start) / len(rows) * 1e6, outputs
+
+    print(f"{len(rows)} sentetik şikayet ({args.size}), şikayet başına tek tek tahmin")
+    print(f"{'mod':<24} {'µs/şikayet':>11} {'doğruluk':>9}  cevap veren aşamalar")
+    for model in ['mb', 'sgd', 'lr', 'dl']:
+        if model_registry.get(model) is None:
+            print(f"{MODEL_DISPLAY_NAMES[model]:<24} {'yüklenemedi':>11}")
+            continue
+        elapsed_us, outputs = measure(lambda row: predict_vectors(row, model)[0])
+        print(f"{MODEL_DISPLAY_NAMES[model]:<24} {elapsed_us:11.1f} {np.mean(np.array(outputs) == labels):9.3f}")
+
+    for min_probability in args.probabilities:
+        for min_margin in args.margins:
+            elapsed_us, outputs = measure(lambda row: cascade_predict(row, min_probability, min_margin))
+            predictions = np.array([prediction[0] for prediction, _ in outputs])
+            stages = [stage[0] for _, stage in outputs]
+            shares = ', '.join(f"{key} %{stages.count(key) / len(stages) * 100:.0f}"
+                               for key in CASCADE_STAGES if key in stages)
+            label = f"auto p≥{min_probability:g} fark≥{min_margin:g}"
+            print(f"{label:<24} {elapsed_us:11.1f} {np.mean(predictions == labels):9.3f}  {shares}")
+    print(f"Varsayılan eşikler: p≥{CASCADE_MIN_PROBABILITY:g}, fark≥{CASCADE_MIN_MARGIN:g}")
+    return 0
+
+def benchmark_ensemble(args):
+    """Her model için ayrı find_labels ile ortak vektörleştirmeli topluluk puanlamasını karşılaştır"""
+    texts = [text for text, _ in synthetic_complaints(args.texts, args.size, args.seed)]
+    models = ensemble_models(load_dl=True)
+    find_labels(texts[:1], models[0])  # modelleri önceden yükle
+
+    start = time.perf_counter()
+    separate = {key: find_labels(texts, key) for key in models}
+    separate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    text_vectors = model_registry.get('vectorizer').transform([clean_text(text) for text in texts])
+    votes, majority = ensemble_predict(text_vectors, models)
+    shared_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        category != CATEGORY_LABELS[prediction]
+        for key in models for category, prediction in zip(separate[key], votes[key])
+    )
+    print(f"{len(texts)} sentetik şikayet ({args.size}), modeller: {', '.join(models)}")
+    print(f"modeller ayrı ayrı (find_labels x{len(models)}): {separate_seconds * 1e6 / len(texts):9.1f} µs/şikayet")
+    print(f"ortak vektörleştirme + çoğunluk oyu:    {shared_seconds * 1e6 / len(texts):9.1f} µs/şikayet "
+          f"({separate_seconds / shared_seconds:.1f}x)")
+    if mismatches:
+        print(f"✗ {mismatches} tahmin ayrı çalıştırmadan farklı")
+        return 1
+    return 0
+
+def run_benchmarks(argv):
+    parser = argparse.ArgumentParser(description="İBB Şikayet Kategorilendirme Sistemi ölçüm araçları")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    probe_parser = subparsers.add_parser('startup-probe', help=argparse.SUPPRESS)
+    probe_parser.add_argument('--model', default='mb', choices=['mb', 'sgd', 'lr', 'dl'])
+    probe_parser.set_defaults(func=probe_startup)
+
+    startup_parser = subparsers.add_parser('bench-startup', help="DL yolu ile ve olmadan soğuk başlangıç ölçümü")
+    startup_parser.add_argument('--models', nargs='+', default=['mb', 'dl'], choices=['mb', 'sgd', 'lr', 'dl'])
+    startup_parser.add_argument('--repeat', type=int, default=3)
+    startup_parser.set_defaults(func=benchmark_startup)
+
+    batch_parser = subparsers.add_parser('bench-batch', help="Tekil ve toplu sınıflandırma karşılaştırması")
+    batch_parser.add_argument('--model', default='mb', choices=['mb', 'sgd', 'lr', 'dl'])
+    batch_parser.add_argument('--size', type=int, default=5000)
+    batch_parser.add_argument('--chunk-size', type=int, default=BATCH_CHUNK_SIZE)
+    batch_parser.set_defaults(func=benchmark_batch)
+
+    normalizer_parser = subparsers.add_parser('bench-normalizer', help="Metin temizleme doğrulaması ve hız ölçümü")
+    normalizer_parser.add_argument('--repeat', type=int, default=200)
+    normalizer_parser.add_argument('--fuzz', type=int, default=5000, help="Rastgele üretilecek doğrulama metni sayısı")
+    normalizer_parser.add_argument('--seed', type=int, default=42)
+    normalizer_parser.set_defaults(func=benchmark_normalizer)
+
+    stem_parser = subparsers.add_parser('bench-stem', help="Kök bulma önbelleği hız ve isabet ölçümü")
+    stem_parser.add_argument('--tokens', type=int, default=200000)
+    stem_parser.add_argument('--maxsize', type=int, default=STEM_CACHE_SIZE)
+    stem_parser.add_argument('--seed', type=int, default=42)
+    stem_parser.set_defaults(func=benchmark_stem_cache)
+
+    db_parser = subparsers.add_parser('bench-db', help="Eşzamanlı yazma/okuma altında veritabanı erişim ölçümü")
+    db_parser.add_argument('--writers', type=int, default=4)
+    db_parser.add_argument('--readers', type=int, default=4)
+    db_parser.add_argument('--seconds', type=float, default=5.0)
+    db_parser.set_defaults(func=benchmark_db)
+
+    rerun_parser = subparsers.add_parser('bench-rerun', help="Yeniden çalıştırma başına veritabanı süresi")
+    rerun_parser.add_argument('--rows', type=int, default=100000)
+    rerun_parser.add_argument('--repeat', type=int, default=10)
+    rerun_parser.set_defaults(func=benchmark_rerun)
+
+    lookup_parser = subparsers.add_parser('bench-user-lookup', help="E-posta ile şikayet sorgulama süresi (1 ve 1000 şikayet)")
+    lookup_parser.add_argument('--users', type=int, default=5000)
+    lookup_parser.add_argument('--rows', type=int, default=200000)
+    lookup_parser.add_argument('--repeat', type=int, default=200)
+    lookup_parser.set_defaults(func=benchmark_user_lookup)
+
+    search_parser = subparsers.add_parser('bench-search', help="FTS5 içerik araması ile LIKE taramasını karşılaştır")
+    search_parser.add_argument('--rows', type=int, default=200000)
+    search_parser.add_argument('--repeat', type=int, default=20)
+    search_parser.add_argument('--seed', type=int, default=42)
+    search_parser.set_defaults(func=benchmark_search)
+
+    dl_batch_parser = subparsers.add_parser('bench-dl-batcher', help="Deep Learning dinamik gruplama gecikme/verim ölçümü")
+    dl_batch_parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    dl_batch_parser.add_argument('--requests', type=int, default=50, help="thread başına istek")
+    dl_batch_parser.add_argument('--max-batch-size', type=int, default=DL_BATCH_MAX_SIZE)
+    dl_batch_parser.add_argument('--max-wait-ms', type=float, default=DL_BATCH_MAX_WAIT * 1000)
+    dl_batch_parser.set_defaults(func=benchmark_dl_batcher)
+
+    dl_sparse_parser = subparsers.add_parser('bench-dl-sparse', help="DL modeli yoğun ve seyrek girdi yolu karşılaştırması")
+    dl_sparse_parser.add_argument('--batch-size', type=int, default=1000)
+    dl_sparse_parser.add_argument('--repeat', type=int, default=20)
+    dl_sparse_parser.set_defaults(func=benchmark_dl_sparse)
+
+    scorers_parser = subparsers.add_parser('bench-scorers', help="sklearn pickle ile NumPy puanlayıcı karşılaştırması")
+    scorers_parser.add_argument('--batch-size', type=int, default=1000)
+    scorers_parser.add_argument('--repeat', type=int, default=20)
+    scorers_parser.set_defaults(func=benchmark_scorers)
+
+    vectorizer_parser = subparsers.add_parser('bench-vectorizer', help="sklearn ve sıkıştırılmış vectorizer karşılaştırması")
+    vectorizer_parser.add_argument('--batch-size', type=int, default=1000)
+    vectorizer_parser.add_argument('--repeat', type=int, default=10)
+    vectorizer_parser.set_defaults(func=benchmark_vectorizer)
+
+    pipeline_parser = subparsers.add_parser('bench-pipeline', help="Sentetik şikayetlerle uçtan uca sınıflandırma hattı ölçümü")
+    pipeline_parser.add_argument('--models', nargs='+', default=['mb', 'sgd', 'lr', 'dl'], choices=['mb', 'sgd', 'lr', 'dl'])
+    pipeline_parser.add_argument('--sizes', nargs='+', default=list(SYNTHETIC_TEXT_SIZES), choices=list(SYNTHETIC_TEXT_SIZES))
+    pipeline_parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 32, 256])
+    pipeline_parser.add_argument('--texts', type=int, default=256)
+    pipeline_parser.add_argument('--repeat', type=int, default=3)
+    pipeline_parser.add_argument('--seed', type=int, default=0)
+    pipeline_parser.add_argument('--output', default='pipeline_benchmark.json')
+    pipeline_parser.add_argument('--baseline', help="Karşılaştırılacak önceki bench-pipeline JSON çıktısı")
+    pipeline_parser.add_argument('--tolerance', type=float, default=0.2, help="İzin verilen yavaşlama oranı (0.2 = %%20)")
+    pipeline_parser.set_defaults(func=benchmark_pipeline)
+
+    metrics_parser = subparsers.add_parser('bench-metrics', help="Ölçüm noktası maliyeti ve /metrics uç noktası kontrolü")
+    metrics_parser.add_argument('--model', default='mb', choices=['mb', 'sgd', 'lr', 'dl'])
+    metrics_parser.add_argument('--spans', type=int, default=200000)
+    metrics_parser.set_defaults(func=benchmark_metrics)
+
+    cascade_parser = subparsers.add_parser('bench-cascade', help="Kademeli (auto) modun eşiklere göre süre/doğruluk ölçümü")
+    cascade_parser.add_argument('--texts', type=int, default=2000)
+    cascade_parser.add_argument('--size', default='orta', choices=list(SYNTHETIC_TEXT_SIZES))
+    cascade_parser.add_argument('--seed', type=int, default=0)
+    cascade_parser.add_argument('--probabilities', nargs='+', type=float, default=[0.5, 0.6, 0.7, 0.8, 0.9, 0.95])
+    cascade_parser.add_argument('--margins', nargs='+', type=float, default=[0.0, 0.2])
+    cascade_parser.set_defaults(func=benchmark_cascade)
+
+    ensemble_parser = subparsers.add_parser('bench-ensemble', help="Ayrı model çağrıları ile ortak vektörleştirmeli topluluk karşılaştırması")
+    ensemble_parser.add_argument('--texts', type=int, default=2000)
+    ensemble_parser.add_argument('--size', default='orta', choices=list(SYNTHETIC_TEXT_SIZES))
+    ensemble_parser.add_argument('--seed', type=int, default=0)
+    ensemble_parser.set_defaults(func=benchmark_ensemble)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(run_benchmarks(sys.argv[1:]))
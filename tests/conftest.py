@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+import pytest
+
+# app.py import edilirken veritabanını başlatır; testler çalışma dizinindeki
+# complaints.db'ye dokunmasın diye import'tan önce geçici bir dosyaya yönlendirilir
+_database_directory = tempfile.TemporaryDirectory(prefix='complaints-test-')
+os.environ['COMPLAINTS_DB'] = os.path.join(_database_directory.name, 'complaints.db')
+
+import app  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """Migration'ları uygulanmış, boş ve teste özel bir veritabanı"""
+    with app.temporary_database() as database:
+        yield database
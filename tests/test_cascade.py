@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+import app
+
+
+class StubModel:
+    """Satır numarasına göre sabit olasılık döndüren model (text_vectors: satır numarası sütunu)"""
+
+    def __init__(self, probabilities):
+        self.probabilities = np.asarray(probabilities, dtype=np.float64)
+        self.classes_ = np.arange(self.probabilities.shape[1])
+        self.calls = []
+
+    def predict_proba(self, rows):
+        self.calls.append(rows[:, 0].tolist())
+        return self.probabilities[rows[:, 0]]
+
+    def predict(self, rows):
+        self.calls.append(rows[:, 0].tolist())
+        return self.probabilities[rows[:, 0]].argmax(axis=1)
+
+
+class StubRegistry:
+    def __init__(self, models):
+        self.models = models
+        self.requested = []
+
+    def get(self, key):
+        self.requested.append(key)
+        return self.models.get(key)
+
+    def unavailable(self, key):
+        return key in self.requested and key not in self.models
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    models = {
+        # 0: emin, 1: olasılık düşük (fark yeterli), 2: olasılık yeterli ama ilk ikisi arasındaki fark küçük
+        'ucuz': StubModel([[0.9, 0.05, 0.05], [0.35, 0.05, 0.0], [0.5, 0.45, 0.05]]),
+        'orta': StubModel([[0.1, 0.8, 0.1], [0.05, 0.9, 0.05], [0.05, 0.45, 0.5]]),
+        'son': StubModel([[0.0, 0.0, 1.0], [0.0, 0.0, 1.0], [0.0, 0.0, 1.0]]),
+    }
+    registry = StubRegistry(models)
+    monkeypatch.setattr(app, 'model_registry', registry)
+    monkeypatch.setattr(app, 'predict_vectors', lambda rows, key: models[key].predict(rows))
+    return registry
+
+
+def rows(count):
+    return np.arange(count).reshape(-1, 1)
+
+
+def test_threshold_and_margin_escalate(stages):
+    predictions, answered_by = app.cascade_predict(rows(3), min_probability=0.4, min_margin=0.2,
+                                                   stages=['ucuz', 'orta', 'son'])
+    assert answered_by == ['ucuz', 'orta', 'son']
+    assert predictions.tolist() == [0, 1, 2]
+    # Üst aşamalar sadece emin olunamayan satırları görür
+    assert stages.models['orta'].calls == [[1, 2]]
+    assert stages.models['son'].calls == [[2]]
+
+
+def test_min_probability_alone_escalates(stages):
+    _, answered_by = app.cascade_predict(rows(3), min_probability=0.85, min_margin=0.0,
+                                         stages=['ucuz', 'orta', 'son'])
+    assert answered_by == ['ucuz', 'orta', 'son']
+
+
+def test_later_stages_are_not_loaded_when_first_stage_is_sure(stages):
+    predictions, answered_by = app.cascade_predict(rows(1), stages=['ucuz', 'orta', 'son'])
+    assert (predictions.tolist(), answered_by) == ([0], ['ucuz'])
+    assert stages.requested == ['ucuz']
+
+
+def test_missing_stage_is_skipped(stages):
+    del stages.models['orta']
+    predictions, answered_by = app.cascade_predict(rows(3), min_probability=0.4, min_margin=0.2,
+                                                   stages=['ucuz', 'orta', 'son'])
+    assert answered_by == ['ucuz', 'son', 'son']
+    assert predictions.tolist() == [0, 2, 2]
+
+
+def test_missing_last_stage_keeps_previous_answer(stages):
+    del stages.models['son']
+    predictions, answered_by = app.cascade_predict(rows(3), min_probability=0.4, min_margin=0.2,
+                                                   stages=['ucuz', 'orta', 'son'])
+    assert answered_by == ['ucuz', 'orta', 'orta']
+    assert predictions.tolist() == [0, 1, 2]
+
+
+def test_stage_before_known_unavailable_stages_answers_directly(stages):
+    del stages.models['son']
+    app.cascade_predict(rows(3), min_probability=0.4, min_margin=0.2, stages=['ucuz', 'son'])
+    stages.models['ucuz'].calls.clear()
+    predictions, answered_by = app.cascade_predict(rows(3), min_probability=0.4, min_margin=0.2,
+                                                   stages=['ucuz', 'son'])
+    assert answered_by == ['ucuz', 'ucuz', 'ucuz']
+    assert predictions.tolist() == [0, 0, 0]
+    # Olasılık yerine tek predict çağrısı
+    assert stages.models['ucuz'].calls == [[0, 1, 2]]
+
+
+def test_no_loadable_stage_raises(stages):
+    stages.models.clear()
+    with pytest.raises(ValueError):
+        app.cascade_predict(rows(2), stages=['ucuz', 'son'])
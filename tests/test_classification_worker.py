@@ -0,0 +1,117 @@
+import sys
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def worker(db):
+    # Thread'siz işçi: gruplar testte doğrudan _process ile işlenir
+    return app.ClassificationWorker(db.path, workers=0, retry_delay=0.0)
+
+
+def pending_complaint(db, text, model='mb'):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    number = app.save_complaint(user_id, text, app.CATEGORY_LABELS[4], model)
+    with db.transaction() as c:
+        c.execute('UPDATE complaints SET category = ? WHERE complaint_number = ? RETURNING id',
+                  (app.PENDING_CATEGORY, number))
+        return number, c.fetchone()[0]
+
+
+def stored(db, number):
+    with db.connection() as conn:
+        return conn.execute('SELECT category, answered_by, classification_error FROM complaints '
+                            'WHERE complaint_number = ?', (number,)).fetchone()
+
+
+def test_pending_complaint_is_classified(db, worker):
+    number, complaint_id = pending_complaint(db, "Doğalgaz faturam bu ay çok yüksek geldi")
+    worker._process([complaint_id])
+    category, answered_by, error = stored(db, number)
+    assert category in app.CATEGORY_LABELS.values()
+    assert answered_by == app.MODEL_DISPLAY_NAMES['mb']
+    assert error is None
+
+
+def test_failing_model_is_retried_then_marked_failed(db, worker, monkeypatch):
+    number, complaint_id = pending_complaint(db, "Su kesintisi ne zaman bitecek?", model='lr')
+
+    def broken_predict(text_vectors, model):
+        raise RuntimeError("model bozuk")
+
+    monkeypatch.setattr(app, 'predict_vectors', broken_predict)
+    for attempt in range(1, worker.max_attempts):
+        worker._process([complaint_id])
+        assert stored(db, number)[0] == app.PENDING_CATEGORY
+        # Zamanlayıcı bekleme süresi dolunca şikayeti tekrar kuyruğa koyar
+        worker._queue.get(timeout=5)
+
+    worker._process([complaint_id])
+    category, _, error = stored(db, number)
+    assert category == app.FAILED_CATEGORY
+    assert 'model bozuk' in error
+    assert worker.stats()['basarisiz'] == 1
+    assert worker.pending() == 0
+
+
+def test_failing_complaint_does_not_block_its_batch(db, worker, monkeypatch):
+    good_number, good_id = pending_complaint(db, "Metrobüs çok kalabalık")
+    bad_number, bad_id = pending_complaint(db, "Parktaki çöpler toplanmıyor")
+    clean_text = app.clean_text
+
+    def flaky_clean_text(text):
+        if 'çöpler' in text:
+            raise ValueError("temizlenemedi")
+        return clean_text(text)
+
+    monkeypatch.setattr(app, 'clean_text', flaky_clean_text)
+    worker._process([good_id, bad_id])
+    assert stored(db, good_number)[0] in app.CATEGORY_LABELS.values()
+    assert stored(db, bad_number)[0] == app.PENDING_CATEGORY
+    assert worker._queue.get(timeout=5) == bad_id
+
+
+def test_ensemble_failure_does_not_block_selected_model(db, worker, monkeypatch):
+    number, complaint_id = pending_complaint(db, "İETT otobüsü 40 dakika gecikti")
+
+    def broken_ensemble(text_vectors):
+        raise RuntimeError("topluluk bozuk")
+
+    monkeypatch.setattr(app, 'ensemble_predict', broken_ensemble)
+    worker._process([complaint_id])
+    assert stored(db, number)[0] in app.CATEGORY_LABELS.values()
+    with db.connection() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM complaint_predictions').fetchone()[0] == 0
+
+
+def test_stage_timings_are_recorded(db, worker, monkeypatch):
+    registry = app.MetricsRegistry()
+    monkeypatch.setattr(app, 'metrics', registry)
+    number, complaint_id = pending_complaint(db, "Kombi arızası için İgdaş ekibi gelmedi", model='lr')
+    worker._process([complaint_id])
+    app.find_labels(["Metrobüs çok kalabalık"], model='sgd')
+
+    observed = {(row['etiketler'], row['sayi']) for row in registry.rows()
+                if row['metrik'] == 'classification_stage_seconds'}
+    for labels in ('model=worker, stage=clean_text', 'model=worker, stage=vectorize',
+                   'model=ensemble, stage=predict', 'model=lr, stage=predict', 'model=worker, stage=db_write',
+                   'model=sgd, stage=clean_text', 'model=sgd, stage=vectorize', 'model=sgd, stage=predict'):
+        assert (labels, 1) in observed
+
+
+def test_non_dl_complaint_does_not_load_dl(db, worker, monkeypatch):
+    # Temiz bir kayıt defteri: önceki testlerin DL yükleme denemesi sonucu etkilemesin
+    registry = app.ModelRegistry(app.model_path)
+    monkeypatch.setattr(app, 'model_registry', registry)
+    dl_loads = []
+    monkeypatch.setattr(registry, '_load_dl_model', lambda: dl_loads.append(True))
+    number, complaint_id = pending_complaint(db, "Su kesintisi ne zaman bitecek?", model='lr')
+
+    worker._process([complaint_id])
+    assert stored(db, number)[0] in app.CATEGORY_LABELS.values()
+    assert dl_loads == []
+    assert 'tensorflow' not in sys.modules
+    with db.connection() as conn:
+        assert conn.execute('SELECT dl FROM complaint_predictions').fetchone() == (None,)
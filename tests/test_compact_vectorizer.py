@@ -0,0 +1,69 @@
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+import app
+
+
+CORPUS = [
+    "doğalgaz faturam bu ay çok yüksek geldi",
+    "metrobüs çok kalabalık, metrobüs hep gecikiyor",
+    "su kesintisi ne zaman bitecek su yok",
+    "İETT otobüsü 40 dakika gecikti",
+    "parktaki çöpler toplanmıyor",
+    "kombi arızası için igdaş ekibi gelmedi",
+]
+
+TEXTS = CORPUS + [
+    "",
+    "sözlükte olmayan kelimeler: zzzz qqqq",
+    "çok çok çok yüksek fatura fatura",
+    "a b c",
+    "metrobüs" * 20,
+    "gecikti GECİKTİ Gecikti",
+]
+
+
+@pytest.fixture(scope='module')
+def vectorizer():
+    return CountVectorizer().fit(CORPUS)
+
+
+def test_transform_matches_count_vectorizer(vectorizer):
+    compact = app.CompactVectorizer.from_vectorizer(vectorizer, 'sha')
+    assert app.same_csr(vectorizer.transform(TEXTS), compact.transform(TEXTS))
+    for text in TEXTS:
+        assert app.same_csr(vectorizer.transform([text]), compact.transform([text]))
+
+
+def test_single_document_result_is_a_valid_matrix(vectorizer):
+    compact = app.CompactVectorizer.from_vectorizer(vectorizer, 'sha')
+    matrix = compact.transform([TEXTS[2]])
+    matrix.check_format(full_check=True)
+    assert (matrix + matrix).toarray().tolist() == (2 * vectorizer.transform([TEXTS[2]])).toarray().tolist()
+    # Şablon paylaşılmaz: ardışık çağrılar birbirinin dizilerini değiştirmez
+    other = compact.transform([TEXTS[0]])
+    assert app.same_csr(vectorizer.transform([TEXTS[2]]), matrix)
+    assert app.same_csr(vectorizer.transform([TEXTS[0]]), other)
+
+
+def test_shipped_vocabulary_matches_pickled_vectorizer():
+    vectorizer, source_sha256 = app.load_sklearn_model('vectorizer')
+    compact = app.CompactVectorizer.from_vectorizer(vectorizer, source_sha256)
+    texts = [app.clean_text(text) for text in app.NORMALIZER_GOLDEN_TEXTS + app.BENCHMARK_TEXTS]
+    assert app.same_csr(vectorizer.transform(texts), compact.transform(texts))
+    assert app.same_csr(vectorizer.transform(texts[:1]), compact.transform(texts[:1]))
+
+
+def test_save_and_load_round_trip(vectorizer, tmp_path):
+    compact = app.CompactVectorizer.from_vectorizer(vectorizer, 'sha')
+    path = tmp_path / 'vocabulary.npz'
+    compact.save(path)
+    loaded = app.CompactVectorizer.load(path)
+    assert loaded.source_sha256 == 'sha'
+    assert list(loaded.get_feature_names_out()) == list(vectorizer.get_feature_names_out())
+    assert app.same_csr(vectorizer.transform(TEXTS), loaded.transform(TEXTS))
+
+
+def test_tfidf_vectorizer_is_rejected():
+    with pytest.raises(ValueError, match='tfidf'):
+        app.CompactVectorizer.from_vectorizer(TfidfVectorizer().fit(CORPUS), 'sha')
@@ -0,0 +1,35 @@
+import threading
+
+import app
+
+THREADS = 8
+PER_THREAD = 100
+
+
+def test_concurrent_saves_get_unique_numbers_in_range(db):
+    """Eşzamanlı kayıtlarda her şikayet kaydedilmeli ve numaralar çakışmadan 7 haneli aralıkta kalmalı"""
+    numbers = []
+    numbers_lock = threading.Lock()
+
+    def submitter(worker_id):
+        user_id = app.save_user('Test Kullanıcı', f"kullanici{worker_id}@example.com", None)
+        for i in range(PER_THREAD):
+            number = app.save_complaint(user_id, app.BENCHMARK_TEXTS[i % len(app.BENCHMARK_TEXTS)],
+                                        app.CATEGORY_LABELS[i % len(app.CATEGORY_LABELS)], 'mb')
+            with numbers_lock:
+                numbers.append(number)
+
+    threads = [threading.Thread(target=submitter, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = THREADS * PER_THREAD
+    assert None not in numbers
+    assert len(numbers) == len(set(numbers)) == expected
+    assert all(app.COMPLAINT_NUMBER_MIN <= number < app.COMPLAINT_NUMBER_MIN + app.COMPLAINT_NUMBER_SPACE
+               for number in numbers)
+    with db.connection() as conn:
+        stored = [row[0] for row in conn.execute('SELECT complaint_number FROM complaints')]
+    assert sorted(stored) == sorted(numbers)
@@ -0,0 +1,86 @@
+import argparse
+import sqlite3
+
+import pytest
+
+import app
+
+
+def stored_stats(db):
+    with db.connection() as conn:
+        return {row[:4]: row[4] for row in conn.execute(
+            'SELECT day, model_used, category, status, complaint_count FROM complaint_stats')}
+
+
+def expected_stats(db):
+    with db.connection() as conn:
+        return {row[:4]: row[4] for row in conn.execute(f'''
+            SELECT {app.STATS_KEY_COLUMNS.format(row='complaints')}, COUNT(*)
+            FROM complaints
+            GROUP BY 1, 2, 3, 4
+        ''')}
+
+
+def assert_stats_match(db):
+    assert stored_stats(db) == expected_stats(db)
+
+
+@pytest.fixture
+def complaints(db):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    numbers = [
+        app.save_complaint(user_id, "Doğalgaz faturam çok yüksek", app.CATEGORY_LABELS[0], 'mb'),
+        app.save_complaint(user_id, "Metrobüs çok kalabalık", app.CATEGORY_LABELS[1], 'lr'),
+        app.save_complaint(user_id, "Su kesintisi ne zaman bitecek", app.CATEGORY_LABELS[2], 'mb'),
+    ]
+    return numbers
+
+
+def test_insert_keeps_counters_in_sync(db, complaints):
+    assert_stats_match(db)
+    assert sum(stored_stats(db).values()) == 3
+
+
+def test_status_change_moves_count(db, complaints):
+    app.update_complaint_status(complaints[0], 'Çözüldü')
+    assert_stats_match(db)
+    assert sum(count for key, count in stored_stats(db).items() if key[3] == 'Çözüldü') == 1
+
+
+def test_delete_decrements_and_drops_empty_keys(db, complaints):
+    with db.transaction() as c:
+        c.execute('DELETE FROM complaints WHERE complaint_number = ?', (complaints[1],))
+    assert_stats_match(db)
+    assert all(count > 0 for count in stored_stats(db).values())
+
+
+def test_created_at_day_move(db, complaints):
+    with db.transaction() as c:
+        c.execute("UPDATE complaints SET created_at = '2020-02-29 23:59:59' WHERE complaint_number = ?",
+                  (complaints[2],))
+    assert_stats_match(db)
+    assert '2020-02-29' in {key[0] for key in stored_stats(db)}
+
+
+def test_outside_writer_is_counted(db, complaints):
+    # Tetikleyiciler SQL'dir; uygulama fonksiyonu kaydetmemiş bağlantıların yazmaları da sayılır
+    with sqlite3.connect(db.path) as conn:
+        conn.execute("UPDATE complaints SET category = 'İlgisiz', model_used = 'SGD Classifier'")
+    assert_stats_match(db)
+
+
+def test_check_stats_reports_and_rebuilds_drift(db, complaints, capsys):
+    assert app.check_complaint_stats(argparse.Namespace(rebuild=False)) == 0
+    with db.transaction() as c:
+        c.execute('UPDATE complaint_stats SET complaint_count = complaint_count + 5 WHERE model_used = ?',
+                  ('Logistic Regression',))
+        c.execute("INSERT INTO complaint_stats VALUES ('1999-01-01', 'MultinomialNB', 'İlgisiz', 'Çözüldü', 2)")
+    capsys.readouterr()
+
+    assert app.check_complaint_stats(argparse.Namespace(rebuild=False)) == 1
+    assert '2 sapma' in capsys.readouterr().out
+    assert stored_stats(db) != expected_stats(db)
+
+    assert app.check_complaint_stats(argparse.Namespace(rebuild=True)) == 0
+    assert_stats_match(db)
+    assert app.check_complaint_stats(argparse.Namespace(rebuild=False)) == 0
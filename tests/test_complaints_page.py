@@ -0,0 +1,85 @@
+from datetime import date
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def complaints(db):
+    """(id, created_at, status, category) ile eklenmiş şikayetler; created_at'ler bilerek çakışır"""
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    rows = []
+    specs = [
+        ('2024-03-01 10:00:00', 'Beklemede', 1),
+        ('2024-03-01 10:00:00', 'Çözüldü', 1),
+        ('2024-03-01 10:00:00', 'Beklemede', 2),
+        ('2024-03-01 10:00:00', 'Beklemede', 1),
+        ('2024-03-02 09:30:00', 'İnceleniyor', 1),
+        ('2024-03-02 09:30:00', 'Beklemede', 1),
+        ('2024-03-03 23:59:59', 'Beklemede', 1),
+        ('2024-03-04 00:00:00', 'Beklemede', 1),
+        ('2024-02-28 12:00:00', 'Beklemede', 1),
+    ]
+    for i, (created_at, status, category) in enumerate(specs):
+        number = app.save_complaint(user_id, app.BENCHMARK_TEXTS[i % len(app.BENCHMARK_TEXTS)],
+                                    app.CATEGORY_LABELS[category], 'mb')
+        with db.transaction() as c:
+            c.execute('UPDATE complaints SET created_at = ?, status = ? WHERE complaint_number = ? RETURNING id',
+                      (created_at, status, number))
+            rows.append((c.fetchone()[0], created_at, status, app.CATEGORY_LABELS[category]))
+    return rows
+
+
+def walk(filters, limit):
+    """Tüm sayfaları next_page_cursor ile gez; (sayfa id listeleri)"""
+    pages = []
+    after = None
+    while True:
+        page = app.get_complaints_page(filters, after=after, limit=limit)
+        pages.append([row[9] for row in page])
+        after = app.next_page_cursor(page, limit)
+        if after is None:
+            return pages
+
+
+def expected_ids(rows):
+    return [row[0] for row in sorted(rows, key=lambda row: (row[1], row[0]), reverse=True)]
+
+
+def test_pages_cover_every_row_once_with_ties_broken_by_id(complaints):
+    pages = walk({}, limit=2)
+    ids = [complaint_id for page in pages for complaint_id in page]
+    assert ids == expected_ids(complaints)
+    # Aynı created_at'e sahip dört şikayet sayfa sınırlarına bölünse de id sırasıyla gelir
+    tied = [row[0] for row in complaints if row[1] == '2024-03-01 10:00:00']
+    assert [complaint_id for complaint_id in ids if complaint_id in tied] == sorted(tied, reverse=True)
+
+
+def test_filters_combine_with_cursor(complaints):
+    filters = {
+        'statuses': ['Beklemede'],
+        'category': app.CATEGORY_LABELS[1],
+        'date_from': date(2024, 3, 1),
+        'date_to': date(2024, 3, 3),
+    }
+    matching = [row for row in complaints
+                if row[2] == 'Beklemede' and row[3] == app.CATEGORY_LABELS[1] and '2024-03-01' <= row[1][:10] <= '2024-03-03']
+    assert len(matching) == 4
+    pages = walk(filters, limit=3)
+    assert [complaint_id for page in pages for complaint_id in page] == expected_ids(matching)
+    assert [len(page) for page in pages] == [3, 1]
+
+
+def test_last_page_is_short_and_has_no_next_cursor(complaints):
+    pages = walk({}, limit=4)
+    assert [len(page) for page in pages] == [4, 4, 1]
+
+    last_page = app.get_complaints_page({}, after=(complaints[8][1], complaints[8][0]), limit=4)
+    assert last_page == []
+    assert app.next_page_cursor(last_page, 4) is None
+
+
+def test_full_last_page_is_followed_by_an_empty_page(complaints):
+    pages = walk({}, limit=3)
+    assert [len(page) for page in pages] == [3, 3, 3, 0]
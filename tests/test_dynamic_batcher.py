@@ -0,0 +1,113 @@
+import threading
+from concurrent.futures import CancelledError, TimeoutError
+
+import numpy as np
+import pytest
+
+import app
+
+
+class StubModel:
+    """Çağrılan grupları kaydeden, ilk çağrıda kapı açılana kadar bekleyen model"""
+
+    def __init__(self, fail_on_call=None):
+        self.batches = []
+        self.fail_on_call = fail_on_call
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def __call__(self, batch):
+        self.batches.append(batch.copy())
+        if len(self.batches) == 1:
+            self.entered.set()
+            assert self.gate.wait(timeout=5)
+        if len(self.batches) == self.fail_on_call:
+            raise RuntimeError("model bozuk")
+        return batch * 10
+
+
+def rows(*values):
+    return np.array([[value, -value] for value in values], dtype=np.float64)
+
+
+@pytest.fixture
+def model():
+    model = StubModel()
+    yield model
+    model.gate.set()
+
+
+def busy_batcher(model, max_batch_size=4):
+    """Model ilk istekle meşgulken gelen istekler kuyrukta birikir"""
+    batcher = app.DynamicBatcher(model, max_batch_size=max_batch_size, max_wait=1.0)
+    first = batcher.submit(rows(0))
+    assert model.entered.wait(timeout=5)
+    return batcher, first
+
+
+def test_concurrent_requests_are_coalesced_up_to_max_batch(model):
+    batcher, first = busy_batcher(model, max_batch_size=4)
+    futures = [batcher.submit(rows(value)) for value in range(1, 7)]
+    model.gate.set()
+
+    for value, future in enumerate([first] + futures):
+        assert np.array_equal(future.result(timeout=5), rows(value) * 10)
+    assert [len(batch) for batch in model.batches] == [1, 4, 2]
+    assert batcher.stats() == {'istek': 7, 'cagri': 3, 'satir': 7, 'ortalama_grup': 2.33}
+
+
+def test_each_caller_gets_only_its_own_rows(model):
+    batcher, first = busy_batcher(model, max_batch_size=100)
+    requests = [rows(1, 2), rows(3), rows(4, 5, 6)]
+    futures = [batcher.submit(request) for request in requests]
+    model.gate.set()
+
+    first.result(timeout=5)
+    for request, future in zip(requests, futures):
+        assert np.array_equal(future.result(timeout=5), request * 10)
+    assert np.array_equal(model.batches[1], np.vstack(requests))
+
+
+def test_model_exception_reaches_every_waiter_in_the_batch(model):
+    model.fail_on_call = 2
+    batcher, first = busy_batcher(model)
+    futures = [batcher.submit(rows(value)) for value in range(1, 4)]
+    model.gate.set()
+
+    first.result(timeout=5)
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model bozuk"):
+            future.result(timeout=5)
+    # İşçi thread'i hatadan sonra da çalışmaya devam eder
+    assert np.array_equal(batcher.predict(rows(9)), rows(9) * 10)
+
+
+def test_timed_out_waiter_does_not_break_later_batches(model):
+    batcher, first = busy_batcher(model)
+    late = batcher.submit(rows(1))
+    with pytest.raises(TimeoutError):
+        late.result(timeout=0.01)
+    model.gate.set()
+
+    first.result(timeout=5)
+    assert np.array_equal(late.result(timeout=5), rows(1) * 10)
+    assert np.array_equal(batcher.predict(rows(2)), rows(2) * 10)
+
+
+def test_cancelled_waiter_is_skipped_without_breaking_its_batch(model):
+    batcher, first = busy_batcher(model)
+    kept = batcher.submit(rows(1))
+    cancelled = batcher.submit(rows(2))
+    also_kept = batcher.submit(rows(3))
+    assert cancelled.cancel()
+    model.gate.set()
+
+    first.result(timeout=5)
+    assert np.array_equal(kept.result(timeout=5), rows(1) * 10)
+    assert np.array_equal(also_kept.result(timeout=5), rows(3) * 10)
+    with pytest.raises(CancelledError):
+        cancelled.result()
+    # İptal edilen satırlar modele gitmez
+    assert np.array_equal(model.batches[1], np.vstack([rows(1), rows(3)]))
+    assert np.array_equal(batcher.predict(rows(4)), rows(4) * 10)
+    assert batcher.stats()['istek'] == 4
@@ -0,0 +1,60 @@
+import argparse
+
+import app
+
+
+def backfill_args(rescore=False):
+    return argparse.Namespace(page_size=app.BATCH_CHUNK_SIZE, rescore=rescore)
+
+
+def saved_complaints(texts):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    return [app.save_complaint(user_id, text, app.CATEGORY_LABELS[4], 'mb') for text in texts]
+
+
+def stored_fingerprints(db):
+    with db.connection() as conn:
+        return [row[0] for row in conn.execute('SELECT fingerprint FROM complaint_predictions ORDER BY complaint_id')]
+
+
+def test_backfill_stores_current_fingerprint(db):
+    saved_complaints(["Doğalgaz faturam çok yüksek", "Metrobüs çok kalabalık"])
+    assert app.backfill_ensemble(backfill_args()) == 0
+    fingerprint = app.ensemble_fingerprint(app.ensemble_models(load_dl=True))
+    assert fingerprint in app.current_ensemble_fingerprints()
+    assert stored_fingerprints(db) == [fingerprint, fingerprint]
+    assert app.get_model_agreement(app.current_ensemble_fingerprints())['scored'] == 2
+
+
+def test_stale_predictions_are_excluded_and_rescored(db):
+    saved_complaints(["Doğalgaz faturam çok yüksek", "Metrobüs çok kalabalık"])
+    app.backfill_ensemble(backfill_args())
+    current = app.current_ensemble_fingerprints()
+    fingerprint = stored_fingerprints(db)[0]
+    with db.transaction() as c:
+        c.execute("UPDATE complaint_predictions SET fingerprint = 'eski-model' WHERE complaint_id = 1")
+    app.invalidate_analytics()
+
+    agreement = app.get_model_agreement(current)
+    assert (agreement['scored'], agreement['stale']) == (1, 1)
+
+    app.backfill_ensemble(backfill_args())
+    assert stored_fingerprints(db) == [fingerprint, fingerprint]
+    agreement = app.get_model_agreement(current)
+    assert (agreement['scored'], agreement['stale']) == (2, 0)
+
+
+def test_fingerprint_follows_model_files(monkeypatch):
+    file_fingerprint = app.model_registry.file_fingerprint
+    before = app.current_ensemble_fingerprints()
+    monkeypatch.setattr(app.model_registry, 'file_fingerprint',
+                        lambda key: 'yeni' if key == 'lr' else file_fingerprint(key))
+    after = app.current_ensemble_fingerprints()
+    assert not set(before) & set(after)
+
+
+def test_fingerprint_does_not_load_models(monkeypatch):
+    registry = app.ModelRegistry(app.model_path)
+    monkeypatch.setattr(app, 'model_registry', registry)
+    app.current_ensemble_fingerprints()
+    assert registry.stats() == []
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+import app
+
+
+class LegacyLogisticRegression(LogisticRegression):
+    """multi_class parametresi olan sklearn sürümlerindeki LogisticRegression'ın kurucusu"""
+
+    def __init__(self, multi_class='auto', solver='lbfgs'):
+        super().__init__(solver=solver)
+        self.multi_class = multi_class
+
+
+@pytest.fixture(scope='module')
+def training_data():
+    rng = np.random.default_rng(0)
+    features = sparse.csr_matrix(rng.poisson(0.3, size=(300, 40)).astype(np.float64))
+    labels = rng.integers(0, 4, size=300)
+    return features, labels
+
+
+def test_current_logistic_regression_matches_predict_proba(training_data):
+    features, labels = training_data
+    estimator = LogisticRegression(max_iter=500).fit(features, labels)
+    scorer = app.LinearScorer.from_estimator(estimator, 'sha')
+    assert np.array_equal(scorer.predict(features), estimator.predict(features))
+    assert np.allclose(scorer.predict_proba(features), estimator.predict_proba(features), atol=1e-12)
+
+
+@pytest.mark.parametrize('multi_class, solver, proba', [
+    ('ovr', 'lbfgs', 'ovr'),
+    ('warn', 'liblinear', 'ovr'),
+    ('auto', 'liblinear', 'ovr'),
+    ('deprecated', 'liblinear', 'ovr'),
+    ('auto', 'lbfgs', 'softmax'),
+    ('deprecated', 'saga', 'softmax'),
+    ('multinomial', 'lbfgs', 'softmax'),
+])
+def test_legacy_multi_class_setting_selects_probability(training_data, multi_class, solver, proba):
+    features, labels = training_data
+    fitted = LogisticRegression(max_iter=500).fit(features, labels)
+    estimator = LegacyLogisticRegression(multi_class=multi_class, solver=solver)
+    estimator.coef_, estimator.intercept_, estimator.classes_ = fitted.coef_, fitted.intercept_, fitted.classes_
+
+    scorer = app.LinearScorer.from_estimator(estimator, 'sha')
+    assert scorer.proba == proba
+    if proba == 'ovr':
+        sigmoid = 1.0 / (1.0 + np.exp(-fitted.decision_function(features)))
+        assert np.allclose(scorer.predict_proba(features), sigmoid / sigmoid.sum(axis=1, keepdims=True))
+
+
+@pytest.mark.parametrize('loss, proba', [
+    ('log_loss', 'ovr'),
+    ('modified_huber', 'modified_huber'),
+    ('hinge', 'none'),
+    ('perceptron', 'none'),
+])
+def test_sgd_loss_selects_probability(training_data, loss, proba):
+    features, labels = training_data
+    estimator = SGDClassifier(loss=loss, random_state=0).fit(features, labels)
+    scorer = app.LinearScorer.from_estimator(estimator, 'sha')
+    assert scorer.proba == proba
+    assert np.array_equal(scorer.predict(features), estimator.predict(features))
+    if proba == 'none':
+        with pytest.raises(AttributeError):
+            scorer.predict_proba(features)
+    else:
+        assert np.allclose(scorer.predict_proba(features), estimator.predict_proba(features), atol=1e-12)
+
+
+def test_modified_huber_all_zero_rows_are_uniform(training_data):
+    features, labels = training_data
+    estimator = SGDClassifier(loss='modified_huber', random_state=0).fit(features, labels)
+    # Tüm puanları -1'in altına iten satır: sklearn her sınıfa eşit olasılık verir
+    estimator.intercept_ = estimator.intercept_ - 1000.0
+    scorer = app.LinearScorer.from_estimator(estimator, 'sha')
+    expected = estimator.predict_proba(features[:5])
+    assert np.allclose(expected, 1 / len(estimator.classes_))
+    assert np.allclose(scorer.predict_proba(features[:5]), expected)
+
+
+def test_legacy_sgd_log_loss_is_ovr(training_data):
+    features, labels = training_data
+    estimator = SGDClassifier(loss='log_loss', random_state=0).fit(features, labels)
+    estimator.loss = 'log'  # sklearn 1.3 öncesi pickle'lardaki ad
+    assert app.LinearScorer.from_estimator(estimator, 'sha').proba == 'ovr'
+
+
+def test_unknown_sgd_loss_is_rejected(training_data):
+    features, labels = training_data
+    estimator = SGDClassifier(random_state=0).fit(features, labels)
+    estimator.loss = 'gelecekteki_loss'
+    with pytest.raises(ValueError, match='gelecekteki_loss'):
+        app.LinearScorer.from_estimator(estimator, 'sha')
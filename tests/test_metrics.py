@@ -0,0 +1,96 @@
+import math
+import re
+
+import pytest
+
+import app
+
+BOUNDS = (1.0, 2.0, 4.0)
+
+
+def histogram(*values, bounds=BOUNDS):
+    histogram = app.LatencyHistogram(bounds)
+    for value in values:
+        histogram.observe(value)
+    return histogram
+
+
+def test_quantile_of_empty_histogram_is_none():
+    assert histogram().quantile(0.5) is None
+
+
+def test_observation_on_a_bound_falls_into_that_bucket():
+    # Prometheus'taki le (<=) anlamı: tam sınırdaki değer o kovaya sayılır
+    assert histogram(1.0, 2.0, 4.0).snapshot()[0] == [1, 1, 1, 0]
+
+
+@pytest.mark.parametrize('q, expected', [
+    (0.0, 0.0),
+    (0.25, 1.0),  # ilk kovanın tamamı: [0, 1]
+    (0.5, 1.5),   # ikinci kovanın (1, 2] yarısı
+    (0.75, 2.0),
+    (1.0, 3.0),   # (2, 4] kovasının üst sınırı gözlenen en büyük değerle kırpılır
+])
+def test_quantile_interpolates_within_buckets(q, expected):
+    assert histogram(0.5, 1.5, 1.5, 3.0).quantile(q) == pytest.approx(expected)
+
+
+def test_quantile_in_overflow_bucket_is_maximum():
+    assert histogram(0.5, 5.0, 10.0).quantile(0.5) == 10.0
+    assert histogram(0.5, 5.0, 10.0).quantile(0.99) == 10.0
+
+
+def test_quantile_accepts_a_snapshot():
+    observed = histogram(0.5, 1.5)
+    snapshot = observed.snapshot()
+    observed.observe(3.5)
+    assert observed.quantile(1.0, snapshot) == 1.5
+
+
+def parse_samples(text):
+    """'ad{etiketler} değer' satırlarını [(ad, {etiket: değer}, değer)] listesine çevir"""
+    samples = []
+    for line in text.splitlines():
+        if line.startswith('#'):
+            continue
+        match = re.fullmatch(r'(\w+)(?:\{(.*)\})? (\S+)', line)
+        assert match, line
+        labels = dict(re.findall(r'(\w+)="([^"]*)"', match.group(2) or ''))
+        samples.append((match.group(1), labels, float(match.group(3))))
+    return samples
+
+
+def test_prometheus_text_histogram_series():
+    registry = app.MetricsRegistry()
+    labels = (('model', 'lr'), ('stage', 'predict'))
+    observations = [app.LATENCY_BUCKETS[0], 0.002, 0.002, 50.0]
+    for seconds in observations:
+        registry.observe('classification_stage_seconds', labels, seconds)
+    registry.observe('classification_stage_seconds', (('model', 'mb'), ('stage', 'predict')), 0.5)
+    registry.observe('db_lock_wait_seconds', (), 0.25)
+    text = registry.prometheus_text()
+
+    # HELP/TYPE her metrik adı için bir kez, farklı etiketli serilerden önce
+    assert text.count('# TYPE classification_stage_seconds histogram') == 1
+    assert text.count('# HELP classification_stage_seconds ') == 1
+    assert text.endswith('\n')
+
+    samples = parse_samples(text)
+    buckets = [(sample_labels['le'], value) for name, sample_labels, value in samples
+               if name == 'classification_stage_seconds_bucket' and sample_labels.get('model') == 'lr']
+    assert len(buckets) == len(app.LATENCY_BUCKETS) + 1
+    assert buckets[-1] == ('+Inf', len(observations))
+    counts = [value for _, value in buckets]
+    assert counts == sorted(counts)  # kümülatif
+    for le, value in buckets[:-1]:
+        assert value == sum(seconds <= float(le) * (1 + 1e-6) for seconds in observations), le
+    assert buckets[0] == ('1e-05', 1)
+
+    values = {(name, tuple(sorted(sample_labels.items()))): value for name, sample_labels, value in samples}
+    lr_labels = (('model', 'lr'), ('stage', 'predict'))
+    assert values[('classification_stage_seconds_count', lr_labels)] == len(observations)
+    assert math.isclose(values[('classification_stage_seconds_sum', lr_labels)], sum(observations))
+    # Etiketsiz seride _sum/_count süslü parantez almaz
+    assert 'db_lock_wait_seconds_sum 0.25\n' in text
+    assert 'db_lock_wait_seconds_count 1\n' in text
+    assert 'db_lock_wait_seconds_bucket{le="+Inf"} 1\n' in text
@@ -0,0 +1,22 @@
+import tracemalloc
+
+import app
+
+
+def test_load_measures_rss_without_tracemalloc(monkeypatch):
+    registry = app.ModelRegistry(app.model_path)
+    tracing = []
+    load_pickle = registry._load_pickle
+    monkeypatch.setattr(registry, '_load_scorer', lambda key: None)
+    monkeypatch.setattr(registry, '_load_pickle',
+                        lambda file_name: tracing.append(tracemalloc.is_tracing()) or load_pickle(file_name))
+
+    assert registry.get('mb') is not None
+    assert tracing == [False]
+    (stats,) = registry.stats()
+    assert stats['bicim'] == 'pickle'
+    assert stats['rss_artisi_kb'] >= 0
+
+
+def test_resident_memory_is_measured():
+    assert app.resident_memory_bytes() > 0
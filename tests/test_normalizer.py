@@ -0,0 +1,25 @@
+import random
+
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize('text', app.NORMALIZER_GOLDEN_TEXTS)
+def test_clean_text_matches_reference(text):
+    assert app.clean_text(text) == app.clean_text_reference(text)
+
+
+@pytest.mark.parametrize('text', app.NORMALIZER_GOLDEN_TEXTS)
+def test_text_normalizer_matches_reference(text):
+    normalizer = app.TextNormalizer(app.stop_words, app.StemCache(app.porter))
+    assert normalizer.normalize(text) == app.clean_text_reference(text)
+
+
+def test_clean_text_matches_reference_on_random_input():
+    # Tetikleyici karakterleri (@ . ₺ $ rakam) sık içeren rastgele girdiler
+    rng = random.Random(0)
+    alphabet = "abcçdefgğhıijklmnoöprsştuüvyzİIŞĞÜÖÇ0123456789 .,;:@-_/()+$₺\t\n!?'\"%&=#"
+    for _ in range(500):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 120)))
+        assert app.clean_text(text) == app.clean_text_reference(text), text
@@ -0,0 +1,107 @@
+import pytest
+
+import app
+
+
+@pytest.fixture
+def fingerprints(monkeypatch):
+    # DL'nin yüklü olduğu bir ortamı taklit eden sabit dosya özetleri
+    values = {'mb': 'mb-1', 'sgd': 'sgd-1', 'lr': 'lr-1', 'dl': 'dl-1', 'vectorizer': 'vec-1',
+              'label_binarizer': 'lb-1'}
+    monkeypatch.setattr(app.model_registry, 'fingerprint', values.get)
+    monkeypatch.setattr(app.model_registry, 'file_fingerprint', values.get)
+    return values
+
+
+@pytest.mark.parametrize('model', ['dl', app.CASCADE_MODEL])
+def test_key_changes_with_label_binarizer(fingerprints, model):
+    before = app.prediction_cache_key(model, "su faturası yüksek")
+    fingerprints['label_binarizer'] = 'lb-2'
+    after = app.prediction_cache_key(model, "su faturası yüksek")
+    assert before is not None and after is not None
+    assert before != after
+
+
+def test_dl_key_requires_label_binarizer(fingerprints):
+    fingerprints['label_binarizer'] = None
+    assert app.prediction_cache_key('dl', "su faturası yüksek") is None
+
+
+def test_cascade_key_does_not_load_models(monkeypatch):
+    registry = app.ModelRegistry(app.model_path)
+    monkeypatch.setattr(app, 'model_registry', registry)
+    assert app.prediction_cache_key(app.CASCADE_MODEL, "su faturası yüksek") is not None
+    # Sadece vectorizer yüklenir; aşama modelleri (ör. DL) anahtar için yüklenmez
+    assert [stats['model'] for stats in registry.stats()] == ['vectorizer']
+
+
+def test_cascade_without_dl_ignores_label_binarizer(fingerprints):
+    fingerprints['dl'] = None
+    before = app.prediction_cache_key(app.CASCADE_MODEL, "su faturası yüksek")
+    fingerprints['label_binarizer'] = 'lb-2'
+    assert before is not None
+    assert app.prediction_cache_key(app.CASCADE_MODEL, "su faturası yüksek") == before
+
+
+class Clock:
+    """time.monotonic yerine elle ilerletilen saat"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(app.time, 'monotonic', clock)
+    return clock
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = app.PredictionCache(maxsize=10, ttl=60)
+    cache.put('a', 'Ulaşım')
+    clock.now += 59.9
+    assert cache.get('a') == 'Ulaşım'
+    clock.now += 0.1
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['boyut'], stats['suresi_dolan'], stats['isabet'], stats['iska']) == (0, 1, 1, 1)
+
+
+def test_put_refreshes_ttl(clock):
+    cache = app.PredictionCache(maxsize=10, ttl=60)
+    cache.put('a', 'Ulaşım')
+    clock.now += 50
+    cache.put('a', 'Altyapı')
+    clock.now += 50
+    assert cache.get('a') == 'Altyapı'
+
+
+def test_least_recently_used_entry_is_evicted_at_capacity(clock):
+    cache = app.PredictionCache(maxsize=3, ttl=60)
+    for key in 'abc':
+        cache.put(key, key.upper())
+    # 'a' okunduğu için en eski kullanılan 'b' olur
+    assert cache.get('a') == 'A'
+    cache.put('d', 'D')
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in 'acd'] == ['A', 'C', 'D']
+    cache.put('e', 'E')
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['boyut'], stats['kapasite'], stats['tahliye'], stats['suresi_dolan']) == (3, 3, 2, 0)
+
+
+def test_hit_and_miss_counters(clock):
+    cache = app.PredictionCache(maxsize=10, ttl=60)
+    assert cache.stats()['isabet_orani'] is None
+    assert cache.get('a') is None
+    cache.put('a', 'Ulaşım')
+    assert cache.get('a') == 'Ulaşım'
+    assert cache.get('a') == 'Ulaşım'
+    assert cache.get('b') is None
+    stats = cache.stats()
+    assert (stats['isabet'], stats['iska'], stats['isabet_orani']) == (2, 2, 0.5)
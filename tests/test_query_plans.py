@@ -0,0 +1,78 @@
+import pytest
+
+import app
+
+# (ad, sorgu, parametreler, planda görülmesi gereken indeks)
+QUERY_PLAN_CHECKS = [
+    ("şikayet numarası ile arama", '''
+        SELECT c.complaint_number, c.complaint_text, c.category,
+               c.status, c.created_at, u.name, u.email
+        FROM complaints c
+        JOIN users u ON c.user_id = u.id
+        WHERE c.complaint_number = ?
+    ''', (123456,), 'idx_complaints_number'),
+    ("e-posta ile kullanıcı şikayetleri", '''
+        SELECT c.complaint_number, c.complaint_text, c.category,
+               c.status, c.created_at, u.name, u.email, c.model_used, c.user_id
+        FROM users u
+        JOIN complaints c ON c.user_id = u.id
+        WHERE u.email = ?
+        ORDER BY c.created_at DESC
+    ''', ('ali@example.com',), 'idx_complaints_user_created_desc'),
+    ("oturum önbelleği sayacı", '''
+        SELECT v.version FROM users u
+        JOIN user_complaint_versions v ON v.user_id = u.id
+        WHERE u.email = ?
+    ''', ('ali@example.com',), 'INTEGER PRIMARY KEY'),
+    ("model_used filtresi", '''
+        SELECT COUNT(*) FROM complaints WHERE model_used = ?
+    ''', ('MultinomialNB',), 'idx_complaints_model_answered'),
+    ("kademeli mod aşama dağılımı", '''
+        SELECT answered_by, COUNT(*) FROM complaints
+        WHERE model_used = ? AND answered_by IS NOT NULL
+        GROUP BY answered_by
+    ''', (app.MODEL_DISPLAY_NAMES[app.CASCADE_MODEL],), 'COVERING INDEX idx_complaints_model_answered'),
+    ("status filtresi", '''
+        SELECT complaint_number FROM complaints WHERE status = ?
+    ''', ('İnceleniyor',), 'idx_complaints_status'),
+    ("created_at sıralı tüm şikayetler", '''
+        SELECT c.complaint_number, c.complaint_text, c.category, c.status,
+               c.created_at, u.name, u.email, u.phone, c.model_used
+        FROM complaints c
+        JOIN users u ON c.user_id = u.id
+        ORDER BY c.created_at DESC
+    ''', (), 'idx_complaints_created'),
+    ("filtreli admin sayfası", '''
+        SELECT c.complaint_number, c.complaint_text, c.category, c.status,
+               c.created_at, u.name, u.email, u.phone, c.model_used, c.id
+        FROM complaints c
+        JOIN users u ON c.user_id = u.id
+        WHERE +c.status IN (?, ?) AND +c.model_used = ? AND (c.created_at, c.id) < (?, ?)
+        ORDER BY c.created_at DESC, c.id DESC
+        LIMIT ?
+    ''', ('İnceleniyor', 'Çözüldü', 'MultinomialNB', '2024-01-01 00:00:00', 100, app.ADMIN_PAGE_SIZE),
+        'idx_complaints_created'),
+    ("geniş içerik araması (en yeniden eskiye)", '''
+        SELECT c.complaint_number, c.complaint_text, c.category, c.status,
+               c.created_at, u.name, u.email, u.phone, c.model_used, c.id
+        FROM complaints_fts f JOIN complaints c ON c.id = f.rowid
+        JOIN users u ON c.user_id = u.id
+        WHERE f.complaints_fts MATCH ? AND +c.category = ?
+        ORDER BY f.rowid DESC
+        LIMIT ? OFFSET ?
+    ''', ('"fatur"', 'İlgisiz', app.ADMIN_PAGE_SIZE, 0), 'VIRTUAL TABLE INDEX'),
+    ("dashboard sayaç toplamı", '''
+        SELECT IFNULL(SUM(complaint_count), 0) FROM complaint_stats
+        WHERE day >= ? AND day < ? AND model_used = ?
+    ''', ('2024-01-01', '2024-02-01', 'MultinomialNB'), 'PRIMARY KEY'),
+]
+
+
+@pytest.mark.parametrize('name, query, params, expected_index', QUERY_PLAN_CHECKS,
+                         ids=[check[0] for check in QUERY_PLAN_CHECKS])
+def test_query_uses_expected_index(db, name, query, params, expected_index):
+    """Migration'lar uygulanmış boş veritabanında sorgu beklenen indeksi kullanmalı, geçici sıralama yapmamalı"""
+    with db.connection() as conn:
+        plan = [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + query, params)]
+    assert any(expected_index in detail for detail in plan), plan
+    assert not any('TEMP B-TREE' in detail for detail in plan), plan
@@ -0,0 +1,30 @@
+import argparse
+
+import app
+
+
+def reclassify_args(model):
+    return argparse.Namespace(model=model, page_size=app.BATCH_CHUNK_SIZE, start_after=0, resume=False)
+
+
+def test_reclassify_updates_model_used(db):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    number = app.save_complaint(user_id, "Doğalgaz faturam bu ay çok yüksek geldi", app.CATEGORY_LABELS[4], 'mb')
+
+    assert app.reclassify_complaints(reclassify_args('lr')) == 0
+    with db.connection() as conn:
+        assert conn.execute('SELECT model_used, answered_by FROM complaints WHERE complaint_number = ?',
+                            (number,)).fetchone() == ('Logistic Regression', 'Logistic Regression')
+
+
+def test_reclassify_refuses_model_that_cannot_load(db, monkeypatch, capsys):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    number = app.save_complaint(user_id, "Metrobüs çok kalabalık", app.CATEGORY_LABELS[1], 'mb')
+    get = app.model_registry.get
+    monkeypatch.setattr(app.model_registry, 'get', lambda key: None if key == 'dl' else get(key))
+
+    assert app.reclassify_complaints(reclassify_args('dl')) == 1
+    assert 'dl' in capsys.readouterr().out
+    with db.connection() as conn:
+        assert conn.execute('SELECT category, model_used FROM complaints WHERE complaint_number = ?',
+                            (number,)).fetchone() == (app.CATEGORY_LABELS[1], 'MultinomialNB')
@@ -0,0 +1,142 @@
+import sqlite3
+
+import app
+
+
+def test_saved_complaint_is_searchable(db):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    number = app.save_complaint(user_id, "Su faturama 850 ₺ yansıtılmış, sayaç arızalı olabilir mi?",
+                                app.CATEGORY_LABELS[2], 'mb')
+    assert [row[0] for row in app.search_complaints("faturam")] == [number]
+
+
+def test_triggers_do_not_call_app_functions(db):
+    with db.connection() as conn:
+        triggers = [row[0] for row in conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger'")]
+    assert triggers
+    assert not any('complaint_search_text' in sql for sql in triggers)
+
+
+def pending(db):
+    with db.connection() as conn:
+        return [row[0] for row in conn.execute('SELECT complaint_id FROM complaints_fts_pending')]
+
+
+def test_saved_complaint_is_not_left_in_queue(db):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    app.save_complaint(user_id, "Metrobüs çok kalabalık", app.CATEGORY_LABELS[1], 'mb')
+    assert pending(db) == []
+    assert app.sync_complaint_search() == 0
+
+
+def test_outside_writer_rows_are_indexed_on_sync(db):
+    # Uygulama fonksiyonlarını kaydetmemiş sıradan bir sqlite3 bağlantısı
+    with sqlite3.connect(db.path) as conn:
+        conn.execute("INSERT INTO users (name, email) VALUES ('Dış Araç', 'dis@example.com')")
+        conn.execute('''
+            INSERT INTO complaints (user_id, complaint_number, complaint_text, category, model_used, status, created_at)
+            VALUES (1, 1000001, 'Otobüs durakta beklemeden geçip gitti', 'İlgisiz', 'MultinomialNB', 'İnceleniyor',
+                    '2024-01-01 12:00:00')
+        ''')
+    assert len(pending(db)) == 1
+
+    assert app.sync_complaint_search() == 1
+    assert pending(db) == []
+    assert [row[0] for row in app.search_complaints("otobüs")] == [1000001]
+    assert app.sync_complaint_search() == 0
+
+
+def test_text_update_is_searchable_on_next_search(db):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    number = app.save_complaint(user_id, "Metrobüs çok kalabalık", app.CATEGORY_LABELS[1], 'mb')
+    with sqlite3.connect(db.path) as conn:
+        conn.execute("UPDATE complaints SET complaint_text = 'Parktaki çöpler toplanmıyor' WHERE complaint_number = ?",
+                     (number,))
+
+    # Açılıştaki senkronizasyon beklenmez: arama önce kuyruğu dizinler
+    assert app.count_search_results("çöpler") == 1
+    assert [row[0] for row in app.search_complaints("çöpler")] == [number]
+    assert app.search_complaints("metrobüs") == []
+    assert pending(db) == []
+
+
+def test_deleted_complaint_leaves_the_queue(db):
+    with sqlite3.connect(db.path) as conn:
+        conn.execute("INSERT INTO users (name, email) VALUES ('Dış Araç', 'dis@example.com')")
+        conn.execute('''
+            INSERT INTO complaints (user_id, complaint_number, complaint_text, category, model_used, status, created_at)
+            VALUES (1, 1000001, 'Otobüs gecikti', 'İlgisiz', 'MultinomialNB', 'İnceleniyor', '2024-01-01 12:00:00')
+        ''')
+        conn.execute('DELETE FROM complaints WHERE complaint_number = 1000001')
+    assert app.sync_complaint_search() == 0
+    assert pending(db) == []
+
+
+def test_search_plan_uses_callers_connection(db, monkeypatch):
+    def no_pool():
+        raise AssertionError("havuzdan ikinci bağlantı alındı")
+
+    with db.connection() as conn:
+        monkeypatch.setattr(app, 'get_db', no_pool)
+        assert app.complaint_search_plan(conn, "fatura", {}) is not None
+
+
+def add_complaints(db, texts):
+    with db.transaction() as c:
+        c.execute("INSERT OR IGNORE INTO users (id, name, email) VALUES (1, 'Test Kullanıcı', 'test@example.com')")
+        for i, text in enumerate(texts):
+            c.execute('''
+                INSERT INTO complaints (user_id, complaint_number, complaint_text, category, model_used, status, created_at)
+                VALUES (1, ?, ?, ?, 'MultinomialNB', ?, '2024-01-01 12:00:00')
+            ''', (1000000 + i, text, app.CATEGORY_LABELS[i % 2], app.COMPLAINT_STATUSES[i % 3]))
+            app.index_complaint_search(c, [(c.lastrowid, app.complaint_search_text(text))])
+
+
+def test_all_statuses_selected_is_no_filter():
+    assert app.complaint_filter_conditions({'statuses': list(app.COMPLAINT_STATUSES)}) == ([], [])
+    conditions, params = app.complaint_filter_conditions({'statuses': app.COMPLAINT_STATUSES[:2]})
+    assert len(conditions) == 1 and params == app.COMPLAINT_STATUSES[:2]
+
+
+def test_narrow_search_is_ranked_and_filtered(db):
+    add_complaints(db, ["Su için fatura yüksek geldi", "Fatura fatura fatura yanlış", "Otobüs gecikti"])
+    filters = {'statuses': app.COMPLAINT_STATUSES}
+    assert [row[0] for row in app.search_complaints("fatura", filters)] == [1000001, 1000000]
+    assert app.count_search_results("fatura", filters) == 2
+    filters['category'] = app.CATEGORY_LABELS[0]
+    assert [row[0] for row in app.search_complaints("fatura", filters)] == [1000000]
+    assert app.count_search_results("fatura", filters) == 1
+
+
+def test_broad_search_is_capped_and_newest_first(db, monkeypatch):
+    monkeypatch.setattr(app, 'SEARCH_COUNT_CAP', 3)
+    add_complaints(db, [f"Su kesintisi {i}. gün" for i in range(6)])
+    filters = {'statuses': app.COMPLAINT_STATUSES}
+    assert app.count_search_results("su kesintisi", filters) == 4
+    assert app.format_search_count(4) == "3+"
+    assert [row[0] for row in app.search_complaints("su kesintisi", filters, limit=2)] == [1000005, 1000004]
+    assert [row[0] for row in app.search_complaints("su kesintisi", filters, offset=2, limit=2)] == [1000003, 1000002]
+
+
+def test_text_changed_during_sync_stays_queued(db, monkeypatch):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    number = app.save_complaint(user_id, "Metrobüs çok kalabalık", app.CATEGORY_LABELS[1], 'mb')
+    with sqlite3.connect(db.path) as conn:
+        conn.execute("UPDATE complaints SET complaint_text = 'Otobüs gecikti' WHERE complaint_number = ?", (number,))
+    complaint_search_text = app.complaint_search_text
+
+    def edited_while_cleaning(text):
+        # Metin temizlenirken (yazma kilidi dışında) başka bir araç metni tekrar değiştirir
+        with sqlite3.connect(db.path) as conn:
+            conn.execute("UPDATE complaints SET complaint_text = 'Parktaki çöpler toplanmıyor' "
+                         "WHERE complaint_number = ?", (number,))
+        return complaint_search_text(text)
+
+    monkeypatch.setattr(app, 'complaint_search_text', edited_while_cleaning)
+    assert app.sync_complaint_search() == 0
+    assert len(pending(db)) == 1
+
+    monkeypatch.setattr(app, 'complaint_search_text', complaint_search_text)
+    assert app.sync_complaint_search() == 1
+    assert app.search_complaints("otobüs") == []
+    assert [row[0] for row in app.search_complaints("çöpler")] == [number]
@@ -0,0 +1,71 @@
+import app
+
+
+class CountingStemmer:
+    """Gerçek kök bulucuya giden çağrıları sayan sarmalayıcı"""
+
+    def __init__(self, stemmer=app.porter):
+        self._stemmer = stemmer
+        self.calls = []
+
+    def stem(self, term):
+        self.calls.append(term)
+        return self._stemmer.stem(term)
+
+
+def corpus_terms():
+    terms = []
+    for text in app.NORMALIZER_GOLDEN_TEXTS + app.BENCHMARK_TEXTS:
+        terms += app.clean_text_reference(text).split()
+        terms += text.lower().split()
+    return terms
+
+
+def test_output_matches_uncached_stemmer():
+    cache = app.StemCache(app.porter, maxsize=64)
+    terms = corpus_terms()
+    assert len(set(terms)) > 64
+    # İki tur: ilkinde ıska ve tahliye, ikincisinde isabetler de sınanır
+    for term in terms + terms:
+        assert cache.stem(term) == app.porter.stem(term), term
+
+
+def test_size_is_bounded_and_least_recently_used_term_is_evicted():
+    stemmer = CountingStemmer()
+    cache = app.StemCache(stemmer, maxsize=3)
+    for term in ['faturalar', 'otobüsler', 'kesintiler']:
+        cache.stem(term)
+    # 'faturalar' yeniden kullanıldığı için en eski kullanılan 'otobüsler' olur
+    cache.stem('faturalar')
+    cache.stem('çöpler')
+    assert cache.stats()['boyut'] == 3
+    assert cache.stats()['tahliye'] == 1
+
+    stemmer.calls.clear()
+    for term in ['faturalar', 'kesintiler', 'çöpler']:
+        cache.stem(term)
+    assert stemmer.calls == []
+    cache.stem('otobüsler')
+    assert stemmer.calls == ['otobüsler']
+    assert cache.stats()['boyut'] == 3
+
+
+def test_hit_and_miss_counters():
+    stemmer = CountingStemmer()
+    cache = app.StemCache(stemmer, maxsize=10)
+    assert cache.stats()['isabet_orani'] is None
+    for term in ['faturalar', 'faturalar', 'otobüsler', 'faturalar']:
+        cache.stem(term)
+    stats = cache.stats()
+    assert (stats['isabet'], stats['iska'], stats['tahliye'], stats['isabet_orani']) == (2, 2, 0, 0.5)
+    assert stemmer.calls == ['faturalar', 'otobüsler']
+
+
+def test_prewarm_respects_size_and_leaves_counters_alone():
+    stemmer = CountingStemmer()
+    cache = app.StemCache(stemmer, maxsize=2)
+    cache.prewarm(['faturalar', 'otobüsler', 'kesintiler'])
+    stats = cache.stats()
+    assert (stats['boyut'], stats['isabet'], stats['iska']) == (2, 0, 0)
+    assert cache.stem('otobüsler') == app.porter.stem('otobüsler')
+    assert cache.stats()['isabet'] == 1
@@ -0,0 +1,50 @@
+import sqlite3
+
+import app
+
+
+def test_cache_reused_until_complaints_change(db, monkeypatch):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    number = app.save_complaint(user_id, "Metrobüs çok kalabalık", app.CATEGORY_LABELS[1], 'mb')
+    cache = {}
+    first = app.cached_user_complaints(cache, 'test@example.com')
+    assert [row[0] for row in first] == [number]
+
+    queries = []
+    get_user_complaints = app.get_user_complaints
+    monkeypatch.setattr(app, 'get_user_complaints', lambda email: queries.append(email) or get_user_complaints(email))
+    assert app.cached_user_complaints(cache, 'test@example.com') is first
+    assert queries == []
+
+    app.update_complaint_status(number, 'Çözüldü')
+    assert app.cached_user_complaints(cache, 'test@example.com')[0][3] == 'Çözüldü'
+    assert queries == ['test@example.com']
+
+
+def test_cache_sees_writes_from_other_processes(db):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    number = app.save_complaint(user_id, "Metrobüs çok kalabalık", app.CATEGORY_LABELS[1], 'mb')
+    cache = {}
+    app.cached_user_complaints(cache, 'test@example.com')
+
+    # Uygulamanın süreç içi durumunu bilmeyen başka bir yazar (ör. CLI ya da başka bir sunucu)
+    with sqlite3.connect(db.path) as conn:
+        conn.execute("UPDATE complaints SET category = ? WHERE complaint_number = ?",
+                     (app.CATEGORY_LABELS[4], number))
+    assert app.cached_user_complaints(cache, 'test@example.com')[0][2] == app.CATEGORY_LABELS[4]
+
+    with sqlite3.connect(db.path) as conn:
+        conn.execute('''
+            INSERT INTO complaints (user_id, complaint_number, complaint_text, category, model_used, status, created_at)
+            VALUES (?, 1000001, 'Su kesintisi', 'İlgisiz', 'MultinomialNB', 'İnceleniyor', '2099-01-01 00:00:00')
+        ''', (user_id,))
+    assert [row[0] for row in app.cached_user_complaints(cache, 'test@example.com')] == [1000001, number]
+
+
+def test_internal_columns_do_not_invalidate(db):
+    user_id = app.save_user('Test Kullanıcı', 'test@example.com', None)
+    number = app.save_complaint(user_id, "Metrobüs çok kalabalık", app.CATEGORY_LABELS[1], 'mb')
+    version = app.user_complaints_version('test@example.com')
+    with db.transaction() as c:
+        c.execute("UPDATE complaints SET answered_by = 'SGD Classifier' WHERE complaint_number = ?", (number,))
+    assert app.user_complaints_version('test@example.com') == version